@@ -0,0 +1,326 @@
+from collections import namedtuple
+import asyncio
+import threading
+import time
+from datetime import datetime
+from config import DEVICE_ID, IP, PORT, DEVICE_CALL_DEADLINE, DEVICE_CONNECT_DEADLINE
+
+# Value reported for outputs that have no valid measurement (judgment standby)
+INVALID_VALUE = -9999.98
+
+# Maximum number of OUT channels on a single CL-3000 controller
+MAX_CHANNELS = 8
+
+# Compact judge codes (uint8) used wherever judges are stored in bulk
+JUDGE_NAMES = ('??', 'GO', 'HI', 'LO', 'STANDBY', 'IDLE')
+JUDGE_CODES = {name: code for code, name in enumerate(JUDGE_NAMES)}
+
+# One decoded reading of all OUT channels taken at the same instant.
+# t_ns is a time.monotonic_ns() stamp; use SessionClock to turn it into wall-clock time.
+Sample = namedtuple('Sample', ['t_ns', 'values', 'judges'])
+
+
+class SessionClock:
+    """Monotonic nanosecond clock with a single wall-clock anchor for the session"""
+
+    def __init__(self):
+        self.anchor_ns = time.monotonic_ns()
+        self.anchor_wall_ns = time.time_ns()
+
+    @staticmethod
+    def now_ns():
+        return time.monotonic_ns()
+
+    def to_datetime(self, t_ns):
+        """Wall-clock datetime of a monotonic stamp (only needed for export/display)"""
+        return datetime.fromtimestamp((self.anchor_wall_ns + (int(t_ns) - self.anchor_ns)) / 1e9)
+
+    def format(self, t_ns):
+        return self.to_datetime(t_ns).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def decode_judge(value_info, judge_code):
+    """Map the raw valueInfo/judgeResult fields of one OUT to a judge string"""
+    if value_info == 1:
+        return "STANDBY"
+    if judge_code & 0x01:
+        return "HI"
+    if judge_code & 0x04:
+        return "LO"
+    if judge_code & 0x02:
+        return "GO"
+    return "??"
+
+
+def decode_measurement(data, num_channels, t_ns=None):
+    """Decode a CL3IF_MEASUREMENT_DATA struct into a Sample"""
+    if t_ns is None:
+        t_ns = time.monotonic_ns()
+    values = []
+    judges = []
+    for i in range(num_channels):
+        out = data.outMeasurementData[i]
+        judge = decode_judge(out.valueInfo, out.judgeResult)
+        if judge == "STANDBY":
+            values.append(INVALID_VALUE)
+        else:
+            values.append(out.measurementValue / 100.0)
+        judges.append(judge)
+    return Sample(t_ns, values, judges)
+
+
+class AcquisitionPipeline:
+    """Single owner of device polling that publishes decoded sample batches to subscribers"""
+
+    def __init__(self, num_channels=MAX_CHANNELS, poll_interval=0.5):
+        self.num_channels = num_channels
+        self.base_interval = poll_interval
+        self.running = False
+        self._task = None  # Acquisition task on the device core
+        self.connected = False
+        self.device_available = False
+        self.max_failures = 5
+        self.clock = SessionClock()
+
+        # Consumers: callback(batch) where batch is a list of Sample
+        self._subscribers = []
+        self._connection_subscribers = []
+        self._subscriber_lock = threading.Lock()
+
+        # Faster polling requested by consumers, e.g. the logger's sample rate
+        self._interval_requests = {}
+        self._wake = None  # asyncio.Event of the running task
+
+        # Serializes DLL calls issued from the device core's I/O workers and from callers
+        self.device_lock = threading.RLock()
+
+    def subscribe(self, callback):
+        """Register a callback receiving every published sample batch"""
+        with self._subscriber_lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._subscriber_lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def subscribe_connection(self, callback):
+        """Register a callback receiving connection state changes (bool)"""
+        with self._subscriber_lock:
+            if callback not in self._connection_subscribers:
+                self._connection_subscribers.append(callback)
+
+    def unsubscribe_connection(self, callback):
+        with self._subscriber_lock:
+            if callback in self._connection_subscribers:
+                self._connection_subscribers.remove(callback)
+
+    @property
+    def poll_interval(self):
+        """Effective polling interval: the fastest rate any consumer asked for"""
+        return min([self.base_interval] + list(self._interval_requests.values()))
+
+    def request_interval(self, owner, interval):
+        """Ask for the device to be polled at least every `interval` seconds"""
+        self._interval_requests[owner] = max(0.001, float(interval))
+        self._notify()
+
+    def release_interval(self, owner):
+        self._interval_requests.pop(owner, None)
+
+    def set_channel_count(self, num_channels):
+        self.num_channels = min(num_channels, MAX_CHANNELS)
+
+    def _publish(self, batch):
+        with self._subscriber_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(batch)
+            except Exception as e:
+                print(f"AcquisitionPipeline: Subscriber error: {e}")
+
+    def _set_connected(self, connected):
+        self.connected = connected
+        if connected:
+            self.device_available = True
+        with self._subscriber_lock:
+            subscribers = list(self._connection_subscribers)
+        for callback in subscribers:
+            try:
+                callback(connected)
+            except Exception as e:
+                print(f"AcquisitionPipeline: Connection subscriber error: {e}")
+
+    def connect(self, timeout=5000):
+        """Open the Ethernet connection if needed; returns the CL3IF result code"""
+        if self.connected:
+            return 0
+        try:
+            # The driver (and its DLL) is loaded on first use, normally on a device I/O worker
+            import CL3wrap
+            ethernetConfig = CL3wrap.CL3IF_ETHERNET_SETTING()
+            for i in range(4):
+                ethernetConfig.abyIpAddress[i] = IP[i]
+            ethernetConfig.wPortNo = PORT
+
+            with self.device_lock:
+                result = CL3wrap.CL3IF_OpenEthernetCommunication(DEVICE_ID, ethernetConfig, timeout)
+
+            if result == 0:
+                print("AcquisitionPipeline: Successfully connected to device")
+                self._set_connected(True)
+            else:
+                print(f"AcquisitionPipeline: Connection failed with error {result}")
+                self._set_connected(False)
+            return result
+
+        except Exception as e:
+            print(f"AcquisitionPipeline: Connection error: {e}")
+            self._set_connected(False)
+            return -1
+
+    def disconnect(self):
+        """Close the device connection"""
+        try:
+            import CL3wrap
+            with self.device_lock:
+                CL3wrap.CL3IF_CloseCommunication(DEVICE_ID)
+            print("AcquisitionPipeline: Disconnected from device")
+        except Exception as e:
+            print(f"AcquisitionPipeline: Disconnect error: {e}")
+        self._set_connected(False)
+
+    def read_sample(self):
+        """Read and decode one measurement from the device, or None on failure"""
+        if not self.connected:
+            return None
+        try:
+            import CL3wrap
+            data = CL3wrap.CL3IF_MEASUREMENT_DATA()
+            with self.device_lock:
+                result = CL3wrap.CL3IF_GetMeasurementData(DEVICE_ID, data)
+            if result != 0:
+                print(f"AcquisitionPipeline: Failed to read data, error {result}")
+                return None
+            return decode_measurement(data, self.num_channels)
+        except Exception as e:
+            print(f"AcquisitionPipeline: Error reading data: {e}")
+            return None
+
+    @property
+    def core(self):
+        """The shared DeviceCore this pipeline schedules its device work on"""
+        from device_core import get_core
+        return get_core()
+
+    def start(self):
+        """Start acquisition as a task on the device core (no-op if already running)"""
+        if self.running:
+            return
+        self.running = True
+        self._task = self.core.spawn(self._run())
+        print("AcquisitionPipeline: Started acquisition task")
+
+    def stop(self):
+        """Stop the acquisition task, which closes the connection on its way out"""
+        self.running = False
+        if self._task is not None:
+            self._notify()
+            if not self.core.in_loop_thread:
+                try:
+                    self._task.result(timeout=2.0)
+                except Exception:
+                    self._task.cancel()
+            self._task = None
+        print("AcquisitionPipeline: Stopped acquisition task")
+
+    def _notify(self):
+        """Wake the acquisition task early (thread-safe)"""
+        if self._wake is not None and self._task is not None:
+            self.core.call_soon(self._wake.set)
+
+    async def _sleep(self, seconds):
+        """Wait up to `seconds`; True if woken early by _notify()"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), max(0.0, seconds))
+        except asyncio.TimeoutError:
+            return False
+        self._wake.clear()
+        return True
+
+    async def _run(self):
+        """Poll the device on a fixed schedule and publish each sample once"""
+        core = self.core
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        consecutive_failures = 0
+        next_poll = loop.time()
+
+        while self.running:
+            try:
+                # Try to connect if not connected
+                if not self.connected:
+                    result = await core.run_blocking(self.connect, timeout=DEVICE_CONNECT_DEADLINE)
+                    if result == 0:
+                        consecutive_failures = 0
+                        next_poll = loop.time()
+                    else:
+                        consecutive_failures += 1
+                        if consecutive_failures >= self.max_failures:
+                            print("AcquisitionPipeline: Too many connection failures, stopping attempts")
+                            break
+                        await self._sleep(2.0)  # Wait before retry
+                        continue
+
+                sample = await core.run_blocking(self.read_sample, timeout=DEVICE_CALL_DEADLINE)
+                if sample is not None:
+                    consecutive_failures = 0
+                    self._publish([sample])
+                else:
+                    consecutive_failures += 1
+                    if consecutive_failures >= self.max_failures:
+                        print("AcquisitionPipeline: Too many read failures, disconnecting")
+                        await self._drop_connection()
+                        consecutive_failures = 0
+
+                # Keep polls on a fixed grid; skip ahead rather than burst after a stall
+                next_poll += self.poll_interval
+                now = loop.time()
+                if next_poll < now:
+                    next_poll = now
+                if await self._sleep(next_poll - now):
+                    # A consumer asked for a new rate: poll right away
+                    next_poll = loop.time()
+
+            except asyncio.TimeoutError:
+                consecutive_failures += 1
+                print(f"AcquisitionPipeline: Device call missed its deadline "
+                      f"({consecutive_failures}/{self.max_failures})")
+                if consecutive_failures >= self.max_failures:
+                    if not self.connected:
+                        print("AcquisitionPipeline: Too many connection failures, stopping attempts")
+                        break
+                    print("AcquisitionPipeline: Device not answering, disconnecting")
+                    await self._drop_connection()
+                    consecutive_failures = 0
+                # Back off rather than queue more calls behind a hung driver
+                await self._sleep(2.0)
+            except Exception as e:
+                print(f"AcquisitionPipeline: Error in acquisition task: {e}")
+                consecutive_failures += 1
+                await asyncio.sleep(1.0)
+
+        self.running = False
+        # Cleanup
+        if self.connected:
+            await self._drop_connection()
+
+    async def _drop_connection(self):
+        """Close the connection; if the driver is hung, just mark it closed"""
+        try:
+            await self.core.run_blocking(self.disconnect, timeout=DEVICE_CALL_DEADLINE)
+        except asyncio.TimeoutError:
+            print("AcquisitionPipeline: Disconnect missed its deadline")
+            self._set_connected(False)
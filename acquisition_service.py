@@ -0,0 +1,543 @@
+"""Acquisition in its own process, with the GUI attached as a client
+
+The service process owns the CL3_IF session, the acquisition pipeline, the
+CSV logger and zeroing. It publishes every live sample to one shared-memory
+ring and every logged sample to another, and takes commands over a
+localhost JSON-lines control socket. The GUI uses RemoteAcquisition and
+RemoteLogger, which stand in for AcquisitionPipeline and CL3000Logger, so
+a slow redraw no longer delays sampling and a device hang no longer
+freezes the window. A logging session keeps running while the GUI is
+closed; the next GUI start finds the service and reattaches to it.
+
+Run standalone with:  python acquisition_service.py
+"""
+import asyncio
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from acquisition import AcquisitionPipeline, SessionClock
+from config import (ACQ_SERVICE_HOST, ACQ_SERVICE_PORT, ACQ_RING_CAPACITY,
+                    ACQ_LIVE_RING_NAME, ACQ_LOG_RING_NAME)
+from shm_ring import ShmSampleRing
+
+
+class _ControlServer(socketserver.ThreadingTCPServer):
+    # The bound port doubles as the single-instance lock. On Windows SO_REUSEADDR
+    # would let a second service bind the same port, so it is only set elsewhere.
+    allow_reuse_address = os.name != 'nt'
+    daemon_threads = True
+
+
+def _create_ring(name, capacity, clock):
+    try:
+        return ShmSampleRing.create(capacity, clock=clock, name=name)
+    except FileExistsError:
+        # Left behind by a service that was killed; the caller holds the control port,
+        # so no other service can still be writing to it
+        stale = ShmSampleRing.attach(name)
+        stale.owner = True
+        stale.close()
+        return ShmSampleRing.create(capacity, clock=clock, name=name)
+
+
+class AcquisitionService:
+    """Service side: device, logger and zeroing, driven by control commands"""
+
+    def __init__(self, host=ACQ_SERVICE_HOST, port=ACQ_SERVICE_PORT, ring_capacity=ACQ_RING_CAPACITY):
+        from logger import CL3000Logger
+        from zeroing import ZeroingWorker
+
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        response = service.handle(request.pop('cmd'), **request)
+                    except Exception as e:
+                        response = {'error': str(e)}
+                    self.wfile.write(json.dumps(response).encode() + b'\n')
+                    self.wfile.flush()
+
+        # Bind first: a second service fails here, before it touches the running one's rings
+        self.server = _ControlServer((host, port), Handler)
+        try:
+            self.pipeline = AcquisitionPipeline()
+            self.logger = CL3000Logger(6, pipeline=self.pipeline)
+            self.live_ring = _create_ring(ACQ_LIVE_RING_NAME, ring_capacity, self.pipeline.clock)
+            self.log_ring = _create_ring(ACQ_LOG_RING_NAME, ring_capacity, self.pipeline.clock)
+        except Exception:
+            self.server.server_close()
+            raise
+        self.pipeline.subscribe(self.live_ring.append)
+        self.logger.add_sink(self.log_ring.append)
+        self.zeroing = ZeroingWorker(self.pipeline)
+        self.zero_state = None  # {'progress', 'message', 'results'} of the last zeroing job
+        self.session = 0  # Bumped by every start_logging
+        self.session_seq = 0  # Log ring position where the current session starts
+        self.filename = None
+        self.instance = f"{os.getpid()}-{time.time_ns()}"
+        self._lock = threading.Lock()
+
+    def serve_forever(self):
+        self.pipeline.start()
+        print(f"AcquisitionService: Serving on {self.server.server_address} (instance {self.instance})")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.zeroing.cancel_all()
+        if self.logger.running:
+            self.logger.stop()
+        self.pipeline.unsubscribe(self.live_ring.append)
+        self.pipeline.stop()
+        self.server.server_close()
+        self.live_ring.close()
+        self.log_ring.close()
+        print("AcquisitionService: Stopped")
+
+    def handle(self, cmd, **args):
+        """Run one control command; returns the JSON response"""
+        # Status polls and a slow connect must not wait for each other
+        if cmd == 'status':
+            return self.status()
+        if cmd == 'connect':
+            return {'result': self.pipeline.connect(timeout=args.get('timeout', 10000))}
+        with self._lock:
+            if cmd == 'disconnect':
+                self.pipeline.disconnect()
+                return {'result': 0}
+            if cmd == 'set_channels':
+                self.pipeline.set_channel_count(int(args['channels']))
+                self.live_ring.set_channel_count(self.pipeline.num_channels)
+                return {'result': 0}
+            if cmd == 'start_logging':
+                return self._start_logging(args['interval'], args.get('duration'), int(args['channels']))
+            if cmd == 'stop_logging':
+                if self.logger.running:
+                    self.logger.stop()
+                return {'result': 0}
+            if cmd == 'zero':
+                return self._zero(int(args['device_id']), [int(mask) for mask in args['groups']])
+            if cmd == 'zero_cancel':
+                self.zeroing.cancel_all()
+                return {'result': 0}
+            if cmd == 'shutdown':
+                # serve_forever() must be left from another thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return {'result': 0}
+        raise ValueError(f"Unknown command '{cmd}'")
+
+    def status(self):
+        logger = self.logger
+        return {
+            'instance': self.instance,
+            'connected': self.pipeline.connected,
+            'device_available': self.pipeline.device_available,
+            'num_channels': self.pipeline.num_channels,
+            'live_ring': self.live_ring.name,
+            'log_ring': self.log_ring.name,
+            'live_seq': self.live_ring.write_seq,
+            'log_seq': self.log_ring.write_seq,
+            'logging': logger.running,
+            'session': self.session,
+            'session_seq': self.session_seq,
+            'filename': self.filename,
+            'csv_path': logger.csv_path,
+            'channels': logger.out_channels,
+            'samples': logger.total_samples,
+            'start_time': logger.start_time,
+            'zeroing': self.zero_state
+        }
+
+    def _start_logging(self, interval, duration, channels):
+        if self.logger.running:
+            raise RuntimeError("A logging session is already running")
+        self.logger.out_channels = channels
+        self.session += 1
+        self.session_seq = self.log_ring.write_seq
+        self.filename = self.logger.start(interval, duration)
+        return {'filename': self.filename, 'csv_path': self.logger.csv_path,
+                'session': self.session, 'session_seq': self.session_seq}
+
+    def _zero(self, device_id, groups):
+        from zeroing import ZeroingJob
+        if self.zeroing.busy:
+            raise RuntimeError("A zeroing job is already running")
+        state = {'progress': 0.0, 'message': "Starting…", 'results': None}
+
+        def on_progress(fraction, message):
+            state['progress'], state['message'] = fraction, message
+
+        def on_done(results):
+            state['results'] = results
+
+        self.zero_state = state
+        self.zeroing.submit(ZeroingJob(device_id, groups, on_progress=on_progress, on_done=on_done))
+        return {'result': 0}
+
+
+class RemoteAcquisition(AcquisitionPipeline):
+    """GUI-side stand-in for AcquisitionPipeline backed by the acquisition service
+
+    start() attaches to a running service (launching one if none answers)
+    and starts a reader task on the device core that publishes new samples from the live
+    ring to the usual subscribers, and logged samples to the attached
+    RemoteLogger. Connection state and the logging session are followed by
+    polling the service status. stop() only detaches the GUI.
+    """
+
+    def __init__(self, host=ACQ_SERVICE_HOST, port=ACQ_SERVICE_PORT, num_channels=6):
+        super().__init__(num_channels=num_channels)
+        self.host = host
+        self.port = port
+        self.logger = None  # RemoteLogger fed from the log ring
+        self.status = {}
+        self.live_ring = None
+        self.log_ring = None
+        self.live_cursor = 0
+        self.log_cursor = 0
+        self._instance = None
+        self._sock = None
+        self._file = None
+        self._request_lock = threading.Lock()
+
+    def request(self, cmd, **args):
+        """Send one control command and wait for its response (raises on service errors)"""
+        with self._request_lock:
+            if self._file is None:
+                self._sock = socket.create_connection((self.host, self.port), timeout=15)
+                self._file = self._sock.makefile('rwb')
+            try:
+                self._file.write(json.dumps(dict(args, cmd=cmd)).encode() + b'\n')
+                self._file.flush()
+                line = self._file.readline()
+            except OSError:
+                self._close_socket()
+                raise
+            if not line:
+                self._close_socket()
+                raise ConnectionError("Acquisition service closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def _close_socket(self):
+        for closable in (self._file, self._sock):
+            try:
+                if closable:
+                    closable.close()
+            except OSError:
+                pass
+        self._file = self._sock = None
+
+    def launch_service(self):
+        """Start the service as a detached process that outlives the GUI"""
+        script = os.path.abspath(__file__)
+        log_dir = os.path.join(os.getcwd(), "output_files")
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = open(os.path.join(log_dir, "acquisition_service.log"), "a", encoding="utf-8")
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True
+        subprocess.Popen([sys.executable, '-u', script], cwd=os.getcwd(), stdin=subprocess.DEVNULL,
+                         stdout=log_file, stderr=subprocess.STDOUT, **kwargs)
+        log_file.close()
+        print("RemoteAcquisition: Launched acquisition service")
+
+    def _attach(self, status):
+        """Map the service's rings; live data resumes from now, logged data from the session start"""
+        self._detach()
+        self.live_ring = ShmSampleRing.attach(status['live_ring'])
+        self.log_ring = ShmSampleRing.attach(status['log_ring'])
+        header = self.live_ring.header
+        self.clock = SessionClock()
+        self.clock.anchor_ns = int(header['anchor_ns'])
+        self.clock.anchor_wall_ns = int(header['anchor_wall_ns'])
+        self.live_cursor = self.live_ring.write_seq
+        self.log_cursor = self.log_ring.write_seq
+        self._instance = status['instance']
+        self.request('set_channels', channels=self.num_channels)
+        print(f"RemoteAcquisition: Attached to acquisition service {self._instance}")
+        if self.logger:
+            self.logger._on_attach(status)
+
+    def set_channel_count(self, num_channels):
+        super().set_channel_count(num_channels)
+        try:
+            self.request('set_channels', channels=self.num_channels)
+        except (OSError, RuntimeError) as e:
+            print(f"RemoteAcquisition: Could not set channel count: {e}")
+
+    def connect(self, timeout=10000):
+        try:
+            return self.request('connect', timeout=timeout)['result']
+        except (OSError, RuntimeError) as e:
+            print(f"RemoteAcquisition: Connection error: {e}")
+            return -1
+
+    def disconnect(self):
+        try:
+            self.request('disconnect')
+        except (OSError, RuntimeError) as e:
+            print(f"RemoteAcquisition: Disconnect error: {e}")
+
+    def read_sample(self):
+        """Newest live sample from the ring (the device itself belongs to the service)"""
+        if self.live_ring is None or self.live_ring.write_seq == 0:
+            return None
+        batch, cursor, lost = self.live_ring.samples_since(self.live_ring.write_seq - 1)
+        return batch[-1] if batch else None
+
+    def zeroing_worker(self):
+        return RemoteZeroingWorker(self)
+
+    def shutdown_service(self):
+        try:
+            self.request('shutdown')
+        except (OSError, RuntimeError) as e:
+            print(f"RemoteAcquisition: Could not stop the acquisition service: {e}")
+
+    def stop(self):
+        """Detach the GUI; the service (and any logging session) keeps running"""
+        super().stop()
+        with self._request_lock:
+            self._close_socket()
+
+    async def _run(self):
+        """Reader task: drain both rings every few ms, poll the service status"""
+        self._wake = asyncio.Event()
+        next_status = 0.0
+        launch_deadline = None
+        while self.running:
+            try:
+                now = time.monotonic()
+                status = None
+                if now >= next_status:
+                    next_status = now + 0.25
+                    try:
+                        status = await self.core.run_blocking(self.request, 'status')
+                    except (OSError, RuntimeError, ValueError):
+                        # No service answering: launch one, and again if it is not up in time
+                        if self.connected:
+                            self._set_connected(False)
+                        if launch_deadline is None or now > launch_deadline:
+                            self.launch_service()
+                            launch_deadline = now + 15.0
+                        await self._sleep(0.5)
+                        continue
+                    launch_deadline = None
+                    if status['instance'] != self._instance:
+                        await self.core.run_blocking(self._attach, status)
+                    self.status = status
+                    if status['connected'] != self.connected:
+                        self.device_available = status['device_available']
+                        self._set_connected(status['connected'])
+
+                batch, self.live_cursor, lost = self.live_ring.samples_since(self.live_cursor)
+                if batch:
+                    self._publish(batch)
+                logged, self.log_cursor, lost = self.log_ring.samples_since(self.log_cursor)
+                if logged and self.logger:
+                    self.logger._on_logged(logged)
+                # Only after draining the log ring, so the last rows of a session are not lost
+                if status is not None and self.logger:
+                    self.logger._on_status(status)
+                await self._sleep(0.02)
+            except Exception as e:
+                # e.g. the rings vanished with a service restart: detach and attach afresh
+                print(f"RemoteAcquisition: Error in reader task: {e}")
+                self._detach()
+                if self.connected:
+                    self._set_connected(False)
+                next_status = 0.0
+                await self._sleep(1.0)
+        self._detach()
+
+    def _detach(self):
+        for ring in (self.live_ring, self.log_ring):
+            if ring:
+                try:
+                    ring.close()
+                except Exception as e:
+                    print(f"RemoteAcquisition: Could not close ring: {e}")
+        self.live_ring = self.log_ring = None
+        self._instance = None
+
+
+class RemoteLogger:
+    """GUI-side stand-in for CL3000Logger; the CSV is written by the acquisition service"""
+
+    def __init__(self, out_channels, pipeline=None):
+        self.running = False
+        self.pipeline = None
+        self.out_channels = out_channels
+        self.csv_path = None
+        self.total_samples = 0
+        self.sinks = []
+        self.callback_update_display = None
+        self.callback_on_stop = None
+        self.callback_on_resume = None
+        self._session = 0
+        self._start_t_ns = None
+        if pipeline is not None:
+            self.attach_pipeline(pipeline)
+
+    def set_callbacks(self, update_display_fn=None, on_stop_fn=None, on_resume_fn=None):
+        self.callback_update_display = update_display_fn
+        self.callback_on_stop = on_stop_fn
+        self.callback_on_resume = on_resume_fn
+
+    def attach_pipeline(self, pipeline):
+        self.pipeline = pipeline
+        pipeline.logger = self
+
+    def add_sink(self, sink):
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def connect(self):
+        return self.pipeline.connect(timeout=10000)
+
+    def disconnect(self):
+        self.pipeline.disconnect()
+
+    def start(self, interval, duration):
+        response = self.pipeline.request('start_logging', interval=interval, duration=duration,
+                                         channels=self.out_channels)
+        self._session = response['session']
+        self.csv_path = response['csv_path']
+        self.total_samples = 0
+        self._start_t_ns = None
+        self.running = True
+        return response['filename']
+
+    def stop(self):
+        try:
+            self.pipeline.request('stop_logging')
+        except (OSError, RuntimeError) as e:
+            print(f"RemoteLogger: Could not stop logging: {e}")
+        self._end_session()
+
+    def _end_session(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.callback_on_stop:
+            self.callback_on_stop()
+
+    def _on_attach(self, status):
+        """Reattached to a service that is still logging: replay what the log ring still holds"""
+        if not status['logging']:
+            self._end_session()  # The session ended (or the service restarted) while detached
+            return
+        self._session = status['session']
+        self.csv_path = status['csv_path']
+        self.out_channels = status['channels']
+        start = max(status['session_seq'], status['log_seq'] - self.pipeline.log_ring.capacity)
+        self.pipeline.log_cursor = start
+        self.total_samples = status['samples'] - (status['log_seq'] - start)
+        self._start_t_ns = int(status['start_time'] * 1e9) if status['start_time'] is not None else None
+        self.running = True
+        if self.callback_on_resume:
+            self.callback_on_resume(status['filename'], self._start_t_ns)
+
+    def _on_status(self, status):
+        # A status taken before our own start_logging belongs to the previous session
+        if self.running and status.get('session') == self._session and not status['logging']:
+            self._end_session()
+
+    def _on_logged(self, batch):
+        if not self.running:
+            return
+        batch = [sample._replace(values=sample.values[:self.out_channels],
+                                 judges=sample.judges[:self.out_channels]) for sample in batch]
+        self.total_samples += len(batch)
+        if self._start_t_ns is None:
+            self._start_t_ns = batch[0].t_ns
+        for sink in self.sinks:
+            try:
+                sink(batch)
+            except Exception as e:
+                print(f"RemoteLogger: Sink error: {e}")
+        if self.callback_update_display:
+            last = batch[-1]
+            row = [self.pipeline.clock.format(last.t_ns)]
+            for value, judge in zip(last.values, last.judges):
+                row.extend([value, judge])
+            self.callback_update_display(row, last.t_ns, self.total_samples,
+                                         (last.t_ns - self._start_t_ns) / 1e9)
+
+
+class RemoteZeroingWorker:
+    """ZeroingWorker interface for zeroing jobs run inside the acquisition service"""
+
+    def __init__(self, acquisition):
+        self.acquisition = acquisition
+        self._job = None
+
+    @property
+    def busy(self):
+        return self._job is not None
+
+    def submit(self, job):
+        self._job = job
+        self.acquisition.core.spawn(self._run(job))
+        return job
+
+    def cancel_all(self):
+        if self._job is not None:
+            self._job.cancelled = True
+            try:
+                self.acquisition.request('zero_cancel')
+            except (OSError, RuntimeError):
+                pass
+
+    async def _run(self, job):
+        core = self.acquisition.core
+        request = self.acquisition.request
+        try:
+            await core.run_blocking(lambda: request('zero', device_id=job.device_id, groups=job.groups))
+            while True:
+                await asyncio.sleep(0.1)
+                state = (await core.run_blocking(request, 'status'))['zeroing']
+                if state is None:
+                    raise RuntimeError("the acquisition service restarted during zeroing")
+                if state['results'] is not None:
+                    job.results = state['results']
+                    for result in job.results:
+                        # JSON turns the channel keys into strings
+                        for key in ('before', 'after', 'settled'):
+                            result[key] = {int(ch): value for ch, value in result[key].items()}
+                    break
+                if job.on_progress:
+                    job.on_progress(state['progress'], state['message'])
+        except Exception as e:
+            # Whatever went wrong, on_done must run so the page stops waiting
+            print(f"RemoteZeroingWorker: Job failed: {e}")
+            job.results = [{'bitmask': 0, 'code': -1, 'error': str(e),
+                            'before': {}, 'after': {}, 'settled': {}}]
+        finally:
+            self._job = None
+        if job.on_done:
+            job.on_done(job.results)
+
+
+if __name__ == "__main__":
+    try:
+        service = AcquisitionService()
+    except OSError as e:
+        print(f"AcquisitionService: Could not start, is another service running? ({e})")
+        sys.exit(1)
+    service.serve_forever()
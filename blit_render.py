@@ -0,0 +1,129 @@
+from offscreen_render import blit_image, tk_blit_available
+
+
+class _Region:
+    """One axes with its own cached background and data artists"""
+
+    def __init__(self, ax, artists):
+        self.ax = ax
+        self.artists = artists  # Callable returning the artists drawn over the background
+        self.background = None
+        self.limits = None
+        self.dirty = True
+
+    def current_limits(self):
+        return (tuple(self.ax.get_xlim()), tuple(self.ax.get_ylim()))
+
+
+class BlitRenderer:
+    """Shared fast renderer for the graph widgets
+
+    Static parts (axes, ticks, grid, legend) are cached per axes after each
+    full draw; a frame only restores the cached backgrounds of dirty axes and
+    draws their animated data artists on top. A full draw happens only when
+    limits or layout change. With a RenderWorker the whole frame is
+    rasterized off the Tk thread instead and the finished image blitted in.
+    """
+
+    def __init__(self, widget, canvas, use_blit=True, render_worker=None, snapshot=None):
+        self.widget = widget
+        self.canvas = canvas
+        self.use_blit = use_blit
+        if render_worker and not tk_blit_available(canvas):
+            # Frames from the worker could not be shown; draw on the Tk thread instead
+            print("BlitRenderer: This matplotlib cannot blit worker frames into Tk, drawing in-process")
+            render_worker.stop()
+            render_worker = None
+        self.render_worker = render_worker
+        self.snapshot = snapshot  # Callable building an offscreen_render snapshot
+        self.regions = []
+        self._poll_id = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+        if self.render_worker:
+            self._poll_id = widget.after(16, self._poll_render_worker)
+
+    def add_region(self, ax, artists):
+        """Blit `ax` separately; `artists()` returns the data artists to draw in it"""
+        region = _Region(ax, artists)
+        self.regions.append(region)
+        return region
+
+    def clear_regions(self):
+        self.regions = []
+
+    def _on_draw(self, event):
+        """After a full draw: cache the static backgrounds and paint the data on top"""
+        if not self.use_blit or self._worker_active():
+            return
+        for region in self.regions:
+            region.background = self.canvas.copy_from_bbox(region.ax.bbox)
+            region.limits = region.current_limits()
+            region.dirty = False
+            self._draw_artists(region)
+
+    def _draw_artists(self, region):
+        for artist in region.artists():
+            region.ax.draw_artist(artist)
+
+    def invalidate(self):
+        """Force the next render to be a full redraw (legend/layout changes)"""
+        for region in self.regions:
+            region.background = None
+
+    def mark_dirty(self, ax=None):
+        """Flag one axes (or all) as having new data for the next render"""
+        for region in self.regions:
+            if ax is None or region.ax is ax:
+                region.dirty = True
+
+    def render(self, dirty_only=False):
+        """Show the current artists: blit over cached backgrounds, full draw only if needed
+
+        With `dirty_only`, only axes flagged by mark_dirty() are re-blitted.
+        """
+        if self._worker_active():
+            self.render_worker.submit(self.snapshot())
+            return
+        if not self.use_blit:
+            self.canvas.draw()
+            return
+        if any(region.background is None or region.limits != region.current_limits()
+               for region in self.regions):
+            self.canvas.draw()  # Triggers _on_draw, which re-caches the backgrounds
+            return
+        for region in self.regions:
+            if dirty_only and not region.dirty:
+                continue
+            self.canvas.restore_region(region.background)
+            self._draw_artists(region)
+            self.canvas.blit(region.ax.bbox)
+            region.dirty = False
+
+    def _worker_active(self):
+        """The worker is used only while the owner provides a snapshot for its layout"""
+        return self.render_worker is not None and self.snapshot is not None
+
+    def _poll_render_worker(self):
+        """Blit the newest finished frame into the Tk canvas"""
+        try:
+            image = self.render_worker.poll()
+            if image is not None and not blit_image(self.canvas, image):
+                self.render()  # Canvas was resized while the frame rendered
+        except Exception as e:
+            print(f"Error showing rendered frame: {e}")
+        self._poll_id = self.widget.after(16, self._poll_render_worker)
+
+    def pause(self):
+        """Stop polling the render worker while the owning view is hidden"""
+        if self._poll_id:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def resume(self):
+        if self.render_worker and self._poll_id is None:
+            self._poll_id = self.widget.after(16, self._poll_render_worker)
+
+    def stop(self):
+        self.pause()
+        if self.render_worker:
+            self.render_worker.stop()
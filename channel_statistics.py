@@ -0,0 +1,169 @@
+import math
+import threading
+from acquisition import INVALID_VALUE
+from judge_runs import JudgeRuns
+
+# Sliding windows offered to operators, in seconds
+DEFAULT_WINDOWS = {'10 s': 10.0, '1 min': 60.0, '10 min': 600.0}
+
+# Each window is split into this many ring buckets (window edge resolution = 5%)
+BUCKETS_PER_WINDOW = 20
+
+
+class RunningStats:
+    """Welford accumulator: count, mean, variance, min and max in O(1) per value"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Combine another accumulator into this one (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def snapshot(self):
+        """Return the statistics as a plain dict (None values when empty)"""
+        if self.count == 0:
+            return {'count': 0, 'mean': None, 'std': None, 'min': None, 'max': None, 'range': None}
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': std,
+            'min': self.min,
+            'max': self.max,
+            'range': self.max - self.min
+        }
+
+
+class WindowedStats:
+    """Sliding-window statistics from a fixed ring of time buckets"""
+
+    def __init__(self, window_seconds, num_buckets=BUCKETS_PER_WINDOW):
+        self.window_seconds = window_seconds
+        self.bucket_width = window_seconds / num_buckets
+        self.buckets = [RunningStats() for _ in range(num_buckets)]
+        self.bucket_ids = [None] * num_buckets
+
+    def reset(self):
+        for bucket in self.buckets:
+            bucket.reset()
+        self.bucket_ids = [None] * len(self.buckets)
+
+    def add(self, t, value):
+        bucket_id = int(t // self.bucket_width)
+        slot = bucket_id % len(self.buckets)
+        if self.bucket_ids[slot] != bucket_id:
+            # The slot still holds a bucket that has slid out of the window
+            self.buckets[slot].reset()
+            self.bucket_ids[slot] = bucket_id
+        self.buckets[slot].add(value)
+
+    def snapshot(self, now):
+        """Merge the live buckets; cost depends on the bucket count, not on history"""
+        newest = int(now // self.bucket_width)
+        oldest = newest - len(self.buckets) + 1
+        total = RunningStats()
+        for bucket_id, bucket in zip(self.bucket_ids, self.buckets):
+            if bucket_id is not None and oldest <= bucket_id <= newest:
+                total.merge(bucket)
+        return total.snapshot()
+
+
+class StatisticsEngine:
+    """Per-channel session and sliding-window statistics fed from the acquisition path"""
+
+    def __init__(self, num_channels=8, windows=None):
+        self.windows = dict(DEFAULT_WINDOWS if windows is None else windows)
+        self.lock = threading.Lock()
+        self.session = {}
+        self.windowed = {}
+        self.judges = {}
+        self.last_time = 0.0
+        for channel_num in range(1, num_channels + 1):
+            self.add_channel(channel_num)
+
+    def add_channel(self, channel_num):
+        with self.lock:
+            if channel_num not in self.session:
+                self.session[channel_num] = RunningStats()
+                self.windowed[channel_num] = {name: WindowedStats(seconds)
+                                              for name, seconds in self.windows.items()}
+                # Only the current run is kept; the HI/GO/LO counters cover the whole session
+                self.judges[channel_num] = JudgeRuns(maxlen=1)
+
+    def reset(self):
+        """Start a new statistics session"""
+        with self.lock:
+            for stats in self.session.values():
+                stats.reset()
+            for windows in self.windowed.values():
+                for stats in windows.values():
+                    stats.reset()
+            for runs in self.judges.values():
+                runs.clear()
+
+    def add_samples(self, batch):
+        """AcquisitionPipeline subscriber: O(1) work per value, history is never rescanned"""
+        with self.lock:
+            for sample in batch:
+                t = sample.t_ns / 1e9
+                self.last_time = t
+                for i, value in enumerate(sample.values):
+                    channel_num = i + 1
+                    if channel_num in self.judges:
+                        self.judges[channel_num].append(sample.judges[i], t)
+                    if value == INVALID_VALUE or value != value or channel_num not in self.session:
+                        continue
+                    self.session[channel_num].add(value)
+                    for stats in self.windowed[channel_num].values():
+                        stats.add(t, value)
+
+    def snapshot(self, channel_num, window=None):
+        """Stats dict for one channel; `window` is a key of `windows` or None for the session"""
+        with self.lock:
+            if channel_num not in self.session:
+                return RunningStats().snapshot()
+            if window is None:
+                return self.session[channel_num].snapshot()
+            return self.windowed[channel_num][window].snapshot(self.last_time)
+
+    def judge_counters(self, channel_num):
+        """Session time per judge state, HI/LO excursion count and longest excursion"""
+        with self.lock:
+            if channel_num not in self.judges:
+                return JudgeRuns().counters()
+            return self.judges[channel_num].counters(self.last_time)
+
+    def snapshot_all(self, window=None):
+        return {channel_num: self.snapshot(channel_num, window) for channel_num in list(self.session)}
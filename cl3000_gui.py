@@ -1,3 +1,4 @@
+import startup  # First, so the startup report measures everything after it
 import customtkinter as ctk
 
 # ===== Setup CTK Style =====
@@ -6,10 +7,18 @@ ctk.set_default_color_theme("green")
 
 from gui.app import CL3000App
 from logger import CL3000Logger
+from config import ACQUISITION_PROCESS
+startup.mark("imports")
 
 if __name__ == "__main__":
-    logger = CL3000Logger(6)  # Default to 6 channels
+    if ACQUISITION_PROCESS:
+        # The CSV is written by the acquisition service process
+        from acquisition_service import RemoteLogger
+        logger = RemoteLogger(6)
+    else:
+        logger = CL3000Logger(6)  # Default to 6 channels
     app = CL3000App(logger)
+    startup.mark("main window built")
     
     # Set up proper closing handler
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
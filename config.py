@@ -16,3 +16,80 @@ COLORS = {
     'accent': "#4CAF50",
     'text': "#FFFFFF"
 }
+
+# Plot color per OUT channel (8 distinct colors)
+CHANNEL_COLORS = [
+    '#00FF7F',  # Spring Green
+    '#FF6B6B',  # Light Red
+    '#4ECDC4',  # Teal
+    '#FFE66D',  # Yellow
+    '#A8E6CF',  # Light Green
+    '#FF8B94',  # Pink
+    '#B4A7D6',  # Light Purple
+    '#FFD3A5'   # Light Orange
+]
+
+# Points kept per channel for the live graph (plotting is M4-decimated to the axes width)
+GRAPH_BUFFER_POINTS = 100000
+
+# Graph rasterization: None draws on the Tk thread, 'thread' or 'process' renders
+# frames off the main thread and only blits the finished image into the canvas
+GRAPH_RENDER_WORKER = None
+
+# GUI refresh governor: share of Tk main-thread time the views may spend rendering,
+# refresh interval bounds (s), and how often to print fps/frame-time stats (None = never)
+FRAME_CPU_BUDGET = 0.5
+FRAME_MIN_INTERVAL = 1 / 30
+FRAME_MAX_INTERVAL = 1.0
+FRAME_STATS_LOG_INTERVAL = None
+
+# Graph export (runs in a background process): snapshot DPI, and frame rate and
+# length (s) of the time-lapse video a whole session is compressed into
+EXPORT_DPI = 100
+EXPORT_VIDEO_FPS = 30
+EXPORT_VIDEO_SECONDS = 20
+
+# Print startup phase timings (imports, first frame, device connected) to the console
+STARTUP_REPORT = True
+
+# UI watchdog: event-loop heartbeat period (s), duration above which a callback or
+# loop stall is recorded with stack samples (s), and records kept
+WATCHDOG_HEARTBEAT_INTERVAL = 0.05
+WATCHDOG_SLOW_THRESHOLD = 0.05
+WATCHDOG_CAPACITY = 200
+
+# Zeroing verification: wait after auto-zero (s), samples averaged for the
+# before/after reading, and how far from zero (μm) an OUT may settle
+ZEROING_SETTLE_TIME = 0.5
+ZEROING_VERIFY_READS = 5
+ZEROING_TOLERANCE = 1.0
+
+# Local live-data stream for other tools (JSON lines, see stream_server.py).
+# Listens on localhost TCP, or on a Unix socket when STREAM_UNIX_PATH is set.
+# Clients may ask for up to STREAM_HISTORY_SECONDS of recent samples; a client
+# with more than STREAM_CLIENT_BUFFER unsent bytes is disconnected.
+STREAM_SERVER_ENABLED = False
+STREAM_HOST = '127.0.0.1'
+STREAM_PORT = 24700
+STREAM_UNIX_PATH = None
+STREAM_HISTORY_SECONDS = 60
+STREAM_CLIENT_BUFFER = 1 << 20
+
+# Run acquisition, logging and zeroing in a separate service process (see
+# acquisition_service.py); the GUI attaches over a localhost control port and
+# two shared-memory rings of ACQ_RING_CAPACITY samples, and a logging session
+# survives closing the GUI
+ACQUISITION_PROCESS = False
+ACQ_SERVICE_HOST = '127.0.0.1'
+ACQ_SERVICE_PORT = 24701
+ACQ_RING_CAPACITY = 200000
+ACQ_LIVE_RING_NAME = 'cl3000_live'
+ACQ_LOG_RING_NAME = 'cl3000_log'
+
+# Device I/O core (asyncio loop, see device_core.py): executor threads for blocking
+# CL3_IF calls, deadlines (s) for a read and for opening the connection, and how
+# often the CSV log is flushed to disk (s)
+DEVICE_IO_WORKERS = 2
+DEVICE_CALL_DEADLINE = 2.0
+DEVICE_CONNECT_DEADLINE = 15.0
+LOG_FLUSH_INTERVAL = 1.0
@@ -1,6 +1,7 @@
 # -*- coding: 'unicode' -*-
 import CL3wrap
 import ctypes
+from acquisition import decode_measurement
 import time
 import csv
 import os
@@ -59,13 +60,9 @@ with open(csv_name, mode='w', newline='') as file:
 
             row = [now]
             if res == 0:
-                for i in range(OUT_CHANNELS):
-                    out = measurementData.outMeasurementData[i]
-                    val = out.measurementValue / 100.0
-                    judge_code = out.judgeResult
-                    judge_str = {
-                        1: "HI", 2: "GO", 4: "LO", 0: "STANDBY", 5: "INVALID"
-                    }.get(judge_code, f"UNKNOWN({judge_code})")
+                # Same decoding (bitmask judges) as the GUI's acquisition pipeline
+                sample = decode_measurement(measurementData, OUT_CHANNELS)
+                for val, judge_str in zip(sample.values, sample.judges):
                     row.extend([val, judge_str])
             else:
                 print(f"⚠️ Failed to get measurement data: {CL3wrap.CL3IF_hex(res)}")
@@ -1,43 +1,220 @@
 from collections import deque
+import math
 import threading
-import time
-from datetime import datetime
-import CL3wrap
-from config import DEVICE_ID, IP, PORT
+import numpy as np
+from acquisition import AcquisitionPipeline, INVALID_VALUE
+from judge_runs import JudgeRuns
+
+def valid_mask(values):
+    """Boolean mask of plottable values: finite and not the invalid/STANDBY marker"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.isfinite(values) & (values != INVALID_VALUE)
+
+
+def expand_judge_runs(runs, n):
+    """Expand (start, end, code) judge runs into one uint8 code per sample"""
+    codes = np.zeros(n, dtype=np.uint8)
+    for start, end, code in runs:
+        codes[start:end] = code
+    return codes
+
+
+class SampleRing:
+    """Fixed-capacity ring of int64 monotonic-ns timestamps and float64 values
+
+    Also keeps running extents of the valid values (min/max value, first/last
+    time). Min and max use monotonic deques of (index, value), so an extreme is
+    only dropped when the ring evicts it and extents() is O(1).
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.t_ns = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full(capacity, np.nan)
+        self.head = 0  # Next slot to write
+        self.count = 0
+        self.generation = 0  # Bumped by clear() so readers holding a cursor can tell
+        self._reset_extents()
+    
+    def _reset_extents(self):
+        self.total = 0  # Absolute index of the next sample
+        self._min_queue = deque()  # (index, value), values increasing
+        self._max_queue = deque()  # (index, value), values decreasing
+        self._first_valid = None  # Absolute index of the oldest valid sample in the ring
+        self._last_valid_t = None
+    
+    def __len__(self):
+        return self.count
+    
+    def append(self, t_ns, value):
+        index = self.total
+        self.total += 1
+        self.t_ns[self.head] = t_ns
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        
+        if math.isfinite(value) and value != INVALID_VALUE:
+            while self._min_queue and self._min_queue[-1][1] >= value:
+                self._min_queue.pop()
+            self._min_queue.append((index, value))
+            while self._max_queue and self._max_queue[-1][1] <= value:
+                self._max_queue.pop()
+            self._max_queue.append((index, value))
+            if self._first_valid is None:
+                self._first_valid = index
+            self._last_valid_t = t_ns
+        
+        self._evict(self.total - self.count)
+    
+    def _evict(self, oldest):
+        """Forget extremes and the first valid sample once the ring overwrote them"""
+        while self._min_queue and self._min_queue[0][0] < oldest:
+            self._min_queue.popleft()
+        while self._max_queue and self._max_queue[0][0] < oldest:
+            self._max_queue.popleft()
+        if self._first_valid is not None and self._first_valid < oldest:
+            # Walk forward to the next valid sample; each index is visited at most once
+            self._first_valid = None
+            for index in range(oldest, self.total):
+                value = self.values[index % self.capacity]
+                if np.isfinite(value) and value != INVALID_VALUE:
+                    self._first_valid = index
+                    break
+            if self._first_valid is None:
+                self._last_valid_t = None
+    
+    def extents(self):
+        """(first_t_ns, last_t_ns, min_value, max_value) of the valid samples, or None"""
+        if self._first_valid is None:
+            return None
+        first_t = self.t_ns[self._first_valid % self.capacity]
+        return first_t, self._last_valid_t, self._min_queue[0][1], self._max_queue[0][1]
+    
+    def arrays(self):
+        """Chronological copies of (t_ns, values)"""
+        if self.count < self.capacity:
+            return self.t_ns[:self.count].copy(), self.values[:self.count].copy()
+        return (np.concatenate((self.t_ns[self.head:], self.t_ns[:self.head])),
+                np.concatenate((self.values[self.head:], self.values[:self.head])))
+    
+    def since(self, index):
+        """Samples from absolute index `index` on as (t_ns, values, start_index)
+
+        If `index` has already been overwritten (or is past the end after a
+        clear) the oldest retained sample is returned first instead.
+        """
+        oldest = self.total - self.count
+        start = index if oldest <= index <= self.total else oldest
+        slots = (self.head - (self.total - start) + np.arange(self.total - start)) % self.capacity
+        return self.t_ns[slots], self.values[slots], start
+    
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.generation += 1
+        self._reset_extents()
+
 
 class GraphDataManager:
     def __init__(self, max_points=1000):
         self.max_points = max_points
-        self.data = {}  # {channel_num: {'timestamps': deque, 'values': deque, 'judges': deque}}
+        self.data = {}  # {channel_num: {'samples': SampleRing, 'judges': JudgeRuns}}
+        self.lock = threading.Lock()
         
     def add_channel(self, channel_num):
-        if channel_num not in self.data:
-            self.data[channel_num] = {
-                'timestamps': deque(maxlen=self.max_points),
-                'values': deque(maxlen=self.max_points),
-                'judges': deque(maxlen=self.max_points)
-            }
+        with self.lock:
+            if channel_num not in self.data:
+                self.data[channel_num] = {
+                    'samples': SampleRing(self.max_points),
+                    'judges': JudgeRuns(maxlen=self.max_points)
+                }
     
-    def add_data_point(self, channel_num, timestamp, value, judge):
+    def add_data_point(self, channel_num, t_ns, value, judge):
+        """Append one point; t_ns is a monotonic nanosecond stamp (Sample.t_ns)"""
         if channel_num not in self.data:
             self.add_channel(channel_num)
         
-        self.data[channel_num]['timestamps'].append(timestamp)
-        self.data[channel_num]['values'].append(value)
-        self.data[channel_num]['judges'].append(judge)
+        with self.lock:
+            self.data[channel_num]['samples'].append(t_ns, value)
+            self.data[channel_num]['judges'].append(judge, t_ns / 1e9)
+    
+    def add_samples(self, batch):
+        """Sink for AcquisitionPipeline/CL3000Logger sample batches"""
+        for sample in batch:
+            for i, (value, judge) in enumerate(zip(sample.values, sample.judges)):
+                self.add_data_point(i + 1, sample.t_ns, value, judge)
     
     def get_channel_data(self, channel_num):
-        if channel_num in self.data:
-            return (list(self.data[channel_num]['timestamps']),
-                   list(self.data[channel_num]['values']),
-                   list(self.data[channel_num]['judges']))
-        return [], [], []
+        """Return (t_ns int64 array, values float64 array, judge list)"""
+        with self.lock:
+            if channel_num in self.data:
+                t_ns, values = self.data[channel_num]['samples'].arrays()
+                return t_ns, values, self.data[channel_num]['judges'].to_list()
+        return np.empty(0, dtype=np.int64), np.empty(0), []
+    
+    def get_channel_snapshot(self, channel_num):
+        """Return (t_ns, values, judge runs) taken together so the run indexes line up"""
+        with self.lock:
+            if channel_num in self.data:
+                t_ns, values = self.data[channel_num]['samples'].arrays()
+                return t_ns, values, self.data[channel_num]['judges'].runs()
+        return np.empty(0, dtype=np.int64), np.empty(0), []
+    
+    def get_channel_arrays(self, channel_num):
+        """Return (t_ns, values, judge codes) as aligned NumPy arrays"""
+        with self.lock:
+            if channel_num in self.data:
+                t_ns, values = self.data[channel_num]['samples'].arrays()
+                runs = self.data[channel_num]['judges'].runs()
+                return t_ns, values, expand_judge_runs(runs, len(t_ns))
+        return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.uint8)
+    
+    def get_samples_since(self, channel_num, cursor=None):
+        """Incremental read: samples added after `cursor` as (t_ns, values, cursor, reset)
+
+        Pass the returned cursor back on the next call. `reset` is True when the
+        reader's history is no longer contiguous (first call, clear, or samples
+        overwritten before they were read) and it should drop what it holds.
+        """
+        with self.lock:
+            if channel_num not in self.data:
+                return np.empty(0, dtype=np.int64), np.empty(0), None, cursor is not None
+            ring = self.data[channel_num]['samples']
+            generation, index = cursor if cursor is not None else (None, 0)
+            if generation != ring.generation:
+                index = 0
+            t_ns, values, start = ring.since(index)
+            reset = generation != ring.generation or start != index
+            return t_ns, values, (ring.generation, ring.total), reset
+    
+    def get_channel_extents(self, channel_num):
+        """Running (first_t_ns, last_t_ns, min_value, max_value) of a channel, or None"""
+        with self.lock:
+            if channel_num in self.data:
+                return self.data[channel_num]['samples'].extents()
+        return None
+    
+    def get_judge_runs(self, channel_num):
+        """Judge runs as (start, end, code) aligned with get_channel_data indexes"""
+        with self.lock:
+            if channel_num in self.data:
+                return self.data[channel_num]['judges'].runs()
+        return []
+    
+    def get_judge_counters(self, channel_num, now=None):
+        """Time in each judge state, HI/LO excursion count and longest excursion"""
+        with self.lock:
+            if channel_num in self.data:
+                return self.data[channel_num]['judges'].counters(now)
+        return JudgeRuns().counters()
     
     def clear_all(self):
-        for channel_data in self.data.values():
-            channel_data['timestamps'].clear()
-            channel_data['values'].clear()
-            channel_data['judges'].clear()
+        with self.lock:
+            for channel_data in self.data.values():
+                channel_data['samples'].clear()
+                channel_data['judges'].clear()
     
     def clear_all_data(self):
         """Alias for clear_all for compatibility"""
@@ -45,25 +222,27 @@ class GraphDataManager:
     
     def clear_data(self, channel_num):
         """Clear data for a specific channel"""
-        if channel_num in self.data:
-            self.data[channel_num]['timestamps'].clear()
-            self.data[channel_num]['values'].clear()
-            self.data[channel_num]['judges'].clear()
+        with self.lock:
+            if channel_num in self.data:
+                self.data[channel_num]['samples'].clear()
+                self.data[channel_num]['judges'].clear()
 
 
 class LiveDataManager:
-    """Manages live data reading from the CL3000 device"""
+    """Keeps the latest live value per channel, fed by the shared AcquisitionPipeline"""
     
-    def __init__(self, num_channels=6, update_interval=0.5):
+    def __init__(self, num_channels=6, update_interval=0.5, pipeline=None):
         self.num_channels = num_channels
         self.update_interval = update_interval
+        # A shared pipeline is stopped by its owner; one created here is ours to stop
+        self.owns_pipeline = pipeline is None
+        if pipeline is None:
+            pipeline = AcquisitionPipeline(num_channels=num_channels, poll_interval=update_interval)
+        self.pipeline = pipeline
         self.running = False
-        self.thread = None
-        self.connected = False
-        self.device_available = False
         
         # Current live data
-        self.current_data = {}  # {channel_num: {'value': float, 'judge': str, 'timestamp': datetime}}
+        self.current_data = {}  # {channel_num: {'value': float, 'judge': str, 't_ns': int}}
         self.data_lock = threading.Lock()
         
         # Callbacks
@@ -73,11 +252,19 @@ class LiveDataManager:
         # Initialize current data structure
         for i in range(1, num_channels + 1):
             self.current_data[i] = {
-                'value': -9999.98,
+                'value': INVALID_VALUE,
                 'judge': 'IDLE',
-                'timestamp': None
+                't_ns': None
             }
     
+    @property
+    def connected(self):
+        return self.pipeline.connected
+    
+    @property
+    def device_available(self):
+        return self.pipeline.device_available
+    
     def set_callbacks(self, data_update_callback=None, connection_change_callback=None):
         """Set callbacks for data updates and connection status changes"""
         self.on_data_update = data_update_callback
@@ -85,111 +272,51 @@ class LiveDataManager:
     
     def connect(self):
         """Attempt to connect to the device"""
-        try:
-            ethernetConfig = CL3wrap.CL3IF_ETHERNET_SETTING()
-            for i in range(4):
-                ethernetConfig.abyIpAddress[i] = IP[i]
-            ethernetConfig.wPortNo = PORT
-            
-            result = CL3wrap.CL3IF_OpenEthernetCommunication(DEVICE_ID, ethernetConfig, 5000)
-            
-            if result == 0:
-                self.connected = True
-                self.device_available = True
-                print("LiveDataManager: Successfully connected to device")
-                if self.on_connection_change:
-                    self.on_connection_change(True)
-                return True
-            else:
-                self.connected = False
-                self.device_available = False
-                print(f"LiveDataManager: Connection failed with error {result}")
-                if self.on_connection_change:
-                    self.on_connection_change(False)
-                return False
-                
-        except Exception as e:
-            print(f"LiveDataManager: Connection error: {e}")
-            self.connected = False
-            self.device_available = False
-            if self.on_connection_change:
-                self.on_connection_change(False)
-            return False
+        return self.pipeline.connect() == 0
     
     def disconnect(self):
         """Disconnect from the device"""
-        try:
-            CL3wrap.CL3IF_CloseCommunication(DEVICE_ID)
-            self.connected = False
-            print("LiveDataManager: Disconnected from device")
-            if self.on_connection_change:
-                self.on_connection_change(False)
-        except Exception as e:
-            print(f"LiveDataManager: Disconnect error: {e}")
-    
-    def read_current_data(self):
-        """Read current measurement data from the device"""
-        if not self.connected:
-            return False
-            
-        try:
-            data = CL3wrap.CL3IF_MEASUREMENT_DATA()
-            result = CL3wrap.CL3IF_GetMeasurementData(DEVICE_ID, data)
-            
-            if result == 0:
-                timestamp = datetime.now()
-                data_updated = False
-                
-                with self.data_lock:
-                    for i in range(self.num_channels):
-                        channel_num = i + 1
-                        val = data.outMeasurementData[i].measurementValue / 100.0
-                        info = data.outMeasurementData[i].valueInfo
-                        
-                        if info == 1:
-                            val = -9999.98
-                            judge = "STANDBY"
-                        else:
-                            judge_code = data.outMeasurementData[i].judgeResult
-                            if judge_code & 0x01:
-                                judge = "HI"
-                            elif judge_code & 0x04:
-                                judge = "LO"
-                            elif judge_code & 0x02:
-                                judge = "GO"
-                            else:
-                                judge = "??"
-                        
-                        # Update if data changed
-                        if (self.current_data[channel_num]['value'] != val or 
-                            self.current_data[channel_num]['judge'] != judge):
-                            self.current_data[channel_num] = {
-                                'value': val,
-                                'judge': judge,
-                                'timestamp': timestamp
-                            }
-                            data_updated = True
-                
-                if data_updated and self.on_data_update:
-                    self.on_data_update(self.current_data.copy())
-                
-                return True
-            else:
-                print(f"LiveDataManager: Failed to read data, error {result}")
-                return False
+        self.pipeline.disconnect()
+    
+    def _on_connection(self, connected):
+        if self.on_connection_change:
+            self.on_connection_change(connected)
+    
+    def _on_samples(self, batch):
+        """Pipeline subscriber: keep the newest sample of the batch per channel"""
+        if not batch:
+            return
+        sample = batch[-1]
+        data_updated = False
+        
+        with self.data_lock:
+            for i in range(min(self.num_channels, len(sample.values))):
+                channel_num = i + 1
+                val = sample.values[i]
+                judge = sample.judges[i]
                 
-        except Exception as e:
-            print(f"LiveDataManager: Error reading data: {e}")
-            return False
+                # Update if data changed
+                current = self.current_data.get(channel_num)
+                if current is None or current['value'] != val or current['judge'] != judge:
+                    self.current_data[channel_num] = {
+                        'value': val,
+                        'judge': judge,
+                        't_ns': sample.t_ns
+                    }
+                    data_updated = True
+            snapshot = self.current_data.copy() if data_updated else None
+        
+        if snapshot is not None and self.on_data_update:
+            self.on_data_update(snapshot)
     
     def get_current_data(self, channel_num=None):
         """Get current data for a specific channel or all channels"""
         with self.data_lock:
             if channel_num is not None:
                 return self.current_data.get(channel_num, {
-                    'value': -9999.98,
+                    'value': INVALID_VALUE,
                     'judge': 'IDLE',
-                    'timestamp': None
+                    't_ns': None
                 })
             else:
                 return self.current_data.copy()
@@ -203,62 +330,24 @@ class LiveDataManager:
         return self.device_available
     
     def start_live_reading(self):
-        """Start the live data reading thread"""
+        """Subscribe to the pipeline and make sure acquisition is running"""
         if self.running:
             return
             
         self.running = True
-        self.thread = threading.Thread(target=self._live_reading_loop, daemon=True)
-        self.thread.start()
-        print("LiveDataManager: Started live reading thread")
+        self.pipeline.subscribe(self._on_samples)
+        self.pipeline.subscribe_connection(self._on_connection)
+        self.pipeline.start()
+        print("LiveDataManager: Started live reading")
     
     def stop_live_reading(self):
-        """Stop the live data reading thread"""
+        """Unsubscribe from the pipeline; acquisition goes on for its other consumers (e.g. the logger)"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=2.0)
-            self.thread = None
-        print("LiveDataManager: Stopped live reading thread")
-    
-    def _live_reading_loop(self):
-        """Main loop for live data reading"""
-        consecutive_failures = 0
-        max_failures = 5
-        
-        while self.running:
-            try:
-                # Try to connect if not connected
-                if not self.connected:
-                    if self.connect():
-                        consecutive_failures = 0
-                    else:
-                        consecutive_failures += 1
-                        if consecutive_failures >= max_failures:
-                            print("LiveDataManager: Too many connection failures, stopping attempts")
-                            break
-                        time.sleep(2.0)  # Wait before retry
-                        continue
-                
-                # Read data
-                if self.read_current_data():
-                    consecutive_failures = 0
-                else:
-                    consecutive_failures += 1
-                    if consecutive_failures >= max_failures:
-                        print("LiveDataManager: Too many read failures, disconnecting")
-                        self.disconnect()
-                        consecutive_failures = 0
-                
-                time.sleep(self.update_interval)
-                
-            except Exception as e:
-                print(f"LiveDataManager: Error in live reading loop: {e}")
-                consecutive_failures += 1
-                time.sleep(1.0)
-        
-        # Cleanup
-        if self.connected:
-            self.disconnect()
+        self.pipeline.unsubscribe(self._on_samples)
+        self.pipeline.unsubscribe_connection(self._on_connection)
+        if self.owns_pipeline:
+            self.pipeline.stop()
+        print("LiveDataManager: Stopped live reading")
     
     def update_channel_count(self, new_count):
         """Update the number of channels to monitor"""
@@ -271,9 +360,9 @@ class LiveDataManager:
             # Add new channels
             for i in range(self.num_channels + 1, new_count + 1):
                 self.current_data[i] = {
-                    'value': -9999.98,
+                    'value': INVALID_VALUE,
                     'judge': 'IDLE',
-                    'timestamp': None
+                    't_ns': None
                 }
             
-            self.num_channels = new_count
\ No newline at end of file
+            self.num_channels = new_count
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+def m4_indices(x, y, x_min, x_max, width_px):
+    """Indexes of the points to draw for an M4-style decimation of (x, y)
+
+    For every pixel column between x_min and x_max keeps the first, last,
+    minimum and maximum point, which renders the same line as the full data at
+    that width. One point on each side of the view is kept so the line still
+    runs to the axes edge. `x` must be sorted. Returns None when the series is
+    already small enough to plot as is.
+    """
+    n = len(x)
+    width_px = max(1, int(width_px))
+    if n <= 4 * width_px or not x_max > x_min:
+        return None
+
+    lo = max(0, int(np.searchsorted(x, x_min, side='left')) - 1)
+    hi = min(n, int(np.searchsorted(x, x_max, side='right')) + 1)
+    if hi - lo <= 4 * width_px:
+        return np.arange(lo, hi)
+
+    xs = x[lo:hi]
+    ys = y[lo:hi]
+    # Pixel column per point; the two edge points fall into their own columns
+    bins = np.clip(((xs - x_min) * (width_px / (x_max - x_min))).astype(np.int64), -1, width_px)
+
+    # x is sorted, so each column is a contiguous block: first/last come from the block edges
+    first = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    last = np.r_[first[1:], len(bins)] - 1
+
+    # Sorting by (column, value) puts each column's min first and max last
+    order = np.lexsort((ys, bins))
+    sorted_bins = bins[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_bins[1:] != sorted_bins[:-1]])
+    group_end = np.r_[group_start[1:], len(order)] - 1
+
+    keep = np.concatenate((first, last, order[group_start], order[group_end]))
+    return np.unique(keep) + lo
+
+
+def m4_decimate(x, y, x_min, x_max, width_px):
+    """Return the (x, y) arrays to hand to Line2D.set_data for the current view"""
+    idx = m4_indices(x, y, x_min, x_max, width_px)
+    if idx is None:
+        return x, y
+    return x[idx], y[idx]
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import DEVICE_IO_WORKERS
+
+
+class PeriodicTask:
+    """A callback run every `interval` seconds on the device core
+
+    Runs stay on a fixed grid; after an overrun the schedule skips ahead
+    instead of bursting. With `blocking`, the callback runs in the core's
+    executor and a run taking longer than `deadline` is abandoned.
+    """
+
+    def __init__(self, core, name, interval, callback, blocking=False, deadline=None):
+        self.core = core
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.blocking = blocking
+        self.deadline = deadline
+        self.runs = 0
+        self.overruns = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.max_duration = 0.0
+        self._future = None
+
+    def start(self):
+        self._future = self.core.spawn(self._run())
+        return self
+
+    def cancel(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        if self in self.core.tasks:
+            self.core.tasks.remove(self)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + self.interval
+        while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            start = loop.time()
+            try:
+                if self.blocking:
+                    await self.core.run_blocking(self.callback, timeout=self.deadline)
+                else:
+                    self.callback()
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                print(f"DeviceCore: '{self.name}' missed its {self.deadline} s deadline")
+            except Exception as e:
+                self.errors += 1
+                print(f"DeviceCore: '{self.name}' failed: {e}")
+            self.runs += 1
+            self.max_duration = max(self.max_duration, loop.time() - start)
+            next_run += self.interval
+            if next_run < loop.time():
+                self.overruns += 1
+                next_run = loop.time()
+
+
+class DeviceCore:
+    """One asyncio loop, on its own thread, that schedules all device work
+
+    Acquisition polling, reconnects, zeroing jobs and log flushes run as
+    tasks on this loop instead of a thread each. Blocking CL3_IF calls go
+    through run_blocking(), which runs them in a bounded executor with an
+    optional deadline. A call that misses its deadline cannot be
+    interrupted: it keeps one executor thread busy until the driver
+    returns, and the bounded pool caps how many such threads can pile up.
+    """
+
+    def __init__(self, max_workers=DEVICE_IO_WORKERS):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='device-io')
+        self.loop = None
+        self.tasks = []  # PeriodicTasks, for stats and cancellation
+        self._thread = None
+        self._started = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name='device-core', daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        for task in list(self.tasks):
+            task.cancel()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self.executor.shutdown(wait=False)
+
+    @property
+    def in_loop_thread(self):
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def spawn(self, coro):
+        """Schedule a coroutine on the loop from any thread; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback, *args):
+        """Run a plain callback on the loop thread (thread-safe)"""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    async def run_blocking(self, func, *args, timeout=None):
+        """Await a blocking call run in the executor, raising asyncio.TimeoutError after `timeout` s"""
+        future = self.loop.run_in_executor(self.executor, func, *args)
+        if timeout is None:
+            return await future
+        return await asyncio.wait_for(future, timeout)
+
+    def submit_blocking(self, func, *args, timeout=None):
+        """run_blocking() for callers outside the loop (e.g. the Tk thread polling .done())"""
+        return self.spawn(self.run_blocking(func, *args, timeout=timeout))
+
+    def every(self, name, interval, callback, blocking=False, deadline=None):
+        task = PeriodicTask(self, name, interval, callback, blocking=blocking, deadline=deadline)
+        self.tasks.append(task)
+        return task.start()
+
+    def format_stats(self):
+        lines = [f"Device core: {len(self.tasks)} periodic tasks, "
+                 f"{self.max_workers} I/O workers"]
+        for task in self.tasks:
+            lines.append(f"  {task.name}: {task.runs} runs, max {task.max_duration * 1000:.1f} ms, "
+                         f"{task.overruns} overruns, {task.timeouts} timeouts, {task.errors} errors")
+        return "\n".join(lines)
+
+
+_core = None
+_core_lock = threading.Lock()
+
+
+def get_core():
+    """The process-wide DeviceCore, started on first use"""
+    global _core
+    with _core_lock:
+        if _core is None:
+            _core = DeviceCore()
+            _core.start()
+        return _core
+
+
+def running_core():
+    """The DeviceCore if one was started, else None (never starts one)"""
+    return _core
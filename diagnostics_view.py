@@ -0,0 +1,116 @@
+import os
+import customtkinter as ctk
+from config import COLORS
+
+
+class DiagnosticsView(ctk.CTkFrame):
+    """Event-loop latency, per-callback timings and the slowest recorded UI events"""
+
+    def __init__(self, parent, watchdog, governor=None, go_back_callback=None):
+        super().__init__(parent, corner_radius=15, fg_color=COLORS['card'])
+        self.watchdog = watchdog
+        self.governor = governor
+        self.go_back_callback = go_back_callback
+        self._after_id = None
+        self._shown_version = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(15, 10))
+
+        self.back_button = ctk.CTkButton(header_frame, text="← Back to Grid",
+                                         command=self.go_back,
+                                         height=35, width=120,
+                                         font=ctk.CTkFont(size=13, weight="bold"),
+                                         fg_color=COLORS['secondary'],
+                                         hover_color=COLORS['primary'])
+        self.back_button.pack(side="left")
+
+        title_label = ctk.CTkLabel(header_frame, text="UI Diagnostics",
+                                   font=ctk.CTkFont(size=18, weight="bold"),
+                                   text_color=COLORS['primary'])
+        title_label.pack(side="left", padx=(20, 0))
+
+        self.dump_button = ctk.CTkButton(header_frame, text="💾 Dump to File",
+                                         command=self.dump,
+                                         height=35, width=130,
+                                         font=ctk.CTkFont(size=13, weight="bold"),
+                                         fg_color=COLORS['primary'],
+                                         hover_color=COLORS['success'])
+        self.dump_button.pack(side="right")
+
+        self.clear_button = ctk.CTkButton(header_frame, text="Clear",
+                                          command=self.clear,
+                                          height=35, width=80,
+                                          font=ctk.CTkFont(size=13, weight="bold"),
+                                          fg_color=COLORS['danger'],
+                                          hover_color="#D32F2F")
+        self.clear_button.pack(side="right", padx=(0, 10))
+
+        self.summary_label = ctk.CTkLabel(self, text="", justify="left", anchor="w",
+                                          font=ctk.CTkFont(family="Consolas", size=12),
+                                          text_color=COLORS['text'])
+        self.summary_label.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.records_box = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Consolas", size=11),
+                                          wrap="none")
+        self.records_box.pack(fill="both", expand=True, padx=20, pady=(0, 15))
+        self.records_box.configure(state="disabled")
+
+    def go_back(self):
+        if self.go_back_callback:
+            self.go_back_callback()
+
+    def pause(self):
+        if self._after_id:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+
+    def resume(self):
+        self.refresh()
+
+    def destroy(self):
+        self.pause()
+        super().destroy()
+
+    def _extra_stats(self):
+        from device_core import running_core
+        parts = [self.governor.format_stats() if self.governor else None]
+        core = running_core()
+        if core is not None:
+            parts.append(core.format_stats())
+        return "\n".join(part for part in parts if part) or None
+
+    def refresh(self):
+        """Update the summary every second; the record list only when new records arrived"""
+        self._after_id = None
+        summary = self.watchdog.format_summary()
+        extra = self._extra_stats()
+        if extra:
+            summary += "\n" + extra
+        self.summary_label.configure(text=summary)
+
+        if self.watchdog.version != self._shown_version:
+            self._shown_version = self.watchdog.version
+            text = self.watchdog.format_records() or "No slow callbacks or stalls recorded."
+            self.records_box.configure(state="normal")
+            self.records_box.delete("1.0", "end")
+            self.records_box.insert("1.0", text)
+            self.records_box.configure(state="disabled")
+        self._after_id = self.after(1000, self.refresh)
+
+    def clear(self):
+        self.watchdog.clear()
+        self.pause()
+        self.refresh()
+
+    def dump(self):
+        try:
+            path = self.watchdog.dump(os.path.join(os.getcwd(), "output_files"), extra=self._extra_stats())
+            print(f"UI diagnostics written to {path}")
+            self.dump_button.configure(text="✓ Saved")
+        except OSError as e:
+            print(f"Error writing UI diagnostics: {e}")
+            self.dump_button.configure(text="❌ Failed")
+        self.after(3000, lambda: self.dump_button.configure(text="💾 Dump to File"))
@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import deque
+
+
+class _View:
+    """Refresh bookkeeping for one registered view"""
+
+    def __init__(self, name, render):
+        self.name = name
+        self.render = render
+        self.dirty = False
+        self.paused = False
+        self.interval = 0.0
+        self.last_render = 0.0
+        self.cost = 0.0  # EMA of render time, seconds
+        self.data_interval = None  # EMA of time between data notifications, seconds
+        self.last_data = None
+        self.frame_times = deque(maxlen=120)
+        self.frame_stamps = deque(maxlen=120)
+
+
+class FrameGovernor:
+    """Single Tk-thread scheduler for every GUI refresh path
+
+    Producers (acquisition callbacks, any thread) only call mark_dirty(); the
+    governor runs the registered render callbacks on the Tk thread. Each view's
+    refresh interval adapts to its measured render cost, so the views together
+    stay within `cpu_budget` of main-thread time, and to the incoming data
+    rate, so nothing is redrawn faster than new data arrives.
+    """
+
+    def __init__(self, root, cpu_budget=0.5, min_interval=1 / 30, max_interval=1.0,
+                 idle_interval=0.05, stats_log_interval=None, profiler=None):
+        self.root = root
+        self.profiler = profiler  # Optional UIWatchdog; renders then run through profiler.call()
+        self.cpu_budget = cpu_budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.stats_log_interval = stats_log_interval
+        self.views = {}
+        self._lock = threading.Lock()
+        self._after_id = None
+        self._last_stats_log = time.perf_counter()
+
+    def register(self, name, render):
+        """Add a view refreshed by `render()`; re-registering replaces the callback"""
+        view = self.views.get(name)
+        if view is None:
+            self.views[name] = _View(name, render)
+        else:
+            view.render = render
+
+    def unregister(self, name, render=None):
+        """Remove a view; with `render` given, only if it is still the registered callback"""
+        view = self.views.get(name)
+        if view is not None and (render is None or view.render == render):
+            del self.views[name]
+
+    def pause(self, name):
+        """Stop refreshing a view (e.g. while hidden); data notifications are still counted"""
+        if name in self.views:
+            self.views[name].paused = True
+
+    def resume(self, name):
+        if name in self.views:
+            view = self.views[name]
+            view.paused = False
+            view.dirty = True
+
+    def mark_dirty(self, name):
+        """Note that new data for a view arrived; safe to call from any thread"""
+        view = self.views.get(name)
+        if view is None:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if view.last_data is not None:
+                gap = now - view.last_data
+                view.data_interval = gap if view.data_interval is None else 0.8 * view.data_interval + 0.2 * gap
+            view.last_data = now
+            view.dirty = True
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(int(self.idle_interval * 1000), self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _active_views(self):
+        return [view for view in self.views.values() if not view.paused]
+
+    def _update_interval(self, view, active_count):
+        # Share the CPU budget between the views that are being refreshed
+        budget = self.cpu_budget / max(1, active_count)
+        interval = view.cost / budget
+        if view.data_interval is not None:
+            interval = max(interval, view.data_interval)
+        view.interval = min(self.max_interval, max(self.min_interval, interval))
+
+    def _tick(self):
+        self._after_id = None
+        now = time.perf_counter()
+        active = self._active_views()
+        for view in active:
+            if not view.dirty or now - view.last_render < view.interval:
+                continue
+            with self._lock:
+                view.dirty = False
+            start = time.perf_counter()
+            try:
+                if self.profiler:
+                    self.profiler.call(view.name, view.render)
+                else:
+                    view.render()
+            except Exception as e:
+                print(f"FrameGovernor: Error refreshing {view.name}: {e}")
+            end = time.perf_counter()
+            cost = end - start
+            view.cost = cost if not view.frame_times else 0.8 * view.cost + 0.2 * cost
+            view.frame_times.append(cost)
+            view.frame_stamps.append(end)
+            view.last_render = start  # Interval is start-to-start, so cost / interval is the CPU share
+            self._update_interval(view, len(active))
+
+        if self.stats_log_interval and now - self._last_stats_log >= self.stats_log_interval:
+            self._last_stats_log = now
+            print(self.format_stats())
+
+        # Sleep until the earliest dirty view is due, polling at idle_interval otherwise
+        now = time.perf_counter()
+        delay = self.idle_interval
+        for view in active:
+            if view.dirty:
+                delay = min(delay, max(0.0, view.last_render + view.interval - now))
+        self._after_id = self.root.after(max(1, int(delay * 1000)), self._tick)
+
+    def stats(self):
+        """Per-view fps, frame time (mean/max ms), current interval and data rate"""
+        now = time.perf_counter()
+        result = {}
+        for name, view in self.views.items():
+            recent = [t for t in view.frame_stamps if now - t <= 1.0]
+            times = list(view.frame_times)
+            result[name] = {
+                'fps': len(recent),
+                'frame_ms': 1000 * sum(times) / len(times) if times else 0.0,
+                'frame_ms_max': 1000 * max(times) if times else 0.0,
+                'interval_ms': 1000 * view.interval,
+                'data_hz': 1 / view.data_interval if view.data_interval else 0.0,
+                'paused': view.paused
+            }
+        return result
+
+    def format_stats(self):
+        parts = []
+        for name, s in self.stats().items():
+            state = " paused" if s['paused'] else ""
+            parts.append(f"{name}: {s['fps']} fps, {s['frame_ms']:.1f}/{s['frame_ms_max']:.1f} ms, "
+                         f"every {s['interval_ms']:.0f} ms, data {s['data_hz']:.1f} Hz{state}")
+        return "FrameGovernor: " + ("; ".join(parts) if parts else "no views")
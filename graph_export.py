@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+import queue
+import numpy as np
+from config import COLORS, CHANNEL_COLORS, EXPORT_DPI, EXPORT_VIDEO_FPS, EXPORT_VIDEO_SECONDS
+from decimation import m4_decimate
+
+# Export menu entries: (output format, time range)
+EXPORT_KINDS = {
+    'PNG – Current View': ('png', 'view'),
+    'SVG – Current View': ('svg', 'view'),
+    'PNG – Whole Session': ('png', 'session'),
+    'SVG – Whole Session': ('svg', 'session'),
+    'Video – Whole Session': ('video', 'session')
+}
+
+EXPORT_RESOLUTIONS = {
+    '1280×720': (1280, 720),
+    '1920×1080': (1920, 1080),
+    '3840×2160': (3840, 2160)
+}
+
+
+class _ExportSource:
+    """Plot data for a time range, from a log file (via its LOD index) or from in-memory series"""
+
+    def __init__(self, job):
+        self.index = None
+        self.series = job.get('series') or {}
+        self.channels = job['channels']
+        if job.get('log_path'):
+            from log_browser import LogIndex
+            self.index = LogIndex(job['log_path']).open()
+
+    @property
+    def duration(self):
+        if self.index:
+            return self.index.duration
+        ends = [x[-1] for x, y in self.series.values() if len(x)]
+        return max(ends) if ends else 0.0
+
+    def query(self, t0, t1, width_px):
+        """{channel_num: (x, y)} reduced to about `width_px` columns"""
+        width_px = max(1, int(width_px))
+        if self.index:
+            data, level = self.index.query(t0, t1, width_px)
+            return {ch: data.get(ch, (np.empty(0), np.empty(0))) for ch in self.channels}
+        result = {}
+        for ch in self.channels:
+            x, y = self.series.get(ch, (np.empty(0), np.empty(0)))
+            i1 = np.searchsorted(x, t1, side='right')
+            result[ch] = m4_decimate(x[:i1], y[:i1], t0, t1, width_px)
+        return result
+
+    def close(self):
+        if self.index:
+            self.index.close()
+
+
+def _y_limits(data):
+    values = [y for x, y in data.values() if len(y)]
+    if not values:
+        return 0.0, 100.0
+    y_min = min(float(np.nanmin(y)) for y in values)
+    y_max = max(float(np.nanmax(y)) for y in values)
+    padding = max((y_max - y_min) * 0.05, 0.5)
+    return y_min - padding, y_max + padding
+
+
+def _build_figure(job):
+    from matplotlib import style
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    w, h = job['size']
+    with style.context('dark_background'):
+        figure = Figure(figsize=(w / EXPORT_DPI, h / EXPORT_DPI), dpi=EXPORT_DPI, facecolor='#2D2D2D')
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111, facecolor='#1A1A1A')
+        ax.set_xlabel('Time (s)', color=COLORS['text'], fontsize=12)
+        ax.set_ylabel('Thickness (μm)', color=COLORS['text'], fontsize=12)
+        ax.tick_params(colors=COLORS['text'])
+        ax.grid(True, alpha=0.3, color='gray')
+        for spine in ax.spines.values():
+            spine.set_color(COLORS['text'])
+        if job.get('title'):
+            ax.set_title(job['title'], color=COLORS['text'], fontsize=12)
+        lines = {}
+        for ch in job['channels']:
+            color = CHANNEL_COLORS[(ch - 1) % len(CHANNEL_COLORS)]
+            lines[ch], = ax.plot([], [], color=color, linewidth=1.5, label=f'OUT{ch:02d}', alpha=0.8)
+        if lines:
+            ax.legend(loc='upper right', facecolor='#2D2D2D', edgecolor=COLORS['text'], framealpha=0.9)
+        figure.tight_layout()
+    return figure, ax, lines
+
+
+def _set_data(lines, data):
+    for ch, line in lines.items():
+        line.set_data(*data[ch])
+
+
+def run_export(job, progress=None):
+    """Render an export job synchronously; returns the path written
+
+    job = {'kind': 'png' | 'svg' | 'video', 'range': 'view' | 'session',
+           'path': str, 'size': (w_px, h_px), 'channels': [channel_num],
+           'log_path': str or None, 'series': {channel_num: (x_seconds, y)},
+           'xlim': (lo, hi) for 'view', 'ylim': (lo, hi) or None, 'title': str}
+    Data comes from the log's LOD index when 'log_path' is set, so even very
+    long sessions only load about one value pair per output pixel.
+    """
+    source = _ExportSource(job)
+    try:
+        figure, ax, lines = _build_figure(job)
+        plot_width = ax.get_window_extent().width
+        if job['range'] == 'view':
+            t0, t1 = job['xlim']
+        else:
+            t0, t1 = 0.0, max(source.duration, 1.0)
+        full = source.query(t0, t1, plot_width)
+        ax.set_xlim(t0, t1)
+        ax.set_ylim(job.get('ylim') or _y_limits(full))
+
+        if job['kind'] in ('png', 'svg'):
+            _set_data(lines, full)
+            figure.savefig(job['path'], format=job['kind'], facecolor=figure.get_facecolor())
+            if progress:
+                progress(1.0)
+            return job['path']
+        return _export_video(job, source, figure, lines, t0, t1, plot_width, progress)
+    finally:
+        source.close()
+
+
+def _export_video(job, source, figure, lines, t0, t1, plot_width, progress):
+    """Time-lapse of the session: fixed axes, the traces revealed frame by frame
+
+    Written as MP4 when ffmpeg is available, else as a numbered PNG sequence
+    in a '<name>_frames' directory next to the requested path.
+    """
+    from matplotlib import animation
+
+    frames = max(2, int(EXPORT_VIDEO_FPS * EXPORT_VIDEO_SECONDS))
+    if animation.writers.is_available('ffmpeg'):
+        path = job['path']
+        writer = animation.FFMpegWriter(fps=EXPORT_VIDEO_FPS)
+        frame_dir = None
+    else:
+        path = os.path.splitext(job['path'])[0] + '_frames'
+        os.makedirs(path, exist_ok=True)
+        writer = None
+        frame_dir = path
+        print(f"Export: ffmpeg not found, writing a PNG frame sequence to {path}")
+
+    def render_frames(save):
+        for k in range(1, frames + 1):
+            t_end = t0 + (t1 - t0) * k / frames
+            # Only the revealed part of the axes needs its share of the pixel columns
+            _set_data(lines, source.query(t0, t_end, plot_width * k / frames))
+            save(k)
+            if progress:
+                progress(k / frames)
+
+    if writer is not None:
+        with writer.saving(figure, path, EXPORT_DPI):
+            render_frames(lambda k: writer.grab_frame(facecolor=figure.get_facecolor()))
+    else:
+        render_frames(lambda k: figure.savefig(os.path.join(frame_dir, f'frame_{k:05d}.png'),
+                                               facecolor=figure.get_facecolor()))
+    return path
+
+
+def _export_main(job, messages):
+    """Export process body: run the job, reporting ('progress', f), ('done', path) or ('error', msg)"""
+    if hasattr(os, 'nice'):
+        os.nice(10)  # Leave the CPU to the GUI and acquisition
+    try:
+        path = run_export(job, progress=lambda fraction: messages.put(('progress', fraction)))
+        messages.put(('done', path))
+    except Exception as e:
+        messages.put(('error', str(e)))
+
+
+class ExportWorker:
+    """Runs one export job at a time in a separate process
+
+    The GUI polls for progress from the Tk thread; rendering never touches
+    the live figure, so exports do not block or slow the live view.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._messages = None
+        self.progress = 0.0
+
+    @property
+    def busy(self):
+        return self._process is not None
+
+    def start(self, job):
+        if self._process is not None:
+            return False
+        self.progress = 0.0
+        self._messages = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_export_main, args=(job, self._messages), daemon=True)
+        self._process.start()
+        print(f"ExportWorker: Exporting {job['kind']} to {job['path']}")
+        return True
+
+    def poll(self):
+        """Return ('done', path), ('error', msg) or None while the export is still running"""
+        if self._process is None:
+            return None
+        while True:
+            try:
+                kind, value = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.progress = value
+            else:
+                self._finish()
+                return kind, value
+        if not self._process.is_alive():
+            # The final message may still be on its way through the queue's pipe
+            try:
+                while True:
+                    kind, value = self._messages.get(timeout=0.5)
+                    if kind != 'progress':
+                        self._finish()
+                        return kind, value
+            except queue.Empty:
+                pass
+            self._finish()
+            return 'error', "Export process exited unexpectedly"
+        return None
+
+    def _finish(self):
+        self._process.join(timeout=1.0)
+        self._process = None
+        self._messages = None
+
+    def cancel(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._finish()
@@ -1,15 +1,32 @@
+import os
+from tkinter import filedialog
 import customtkinter as ctk
-from config import COLORS
+from config import COLORS, CHANNEL_COLORS, GRAPH_RENDER_WORKER
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import numpy as np
-from datetime import datetime
+import time
+from acquisition import JUDGE_CODES
+from data_manager import valid_mask
+from smoothing import SmoothingEngine, SMOOTHING_METHODS
+from decimation import m4_decimate, m4_indices
+from offscreen_render import make_render_worker, axes_snapshot, line_spec, scatter_spec
+from blit_render import BlitRenderer
+from graph_export import ExportWorker, EXPORT_KINDS, EXPORT_RESOLUTIONS
+
+# Display name -> layout key, in the order shown in the graph controls
+GRAPH_LAYOUTS = {
+    'Overlay': 'overlay',
+    'Small Multiples': 'multiples'
+}
 
 class MultiChannelGraphWidget(ctk.CTkFrame):
-    def __init__(self, parent, max_channels, graph_data_manager, app_ref=None, live_data_manager=None):
+    def __init__(self, parent, max_channels, graph_data_manager, app_ref=None, live_data_manager=None,
+                 governor=None):
         super().__init__(parent, corner_radius=15, fg_color=COLORS['card'])
         self.max_channels = max_channels
+        self.governor = governor  # FrameGovernor driving auto-update; None = own fixed timer
         self.graph_data_manager = graph_data_manager
         self.live_data_manager = live_data_manager
         self.start_time = None
@@ -18,20 +35,35 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         self.auto_update_enabled = True
         self.after_id = None
         self._update_in_progress = False  # Prevent concurrent updates
-        self._last_update_time = 0  # Track last update time for throttling
-        self._min_update_interval = 0.1  # Minimum time between updates (100ms)
+        
+        # Blitting: cached static background, redrawn only when limits/layout change
+        self.use_blit = True
+        self.renderer = None
+        self._last_limit_change = 0.0
+        self._limit_update_interval = 1.0  # Auto-fit may move the axes at most once per second
         
         # Channel colors (8 distinct colors)
-        self.channel_colors = [
-            '#00FF7F',  # Spring Green
-            '#FF6B6B',  # Light Red
-            '#4ECDC4',  # Teal
-            '#FFE66D',  # Yellow
-            '#A8E6CF',  # Light Green
-            '#FF8B94',  # Pink
-            '#B4A7D6',  # Light Purple
-            '#FFD3A5'   # Light Orange
-        ]
+        self.channel_colors = list(CHANNEL_COLORS)
+        
+        # Line smoothing (spline by default, raw line for very large buffers)
+        self.smoothing = SmoothingEngine(method='spline')
+        
+        # Full-resolution plot data per channel; artists get an M4-decimated view of it
+        self._full_data = {}  # {channel_num: (line_x, line_y, points, codes)}
+        
+        # Judge codes drawn as GO / HI / LO markers
+        self._marker_codes = (JUDGE_CODES['GO'], JUDGE_CODES['HI'], JUDGE_CODES['LO'])
+        
+        # 'overlay': all channels on one axes; 'multiples': one strip per channel, shared time axis
+        self.layout = 'overlay'
+        self.channel_axes = {}  # {channel_num: axes holding its artists}
+        self._drawn_last = {}  # {channel_num: (count, last t_ns)} of the data last handed to the artists
+        
+        # Snapshot / time-lapse export, rendered in a background process
+        self.exporter = ExportWorker()
+        self.export_kind = next(iter(EXPORT_KINDS))
+        self.export_size = '1920×1080'
+        self._export_poll_id = None
         
         # Track which channels are selected for display
         self.selected_channels = {i: True for i in range(1, max_channels + 1)}
@@ -65,6 +97,34 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
                                                hover_color=COLORS['primary'])
         self.auto_update_button.pack(side="right", padx=(0, 10))
         
+        # Export: what to export, at which resolution
+        self.export_button = ctk.CTkButton(header_frame, text="💾 Export", width=110, height=35,
+                                          command=self.export_graph,
+                                          font=ctk.CTkFont(size=12, weight="bold"),
+                                          fg_color=COLORS['info'],
+                                          hover_color=COLORS['primary'])
+        self.export_button.pack(side="right", padx=(0, 10))
+        
+        self.export_size_menu = ctk.CTkOptionMenu(header_frame, values=list(EXPORT_RESOLUTIONS),
+                                                 command=self.set_export_size,
+                                                 width=110, height=35,
+                                                 font=ctk.CTkFont(size=12),
+                                                 fg_color=COLORS['accent'],
+                                                 button_color=COLORS['primary'],
+                                                 button_hover_color=COLORS['success'])
+        self.export_size_menu.set(self.export_size)
+        self.export_size_menu.pack(side="right", padx=(0, 5))
+        
+        self.export_kind_menu = ctk.CTkOptionMenu(header_frame, values=list(EXPORT_KINDS),
+                                                 command=self.set_export_kind,
+                                                 width=180, height=35,
+                                                 font=ctk.CTkFont(size=12),
+                                                 fg_color=COLORS['accent'],
+                                                 button_color=COLORS['primary'],
+                                                 button_hover_color=COLORS['success'])
+        self.export_kind_menu.set(self.export_kind)
+        self.export_kind_menu.pack(side="right", padx=(0, 5))
+        
         # Channel selection frame
         selection_frame = ctk.CTkFrame(self, fg_color="transparent")
         selection_frame.pack(fill="x", padx=20, pady=(0, 10))
@@ -153,6 +213,33 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
                                          hover_color="#D32F2F")
         self.clear_button.pack(side="left", padx=5)
         
+        # Smoothing filter selection
+        smoothing_label = ctk.CTkLabel(controls_frame, text="Smoothing:", 
+                                      font=ctk.CTkFont(size=12, weight="bold"),
+                                      text_color=COLORS['text'])
+        smoothing_label.pack(side="left", padx=(10, 5))
+        
+        self.smoothing_menu = ctk.CTkOptionMenu(controls_frame, values=list(SMOOTHING_METHODS),
+                                               command=self.set_smoothing,
+                                               width=130, height=30,
+                                               font=ctk.CTkFont(size=12),
+                                               fg_color=COLORS['accent'],
+                                               button_color=COLORS['primary'],
+                                               button_hover_color=COLORS['success'])
+        self.smoothing_menu.set('Spline')
+        self.smoothing_menu.pack(side="left", padx=5)
+        
+        # Overlay vs. small multiples (one strip per channel)
+        self.layout_menu = ctk.CTkOptionMenu(controls_frame, values=list(GRAPH_LAYOUTS),
+                                            command=self.set_layout,
+                                            width=140, height=30,
+                                            font=ctk.CTkFont(size=12),
+                                            fg_color=COLORS['accent'],
+                                            button_color=COLORS['primary'],
+                                            button_hover_color=COLORS['success'])
+        self.layout_menu.set('Overlay')
+        self.layout_menu.pack(side="left", padx=5)
+        
         # Instructions
         instructions = ctk.CTkLabel(controls_frame, text="💡 Drag=Pan | Wheel=Zoom | Select channels above", 
                                    font=ctk.CTkFont(size=10),
@@ -162,44 +249,15 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         # Create matplotlib figure with dark theme
         plt.style.use('dark_background')
         self.figure = Figure(figsize=(12, 6), dpi=100, facecolor='#2D2D2D')
-        self.ax = self.figure.add_subplot(111, facecolor='#1A1A1A')
-        
-        # Configure plot appearance
-        self.ax.set_xlabel('Time (s)', color=COLORS['text'], fontsize=12)
-        self.ax.set_ylabel('Thickness (μm)', color=COLORS['text'], fontsize=12)
-        self.ax.tick_params(colors=COLORS['text'])
-        self.ax.grid(True, alpha=0.3, color='gray')
-        self.ax.spines['bottom'].set_color(COLORS['text'])
-        self.ax.spines['top'].set_color(COLORS['text'])
-        self.ax.spines['right'].set_color(COLORS['text'])
-        self.ax.spines['left'].set_color(COLORS['text'])
-        
-        # Initialize lines and scatter plots for each channel
-        self.lines = {}
-        self.go_points = {}
-        self.hi_points = {}
-        self.lo_points = {}
-        
-        for i in range(1, self.max_channels + 1):
-            color = self.channel_colors[(i-1) % len(self.channel_colors)]
-            line, = self.ax.plot([], [], color=color, linewidth=2, 
-                               label=f'OUT{i:02d}', alpha=0.8)
-            self.lines[i] = line
-            
-            # Create scatter plots for judge points (smaller and more transparent)
-            self.go_points[i] = self.ax.scatter([], [], c=color, s=20, alpha=0.6, 
-                                              marker='o', edgecolors='white', linewidth=0.5)
-            self.hi_points[i] = self.ax.scatter([], [], c=color, s=25, alpha=0.8, 
-                                              marker='^', edgecolors='red', linewidth=1)
-            self.lo_points[i] = self.ax.scatter([], [], c=color, s=25, alpha=0.8, 
-                                              marker='v', edgecolors='orange', linewidth=1)
-        
-        # Create legend
-        self.update_legend()
         
         # Embed plot in tkinter
         self.canvas = FigureCanvasTkAgg(self.figure, self)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        # Optional off-main-thread rasterization; the Tk thread then only blits finished frames
+        self.renderer = BlitRenderer(self, self.canvas, use_blit=self.use_blit,
+                                     render_worker=make_render_worker(GRAPH_RENDER_WORKER),
+                                     snapshot=self._snapshot)
+        self._build_plot()
         
         # Connect mouse events for zooming and panning
         self.canvas.mpl_connect('scroll_event', self.on_scroll)
@@ -209,18 +267,187 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         
         # Pan state
         self.is_panning = False
+        self.pan_ax = None
         self.pan_start = None
         self.pan_start_xlim = None
         self.pan_start_ylim = None
         
         # Initial setup
-        self.ax.set_xlim(0, 10)
-        self.ax.set_ylim(0, 100)
         self.canvas.draw()
+        if self.renderer.render_worker:
+            self.render()
         
         # Start auto-update timer immediately
         self.start_auto_update()
     
+    def _style_axes(self, ax):
+        ax.set_facecolor('#1A1A1A')
+        ax.tick_params(colors=COLORS['text'])
+        ax.grid(True, alpha=0.3, color='gray')
+        for spine in ax.spines.values():
+            spine.set_color(COLORS['text'])
+    
+    def _build_plot(self):
+        """(Re)create the axes and the per-channel artists for the current layout"""
+        if self.layout == 'multiples':
+            shown = [i for i in range(1, self.max_channels + 1) if self.selected_channels.get(i, False)]
+        else:
+            shown = []
+        old_xlim = self.ax.get_xlim() if getattr(self, 'ax', None) else (0, 10)
+        old_ylim = self.ax.get_ylim() if getattr(self, 'ax', None) else (0, 100)
+        self.figure.clear()
+        
+        if shown:
+            axes = list(self.figure.subplots(len(shown), 1, sharex=True, squeeze=False)[:, 0])
+            self.figure.subplots_adjust(left=0.07, right=0.98, top=0.97, bottom=0.08, hspace=0.08)
+            self.channel_axes = {i: ax for i, ax in zip(shown, axes)}
+            for i, ax in self.channel_axes.items():
+                self._style_axes(ax)
+                color = self.channel_colors[(i-1) % len(self.channel_colors)]
+                ax.set_ylabel('μm', color=COLORS['text'], fontsize=9)
+                ax.text(0.01, 0.85, f'OUT{i:02d}', transform=ax.transAxes, color=color,
+                        fontsize=10, fontweight='bold')
+                ax.set_ylim(*old_ylim)
+            axes[-1].set_xlabel('Time (s)', color=COLORS['text'], fontsize=12)
+            self.ax = axes[0]
+        else:
+            self.ax = self.figure.add_subplot(111)
+            self._style_axes(self.ax)
+            self.ax.set_xlabel('Time (s)', color=COLORS['text'], fontsize=12)
+            self.ax.set_ylabel('Thickness (μm)', color=COLORS['text'], fontsize=12)
+            self.ax.set_ylim(*old_ylim)
+            self.channel_axes = {}
+        self.ax.set_xlim(*old_xlim)
+        
+        # Initialize lines and scatter plots for each channel; hidden channels park on the first axes
+        self.lines = {}
+        self.go_points = {}
+        self.hi_points = {}
+        self.lo_points = {}
+        
+        for i in range(1, self.max_channels + 1):
+            ax = self.channel_axes.setdefault(i, self.ax)
+            color = self.channel_colors[(i-1) % len(self.channel_colors)]
+            line, = ax.plot([], [], color=color, linewidth=2, 
+                               label=f'OUT{i:02d}', alpha=0.8)
+            self.lines[i] = line
+            
+            # Create scatter plots for judge points (smaller and more transparent)
+            self.go_points[i] = ax.scatter([], [], c=color, s=20, alpha=0.6, 
+                                              marker='o', edgecolors='white', linewidth=0.5)
+            self.hi_points[i] = ax.scatter([], [], c=color, s=25, alpha=0.8, 
+                                              marker='^', edgecolors='red', linewidth=1)
+            self.lo_points[i] = ax.scatter([], [], c=color, s=25, alpha=0.8, 
+                                              marker='v', edgecolors='orange', linewidth=1)
+        
+        # Data artists are drawn on top of the cached background when blitting
+        for artist in self._data_artists():
+            artist.set_animated(self.use_blit)
+        
+        # Each axes gets its own blit background and dirty flag
+        self.renderer.clear_regions()
+        for ax in self._plot_axes():
+            self.renderer.add_region(ax, lambda ax=ax: self._visible_data_artists(ax))
+        # The render worker rasterizes single-axes snapshots only
+        self.renderer.snapshot = self._snapshot if self.layout == 'overlay' else None
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        
+        self._drawn_last.clear()
+        for channel_num in list(self._full_data):
+            self._apply_channel_data(channel_num)
+        
+        # Create legend (overlay only; each strip is labelled in small multiples)
+        if self.layout == 'overlay':
+            self.update_legend()
+        self.invalidate_background()
+    
+    def _plot_axes(self):
+        """Distinct axes currently shown, top to bottom"""
+        axes = []
+        for ax in self.channel_axes.values():
+            if ax not in axes:
+                axes.append(ax)
+        return axes or [self.ax]
+    
+    def set_layout(self, choice):
+        """Switch between one shared axes and per-channel strips"""
+        layout = GRAPH_LAYOUTS.get(choice, 'overlay')
+        if layout == self.layout:
+            return
+        self.layout = layout
+        print(f"Graph layout set to {choice}")
+        self._build_plot()
+        self.update_graph()
+        self.auto_fit()
+    
+    def _data_artists(self, channel_num=None):
+        """Line and judge scatter artists of one channel (or of all channels)"""
+        channels = [channel_num] if channel_num is not None else list(self.lines)
+        artists = []
+        for i in channels:
+            artists.extend((self.lines[i], self.go_points[i], self.hi_points[i], self.lo_points[i]))
+        return artists
+    
+    def _current_limits(self, ax=None):
+        ax = ax or self.ax
+        return (tuple(ax.get_xlim()), tuple(ax.get_ylim()))
+    
+    def _visible_data_artists(self, ax=None):
+        artists = []
+        for i in range(1, self.max_channels + 1):
+            if i in self.lines and self.selected_channels.get(i, False):
+                if ax is None or self.channel_axes.get(i) is ax:
+                    artists.extend(self._data_artists(i))
+        return artists
+    
+    def render(self, dirty_only=False):
+        """Show the current artists: blit over the cached background, full draw only if needed
+
+        With `dirty_only`, only strips whose channel got new data are re-blitted.
+        """
+        self.renderer.render(dirty_only=dirty_only)
+    
+    def _snapshot(self):
+        """Plain-data copy of what the canvas should show, for the render worker"""
+        lines, scatters, legend = [], [], []
+        for i in range(1, self.max_channels + 1):
+            visible = self.selected_channels.get(i, False)
+            lines.append(line_spec(self.lines[i], visible))
+            scatters.append(scatter_spec(self.go_points[i], 'o', visible))
+            scatters.append(scatter_spec(self.hi_points[i], '^', visible))
+            scatters.append(scatter_spec(self.lo_points[i], 'v', visible))
+            if visible:
+                legend.append((f'OUT{i:02d}', i - 1))
+        return axes_snapshot(self.canvas, self.ax, lines, scatters, legend)
+    
+    def invalidate_background(self):
+        """Force the next render to be a full redraw (legend/layout changes)"""
+        if self.renderer:
+            self.renderer.invalidate()
+    
+    def _apply_channel_data(self, channel_num):
+        """Hand the artists of one channel a pixel-aware (M4) decimation of its full data"""
+        line_x, line_y, points, codes = self._full_data[channel_num]
+        x_min, x_max = self.ax.get_xlim()
+        width = self.ax.bbox.width
+        
+        self.lines[channel_num].set_data(*m4_decimate(line_x, line_y, x_min, x_max, width))
+        
+        idx = m4_indices(points[:, 0], points[:, 1], x_min, x_max, width)
+        if idx is not None:
+            points, codes = points[idx], codes[idx]
+        self.go_points[channel_num].set_offsets(points[codes == self._marker_codes[0]])
+        self.hi_points[channel_num].set_offsets(points[codes == self._marker_codes[1]])
+        self.lo_points[channel_num].set_offsets(points[codes == self._marker_codes[2]])
+    
+    def _on_xlim_changed(self, ax):
+        """Re-decimate for the new x-range (zoom, pan, auto-fit)"""
+        for channel_num in list(self._full_data):
+            try:
+                self._apply_channel_data(channel_num)
+            except Exception as e:
+                print(f"Error decimating channel {channel_num}: {e}")
+    
     def select_all_channels(self):
         """Select all channel checkboxes"""
         print("Selecting all channels")
@@ -265,13 +492,11 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             if i not in self.selected_channels:
                 self.selected_channels[i] = True
         
-        self.update_legend()
+        self._build_plot()
         print(f"Channel count updated to {new_count}")
         
     def toggle_channel(self, channel_num):
         """Toggle visibility of a specific channel"""
-        print(f"DEBUG: toggle_channel called for channel {channel_num}")
-        
         # Get the actual checkbox state and ensure it's properly synchronized
         if channel_num in self.channel_checkboxes:
             checkbox_state = self.channel_checkboxes[channel_num].get()
@@ -282,51 +507,57 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             self.selected_channels[channel_num] = not self.selected_channels[channel_num]
             print(f"Channel {channel_num} {'enabled' if self.selected_channels[channel_num] else 'disabled'} (fallback)")
         
-        # Debug: Print current state of all channels
-        print(f"Current selected channels: {[i for i in range(1, self.max_channels + 1) if self.selected_channels.get(i, False)]}")
-        print(f"Current first_data_time: {self.first_data_time}")
-        
         # Force recalculation of first_data_time when any channel is toggled
         # This ensures we don't depend on any specific channel
-        self._recalculate_first_data_time()
-        
-        # Additional debugging for OUT1 specifically
-        if channel_num == 1:
-            print(f"OUT1 DEBUG: selected_channels[1] = {self.selected_channels.get(1, False)}")
-            print(f"OUT1 DEBUG: checkbox state = {self.channel_checkboxes[1].get() if 1 in self.channel_checkboxes else 'N/A'}")
-            print(f"OUT1 DEBUG: first_data_time after recalculation = {self.first_data_time}")
+        self._recalculate_first_data_time(force=True)
         
         self.update_legend()
         # Force an immediate graph update to show the change
         self.update_graph()
-        print(f"Channel {channel_num} toggle complete")
     
-    def _recalculate_first_data_time(self):
-        """Recalculate first_data_time based on currently selected channels"""
-        print("DEBUG: Recalculating first_data_time...")
-        first_times = []
-        
+    def _valid_channel_data(self, channel_num):
+        """(t_ns, values, judge codes) of a channel's plottable points, filtered with one mask"""
+        t_ns, values, codes = self.graph_data_manager.get_channel_arrays(channel_num)
+        mask = valid_mask(values)
+        return t_ns[mask], values[mask], codes[mask]
+    
+    def _collect_frame_data(self):
+        """Fetch and filter every selected channel once per frame"""
+        return {channel_num: self._valid_channel_data(channel_num)
+                for channel_num in range(1, self.max_channels + 1)
+                if self.selected_channels.get(channel_num, False)}
+    
+    def _selected_extents(self):
+        """Running extents of every selected channel with data: O(channels), no history scan"""
+        extents = {}
         for channel_num in range(1, self.max_channels + 1):
             if self.selected_channels.get(channel_num, False):
-                timestamps, values, judges = self.graph_data_manager.get_channel_data(channel_num)
-                valid_times = [t for t, v in zip(timestamps, values) if v is not None and v != -9999.98 and str(v).lower() != 'nan']
-                if valid_times:
-                    first_times.append(valid_times[0])
-                    print(f"DEBUG: Channel {channel_num} contributes first time: {valid_times[0]}")
+                channel_extents = self.graph_data_manager.get_channel_extents(channel_num)
+                if channel_extents is not None:
+                    extents[channel_num] = channel_extents
+        return extents
+    
+    def _recalculate_first_data_time(self, force=False):
+        """Recalculate first_data_time based on currently selected channels
+
+        The reference only moves back to earlier data (or on force, after a
+        selection change), so ring eviction does not shift the time axis.
+        """
+        first_times = [first_t for first_t, last_t, v_min, v_max in self._selected_extents().values()]
         
         if first_times:
             new_first_time = min(first_times)
-            if self.first_data_time != new_first_time:
-                print(f"DEBUG: Updating first_data_time from {self.first_data_time} to {new_first_time}")
+            if self.first_data_time is None or force or new_first_time < self.first_data_time:
                 self.first_data_time = new_first_time
-            else:
-                print(f"DEBUG: first_data_time unchanged: {self.first_data_time}")
-        else:
-            print("DEBUG: No valid first times found, setting first_data_time to None")
+        elif force:
             self.first_data_time = None
     
     def update_legend(self):
-        """Update the legend to show only selected channels"""
+        """Update the legend to show only selected channels (the strips, in small multiples)"""
+        if self.layout == 'multiples':
+            self._build_plot()
+            return
+        self.invalidate_background()
         handles = []
         labels = []
         
@@ -364,6 +595,13 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         # Cancel existing timer if any
         self.stop_auto_update()
         
+        if self.governor:
+            # Refreshed by the governor whenever the app marks 'graph' dirty; new data
+            # keeps being drawn with auto-update off, only auto-fit stops
+            self.governor.register('graph', self.update_graph)
+            self.governor.resume('graph')
+            return
+        
         # Start new timer with a shorter interval for more responsive updates
         # This helps with very fast sample rates
         self.after_id = self.after(200, self.update_graph_with_timer)
@@ -396,14 +634,37 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             self.after_id = self.after(200, self.update_graph_with_timer)
     
     def go_back(self):
-        """Return to channel grid view"""
-        # Don't stop auto-update timer - let it continue running
-        # The timer should continue updating the graph even when not visible
-        # This prevents interference with data logging
-        
+        """Return to channel grid view (the app pauses this widget while hidden)"""
         if self.app_ref:
             self.app_ref.show_channel_grid()
     
+    def pause(self):
+        """Stop all refreshes while the view is hidden; buffered data keeps accumulating"""
+        if self.governor:
+            self.governor.pause('graph')
+        self.stop_auto_update()
+        self.renderer.pause()
+    
+    def resume(self):
+        """Restart refreshes and catch up with the data that arrived while hidden"""
+        self.renderer.resume()
+        if self.governor:
+            self.governor.resume('graph')
+        else:
+            self.start_auto_update()
+        self.update_graph()
+    
+    def destroy(self):
+        """Release the smoothing, render and export workers together with the widget"""
+        if self.governor:
+            self.governor.unregister('graph', self.update_graph)
+        if self._export_poll_id:
+            self.after_cancel(self._export_poll_id)
+        self.exporter.cancel()
+        self.smoothing.shutdown()
+        self.renderer.stop()
+        super().destroy()
+    
     def set_start_time(self, start_time):
         """Set the logging start time"""
         self.start_time = start_time
@@ -423,8 +684,10 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         except Exception as e:
             print(f"Error clearing data manager: {e}")
         
-        # Reset first data time
+        # Reset first data time and cached smoothed curves
         self.first_data_time = None
+        self.smoothing.reset()
+        self._full_data.clear()
         
         # Clear all lines and scatter plots
         for i in range(1, self.max_channels + 1):
@@ -434,133 +697,213 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             self.lo_points[i].set_offsets(np.empty((0, 2)))
         
         # Reset axis limits
+        self._drawn_last.clear()
         self.ax.set_xlim(0, 10)
-        self.ax.set_ylim(0, 100)
-        self.canvas.draw()
+        for ax in self._plot_axes():
+            ax.set_ylim(0, 100)
+        self.render()
         print("Graph cleared successfully")
         
+    def set_smoothing(self, choice):
+        """Select the line smoothing filter from the controls menu"""
+        self.smoothing.set_method(SMOOTHING_METHODS.get(choice, 'none'))
+        print(f"Smoothing set to {choice}")
+        self.update_graph()
+    
+    def set_export_kind(self, choice):
+        self.export_kind = choice
+    
+    def set_export_size(self, choice):
+        self.export_size = choice
+    
+    def export_graph(self):
+        """Export the selected channels as an image or time-lapse video in a background process"""
+        if self.exporter.busy:
+            return
+        kind, export_range = EXPORT_KINDS[self.export_kind]
+        extension = '.mp4' if kind == 'video' else f'.{kind}'
+        path = filedialog.asksaveasfilename(
+            title="Export graph",
+            initialdir=os.path.join(os.getcwd(), "output_files"),
+            defaultextension=extension,
+            filetypes=[(kind.upper(), f'*{extension}'), ("All files", "*.*")])
+        if not path:
+            return
+        
+        job = self._export_job(kind, export_range, path)
+        if not job['channels']:
+            print("Export: no channels selected")
+            return
+        if self._export_poll_id:
+            self.after_cancel(self._export_poll_id)
+        self.exporter.start(job)
+        self.export_button.configure(state="disabled", text="💾 0%")
+        self._export_poll_id = self.after(200, self._poll_export)
+    
+    def _export_job(self, kind, export_range, path):
+        """Plain-data export job; whole sessions read the session log through its LOD index"""
+        channels = [i for i in range(1, self.max_channels + 1) if self.selected_channels.get(i, False)]
+        log_path = self.app_ref.logger.csv_path if self.app_ref else None
+        job = {
+            'kind': kind,
+            'range': export_range,
+            'path': path,
+            'size': EXPORT_RESOLUTIONS[self.export_size],
+            'channels': channels,
+            'log_path': None,
+            'series': None,
+            'xlim': tuple(self.ax.get_xlim()),
+            # Small multiples have a y range per strip; the export uses one shared axes
+            'ylim': tuple(self.ax.get_ylim()) if export_range == 'view' and self.layout == 'overlay' else None,
+            'title': os.path.basename(log_path) if log_path else "Live session"
+        }
+        if export_range == 'session' and log_path and os.path.exists(log_path):
+            job['log_path'] = log_path
+        else:
+            # The graph buffer: what the live view holds at full resolution
+            job['series'] = {ch: self._full_data[ch][:2] for ch in channels if ch in self._full_data}
+        return job
+    
+    def _poll_export(self):
+        self._export_poll_id = None
+        result = self.exporter.poll()
+        if result is None:
+            self.export_button.configure(text=f"💾 {self.exporter.progress * 100:.0f}%")
+            self._export_poll_id = self.after(200, self._poll_export)
+            return
+        status, value = result
+        if status == 'done':
+            print(f"Graph exported to {value}")
+            self.export_button.configure(state="normal", text="✓ Exported")
+        else:
+            print(f"Graph export failed: {value}")
+            self.export_button.configure(state="normal", text="❌ Failed")
+        self._export_poll_id = self.after(3000, self._reset_export_button)
+    
+    def _reset_export_button(self):
+        self._export_poll_id = None
+        self.export_button.configure(text="💾 Export")
+    
     def manual_auto_fit(self):
         """Manual auto-fit triggered by button"""
         self.auto_fit()
         
-    def auto_fit(self):
-        """Auto-fit all visible data"""
+    def auto_fit(self, force=True):
+        """Auto-fit all visible data
+
+        Uses the running per-channel extents kept by GraphDataManager, so the
+        cost is O(channels). With force=False (the auto-update path) the limits
+        only move when data leaves the view or, at most once per
+        _limit_update_interval, when the view has become much larger than the
+        data, so most frames can be blitted.
+        """
         try:
-            all_times = []
-            all_values = []
+            extents = self._selected_extents()
             
             # First, recalculate first_data_time based on currently selected channels
-            # (same logic as in update_graph)
-            first_times = []
-            for channel_num in range(1, self.max_channels + 1):
-                if self.selected_channels.get(channel_num, False):
-                    timestamps, values, judges = self.graph_data_manager.get_channel_data(channel_num)
-                    valid_times = [t for t, v in zip(timestamps, values) if v is not None and v != -9999.98 and str(v).lower() != 'nan']
-                    if valid_times:
-                        first_times.append(valid_times[0])
+            self._recalculate_first_data_time()
             
-            # Update first_data_time if we have valid selected channels
-            if first_times:
-                new_first_time = min(first_times)
-                if self.first_data_time != new_first_time:
-                    self.first_data_time = new_first_time
-                    print(f"Auto_fit: Updated first_data_time to: {self.first_data_time}")
+            time_mins, time_maxs, value_mins, value_maxs = [], [], [], []
+            y_targets = {}  # {axes: (y_min, y_max)}; one entry per strip in small multiples
+            reference_time = self.first_data_time
+            for channel_num, (first_t, last_t, v_min, v_max) in extents.items():
+                time_mins.append((first_t - reference_time) / 1e9)
+                time_maxs.append((last_t - reference_time) / 1e9)
+                value_mins.append(v_min)
+                value_maxs.append(v_max)
+                if self.layout == 'multiples':
+                    y_targets[self.channel_axes[channel_num]] = (float(v_min), float(v_max))
             
-            # Collect data from all selected channels
-            for channel_num in range(1, self.max_channels + 1):
-                if not self.selected_channels.get(channel_num, False):
-                    continue
-                    
-                timestamps, values, judges = self.graph_data_manager.get_channel_data(channel_num)
-                if timestamps and values:
-                    # Filter out invalid data points
-                    valid_data = [(t, v) for t, v in zip(timestamps, values) if v != -9999.98 and v is not None]
-                    if valid_data:
-                        plot_times, plot_values = zip(*valid_data)
-                        
-                        # Use the same fallback logic as update_graph
-                        reference_time = self.first_data_time
-                        if reference_time is None:
-                            # Fallback: use this channel's first timestamp
-                            reference_time = plot_times[0]
-                            print(f"Auto_fit: Channel {channel_num} using fallback reference time {reference_time}")
-                        
-                        try:
-                            relative_times = [(t - reference_time).total_seconds() for t in plot_times]
-                            # Handle negative times by adding offset
-                            if relative_times and min(relative_times) < 0:
-                                time_offset = abs(min(relative_times))
-                                relative_times = [t + time_offset for t in relative_times]
-                            
-                            all_times.extend(relative_times)
-                            all_values.extend(plot_values)
-                        except Exception as e:
-                            print(f"Error processing times for channel {channel_num}: {e}")
-            
-            if all_times and all_values:
-                time_min, time_max = min(all_times), max(all_times)
+            if time_mins:
+                time_min, time_max = min(time_mins), max(time_maxs)
                 time_range = time_max - time_min
                 time_padding = max(1.0, time_range * 0.1)  # Minimum 1 second padding
+                new_xlim = (max(0, time_min - time_padding), time_max + time_padding)
                 
-                y_min, y_max = min(all_values), max(all_values)
-                y_range = y_max - y_min
-                y_padding = 5.0 if y_range == 0 else y_range * 0.1  # Minimum 5 unit padding
+                if not y_targets:
+                    y_targets[self.ax] = (float(min(value_mins)), float(max(value_maxs)))
+                new_ylims = {ax: self._padded_ylim(*y) for ax, y in y_targets.items()}
                 
-                self.ax.set_xlim(max(0, time_min - time_padding), time_max + time_padding)
-                self.ax.set_ylim(y_min - y_padding, y_max + y_padding)
-                
-                print(f"Auto fit: X({time_min:.1f} to {time_max:.1f}), Y({y_min:.1f} to {y_max:.1f})")
-            else:
+                if force or any(self._limits_need_update(ax, new_xlim, new_ylims[ax], time_max, *y)
+                                for ax, y in y_targets.items()):
+                    if not force:
+                        # Leave headroom on the right so new samples fit for a while
+                        new_xlim = (new_xlim[0], new_xlim[1] + max(1.0, time_range * 0.2))
+                    self.ax.set_xlim(*new_xlim)
+                    for ax, ylim in new_ylims.items():
+                        ax.set_ylim(*ylim)
+                    self._last_limit_change = time.time()
+                    print(f"Auto fit: X({time_min:.1f} to {time_max:.1f}), "
+                          f"Y({min(value_mins):.1f} to {max(value_maxs):.1f})")
+            elif force:
                 print("No valid data for auto fit - using default ranges")
                 self.ax.set_xlim(0, 10)
-                self.ax.set_ylim(0, 100)
+                for ax in self._plot_axes():
+                    ax.set_ylim(0, 100)
                 
-            self.canvas.draw()
+            self.render(dirty_only=not force)
                 
         except Exception as e:
             print(f"Error in auto_fit: {e}")
             import traceback
             traceback.print_exc()
     
+    @staticmethod
+    def _padded_ylim(y_min, y_max):
+        y_range = y_max - y_min
+        y_padding = 5.0 if y_range == 0 else y_range * 0.1  # Minimum 5 unit padding
+        return (y_min - y_padding, y_max + y_padding)
+    
+    def _limits_need_update(self, ax, new_xlim, new_ylim, time_max, y_min, y_max):
+        """Throttled limit policy for auto-update frames"""
+        (x_lo, x_hi), (y_lo, y_hi) = self._current_limits(ax)
+        # Data outside the current view: update right away
+        if time_max > x_hi or y_min < y_lo or y_max > y_hi or new_xlim[0] < x_lo:
+            return True
+        if time.time() - self._last_limit_change < self._limit_update_interval:
+            return False
+        # View much larger than needed (e.g. after a spike left the buffer): shrink
+        needed_x = new_xlim[1] - new_xlim[0]
+        needed_y = new_ylim[1] - new_ylim[0]
+        return (x_hi - x_lo) > 2 * needed_x or (y_hi - y_lo) > 2 * needed_y
+    
     def zoom_in(self):
         """Zoom in on both axes"""
         self.disable_auto_update()
         
         x_min, x_max = self.ax.get_xlim()
-        y_min, y_max = self.ax.get_ylim()
-        
         x_center = (x_min + x_max) / 2
-        y_center = (y_min + y_max) / 2
-        
         x_range = (x_max - x_min) * 0.7 / 2
-        y_range = (y_max - y_min) * 0.7 / 2
         
         new_x_min = max(0, x_center - x_range)
         new_x_max = x_center + x_range
         
         self.ax.set_xlim(new_x_min, new_x_max)
-        self.ax.set_ylim(y_center - y_range, y_center + y_range)
-        self.canvas.draw()
+        for ax in self._plot_axes():
+            y_min, y_max = ax.get_ylim()
+            y_center = (y_min + y_max) / 2
+            y_range = (y_max - y_min) * 0.7 / 2
+            ax.set_ylim(y_center - y_range, y_center + y_range)
+        self.render()
     
     def zoom_out(self):
         """Zoom out on both axes"""
         self.disable_auto_update()
         
         x_min, x_max = self.ax.get_xlim()
-        y_min, y_max = self.ax.get_ylim()
-        
         x_center = (x_min + x_max) / 2
-        y_center = (y_min + y_max) / 2
-        
         x_range = (x_max - x_min) * 1.3 / 2
-        y_range = (y_max - y_min) * 1.3 / 2
         
         new_x_min = max(0, x_center - x_range)
         new_x_max = x_center + x_range
         
         self.ax.set_xlim(new_x_min, new_x_max)
-        self.ax.set_ylim(y_center - y_range, y_center + y_range)
-        self.canvas.draw()
+        for ax in self._plot_axes():
+            y_min, y_max = ax.get_ylim()
+            y_center = (y_min + y_max) / 2
+            y_range = (y_max - y_min) * 1.3 / 2
+            ax.set_ylim(y_center - y_range, y_center + y_range)
+        self.render()
     
     def disable_auto_update(self):
         """Disable auto-update when user manually interacts"""
@@ -571,8 +914,8 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             print("Auto-update disabled due to manual interaction")
     
     def on_scroll(self, event):
-        """Handle mouse wheel scrolling for zoom"""
-        if event.inaxes != self.ax:
+        """Handle mouse wheel scrolling for zoom (time axis shared, y of the strip under the cursor)"""
+        if event.inaxes not in self._plot_axes():
             return
             
         self.disable_auto_update()
@@ -597,32 +940,33 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         self.ax.set_xlim(new_x_min, new_x_max)
         
         # Zoom Y-axis
-        y_min, y_max = self.ax.get_ylim()
+        y_min, y_max = event.inaxes.get_ylim()
         y_range = y_max - y_min
         new_y_range = y_range * zoom_factor
         y_center_ratio = (mouse_y - y_min) / y_range if y_range > 0 else 0.5
         new_y_min = mouse_y - new_y_range * y_center_ratio
         new_y_max = mouse_y + new_y_range * (1 - y_center_ratio)
         
-        self.ax.set_ylim(new_y_min, new_y_max)
-        self.canvas.draw()
+        event.inaxes.set_ylim(new_y_min, new_y_max)
+        self.render()
     
     def on_button_press(self, event):
         """Handle mouse button press for panning"""
-        if event.inaxes != self.ax or event.button != 1:
+        if event.inaxes not in self._plot_axes() or event.button != 1:
             return
             
         self.disable_auto_update()
         
         self.is_panning = True
+        self.pan_ax = event.inaxes
         self.pan_start = (event.xdata, event.ydata)
         self.pan_start_xlim = self.ax.get_xlim()
-        self.pan_start_ylim = self.ax.get_ylim()
+        self.pan_start_ylim = event.inaxes.get_ylim()
         self.canvas.get_tk_widget().configure(cursor="fleur")
     
     def on_mouse_motion(self, event):
         """Handle mouse motion for panning"""
-        if not self.is_panning or event.inaxes != self.ax:
+        if not self.is_panning or event.inaxes is not self.pan_ax:
             return
         if self.pan_start is None or event.xdata is None or event.ydata is None:
             return
@@ -642,12 +986,13 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             new_x_min = 0
         
         self.ax.set_xlim(new_x_min, new_x_max)
-        self.ax.set_ylim(y_min + dy, y_max + dy)
-        self.canvas.draw()
+        self.pan_ax.set_ylim(y_min + dy, y_max + dy)
+        self.render()
     
     def on_button_release(self, event):
         """Handle mouse button release"""
         self.is_panning = False
+        self.pan_ax = None
         self.pan_start = None
         self.pan_start_xlim = None
         self.pan_start_ylim = None
@@ -657,22 +1002,15 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
         """Update the graph with new data from all channels"""
         if self._update_in_progress:  # Prevent concurrent updates
             return
-            
-        # Throttle updates to prevent overwhelming the system with very fast sample rates
-        import time
-        current_time = time.time()
-        if current_time - self._last_update_time < self._min_update_interval:
-            return  # Skip this update if too soon since last update
-        self._last_update_time = current_time
+        # Refresh rate is set by the caller (FrameGovernor or the auto-update timer)
             
         try:
             any_data_updated = False
             data_points_found = 0
             visible_channels = 0
 
-            # Get list of selected channels for debugging
-            selected_list = [i for i in range(1, self.max_channels + 1) if self.selected_channels.get(i, False)]
-            print(f"DEBUG: update_graph - selected channels: {selected_list}")
+            # Fetch and mask every selected channel once for this frame
+            frame_data = self._collect_frame_data()
             
             # Always recalculate first_data_time based on currently selected channels
             # This ensures we don't depend on OUT1 or any specific channel
@@ -681,6 +1019,8 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
             for channel_num in range(1, self.max_channels + 1):
                 if not self.selected_channels.get(channel_num, False):
                     # Hide channel if not selected - make sure it's completely hidden
+                    self._full_data.pop(channel_num, None)
+                    self._drawn_last.pop(channel_num, None)
                     self.lines[channel_num].set_data([], [])
                     self.go_points[channel_num].set_offsets(np.empty((0, 2)))
                     self.hi_points[channel_num].set_offsets(np.empty((0, 2)))
@@ -688,34 +1028,28 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
                     # Make sure the line is not visible
                     self.lines[channel_num].set_visible(False)
                     any_data_updated = True
-                    print(f"DEBUG: Channel {channel_num} is not selected, hiding it")
-                    
-                    # Additional debugging for OUT1
-                    if channel_num == 1:
-                        print(f"OUT1 HIDE DEBUG: selected_channels[1] = {self.selected_channels.get(1, False)}")
-                        print(f"OUT1 HIDE DEBUG: checkbox state = {self.channel_checkboxes[1].get() if 1 in self.channel_checkboxes else 'N/A'}")
-                    
                     continue
 
                 # Make sure the line is visible for selected channels
                 self.lines[channel_num].set_visible(True)
                 visible_channels += 1
-                timestamps, values, judges = self.graph_data_manager.get_channel_data(channel_num)
+                plot_times, plot_values, plot_codes = frame_data[channel_num]
 
                 # If no logged data, try to get live data
-                if not timestamps and self.live_data_manager:
+                if not len(plot_times) and self.live_data_manager:
                     live_data = self.live_data_manager.get_current_data(channel_num)
                     if live_data and live_data['value'] != -9999.98:
                         # Create a single point from live data
-                        current_time = datetime.now()
+                        current_time = live_data.get('t_ns') or time.monotonic_ns()
                         if self.first_data_time is None:
                             self.first_data_time = current_time
                         
                         # Create a single data point for live display
-                        relative_time = (current_time - self.first_data_time).total_seconds()
-                        if relative_time < 0:
-                            relative_time = 0
+                        relative_time = max(0.0, (current_time - self.first_data_time) / 1e9)
                         
+                        self._full_data.pop(channel_num, None)
+                        self._drawn_last.pop(channel_num, None)
+                        self.renderer.mark_dirty(self.channel_axes.get(channel_num))
                         self.lines[channel_num].set_data([relative_time], [live_data['value']])
                         
                         # Update judge markers for live data
@@ -741,87 +1075,42 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
                         data_points_found += 1
                         continue
 
-                if not timestamps or not values:
-                    print(f"DEBUG: Channel {channel_num} has no data")
-                    continue
-
-                # Filter valid data more carefully
-                valid_data = []
-                for t, v, j in zip(timestamps, values, judges):
-                    if v is not None and v != -9999.98 and str(v).lower() != 'nan':
-                        try:
-                            float_val = float(v)
-                            valid_data.append((t, float_val, j))
-                        except (ValueError, TypeError):
-                            continue
-
-                if not valid_data:
-                    print(f"DEBUG: Channel {channel_num} has no valid data")
+                if not len(plot_times):
                     continue
 
-                plot_times, plot_values, plot_judges = zip(*valid_data)
                 data_points_found += len(plot_values)
-                print(f"DEBUG: Channel {channel_num} has {len(plot_values)} valid data points")
 
-                # Use the global first_data_time that's based on selected channels
-                # If first_data_time is None, use this channel's first timestamp as fallback
-                reference_time = self.first_data_time
-                if reference_time is None:
-                    # Fallback: use this channel's first timestamp
-                    reference_time = plot_times[0]
-                    print(f"Channel {channel_num}: Using fallback reference time {reference_time}")
+                # first_data_time is based on selected channels; this channel has data, so it is set
+                reference_time = self.first_data_time if self.first_data_time is not None else plot_times[0]
 
-                # Convert to relative times
-                try:
-                    relative_times = [(t - reference_time).total_seconds() for t in plot_times]
-                    if relative_times and min(relative_times) < 0:
-                        time_offset = abs(min(relative_times))
-                        relative_times = [t + time_offset for t in relative_times]
-                    print(f"DEBUG: Channel {channel_num} calculated {len(relative_times)} relative times")
-                except Exception as e:
-                    print(f"Error calculating relative times for channel {channel_num}: {e}")
-                    continue
+                # Update main line; smoothing runs incrementally on a worker thread
+                line_t, line_values = self.smoothing.get_line(channel_num, plot_times, plot_values)
 
-                # Update main line with smoothing if enough points
-                if len(relative_times) > 3:
-                    try:
-                        from scipy.interpolate import make_interp_spline
-                        # Use global np import, not local
-                        import numpy as np_local
-                        xnew = np_local.linspace(min(relative_times), max(relative_times), 300)
-                        spl = make_interp_spline(relative_times, plot_values, k=3)
-                        y_smooth = spl(xnew)
-                        self.lines[channel_num].set_data(xnew, y_smooth)
-                    except:
-                        # Fallback to non-smoothed if scipy is not available
-                        self.lines[channel_num].set_data(relative_times, plot_values)
-                else:
-                    self.lines[channel_num].set_data(relative_times, plot_values)
+                # Nothing new for this channel since the last frame: leave its strip alone
+                drawn_key = (len(plot_times), plot_times[-1], len(line_t), reference_time)
+                if self._drawn_last.get(channel_num) == drawn_key and channel_num in self._full_data:
+                    continue
+                self._drawn_last[channel_num] = drawn_key
+                self.renderer.mark_dirty(self.channel_axes.get(channel_num))
 
-                # Update judge markers
-                try:
-                    go_data = [(rt, v) for rt, v, j in zip(relative_times, plot_values, plot_judges) if j == "GO"]
-                    hi_data = [(rt, v) for rt, v, j in zip(relative_times, plot_values, plot_judges) if j == "HI"]
-                    lo_data = [(rt, v) for rt, v, j in zip(relative_times, plot_values, plot_judges) if j == "LO"]
+                # Convert to relative times with one vectorized int64 subtraction
+                relative_times = (plot_times - reference_time) / 1e9
 
-                    self.go_points[channel_num].set_offsets(list(zip(*go_data)) if go_data else np.empty((0, 2)))
-                    self.hi_points[channel_num].set_offsets(list(zip(*hi_data)) if hi_data else np.empty((0, 2)))
-                    self.lo_points[channel_num].set_offsets(list(zip(*lo_data)) if lo_data else np.empty((0, 2)))
-                except Exception as e:
-                    print(f"Error updating judge markers for channel {channel_num}: {e}")
+                # Judge markers: one code mask per marker type, offsets passed straight through.
+                # Artists receive an M4 decimation for the current view (re-run on xlim changes)
+                points = np.column_stack((relative_times, plot_values))
+                self._full_data[channel_num] = ((line_t - reference_time) / 1e9, line_values,
+                                                points, plot_codes)
+                self._apply_channel_data(channel_num)
 
                 any_data_updated = True
 
             # Always redraw the canvas when data is processed
             if any_data_updated:
                 if self.auto_update_enabled and visible_channels > 0 and data_points_found > 0:
-                    self.auto_fit()
+                    self.auto_fit(force=False)
                 else:
-                    self.canvas.draw()
-
-            # Print status only occasionally to reduce console spam
-            if visible_channels > 0 and data_points_found > 0:
-                print(f"Graph updated: {data_points_found} points across {visible_channels} channels (selected: {selected_list})")
+                    self.render(dirty_only=True)
 
         except Exception as e:
             print(f"Error in update_graph: {e}")
@@ -831,13 +1120,24 @@ class MultiChannelGraphWidget(ctk.CTkFrame):
 
 # Keep the original single-channel widget for backward compatibility
 class LiveGraphWidget(ctk.CTkFrame):
-    def __init__(self, parent, channel_num, graph_data_manager, app_ref=None):
+    """Fixed-duration scrolling strip chart for one channel"""
+    
+    def __init__(self, parent, channel_num, graph_data_manager, app_ref=None, window_seconds=60.0,
+                 capacity=4096):
         super().__init__(parent, corner_radius=15, fg_color=COLORS['card'])
         self.channel_num = channel_num
         self.graph_data_manager = graph_data_manager
         self.start_time = None
         self.first_data_time = None
         self.app_ref = app_ref
+        self.window_seconds = float(window_seconds)
+        
+        # Preallocated strip buffer; only samples newer than the cursor are fetched
+        self._t = np.empty(capacity, dtype=np.int64)
+        self._y = np.empty(capacity)
+        self._x = np.empty(capacity)
+        self._count = 0
+        self._cursor = None
         
         # Header with back button
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -870,19 +1170,36 @@ class LiveGraphWidget(ctk.CTkFrame):
         self.figure = Figure(figsize=(10, 5), dpi=100, facecolor='#2D2D2D')
         self.ax = self.figure.add_subplot(111, facecolor='#1A1A1A')
         
-        # Configure plot appearance
+        # Configure plot appearance; the time axis is fixed, newest sample at 0
         self.ax.set_xlabel('Time (s)', color=COLORS['text'], fontsize=12)
         self.ax.set_ylabel('Thickness (μm)', color=COLORS['text'], fontsize=12)
         self.ax.tick_params(colors=COLORS['text'])
         self.ax.grid(True, alpha=0.3, color='gray')
+        self.ax.set_xlim(-self.window_seconds, 0)
+        self.ax.set_ylim(-1, 1)
         
-        # Initialize empty line
+        # Initialize empty line, drawn over the cached background
         self.line, = self.ax.plot([], [], color=COLORS['primary'], linewidth=2, label='Measurement')
+        self.line.set_animated(True)
         
         # Embed plot in tkinter
         self.canvas = FigureCanvasTkAgg(self.figure, self)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=(0, 10))
         
+        # Same renderer as MultiChannelGraphWidget (blitting, optional render worker)
+        self.renderer = BlitRenderer(self, self.canvas,
+                                     render_worker=make_render_worker(GRAPH_RENDER_WORKER),
+                                     snapshot=lambda: axes_snapshot(self.canvas, self.ax, [line_spec(self.line)]))
+        self.renderer.add_region(self.ax, lambda: [self.line])
+        self.canvas.draw()
+        
+    def render(self):
+        self.renderer.render()
+        
+    def destroy(self):
+        self.renderer.stop()
+        super().destroy()
+        
     def go_back(self):
         if self.app_ref:
             self.app_ref.show_channel_grid()
@@ -890,36 +1207,75 @@ class LiveGraphWidget(ctk.CTkFrame):
     def set_start_time(self, start_time):
         self.start_time = start_time
         
+    def set_window(self, seconds):
+        """Change the strip chart duration"""
+        self.window_seconds = float(seconds)
+        self.ax.set_xlim(-self.window_seconds, 0)
+        self.render()
+        
+    def clear(self):
+        self._count = 0
+        self._cursor = None
+        self.line.set_data([], [])
+        self.render()
+        
+    def _append(self, t_ns, values):
+        """Add samples to the preallocated buffer, dropping those left of the window first"""
+        n, k = self._count, len(t_ns)
+        if n + k > len(self._t):
+            cutoff = t_ns[-1] - int(self.window_seconds * 1e9)
+            # Keep one point left of the window so the line runs to the axes edge
+            drop = max(0, int(np.searchsorted(self._t[:n], cutoff, side='right')) - 1)
+            if drop:
+                self._t[:n - drop] = self._t[drop:n]
+                self._y[:n - drop] = self._y[drop:n]
+                n -= drop
+            if n + k > len(self._t):
+                capacity = max(2 * len(self._t), n + k)
+                self._t = np.concatenate((self._t[:n], np.empty(capacity - n, dtype=np.int64)))
+                self._y = np.concatenate((self._y[:n], np.empty(capacity - n)))
+                self._x = np.empty(capacity)
+        self._t[n:n + k] = t_ns
+        self._y[n:n + k] = values
+        self._count = n + k
+        
+    def _update_ylim(self, values):
+        """Fit y to the visible samples with headroom; refit only when data leaves the band
+        or fills less than a third of it (works for negative thickness values too)"""
+        v_min, v_max = float(values.min()), float(values.max())
+        margin = max(v_max - v_min, 1.0) * 0.25
+        new_lo, new_hi = v_min - margin, v_max + margin
+        lo, hi = self.ax.get_ylim()
+        if v_min < lo or v_max > hi or (hi - lo) > 3 * (new_hi - new_lo):
+            self.ax.set_ylim(new_lo, new_hi)
+        
     def update_graph(self, current_value=None, current_judge=None):
-        """Update graph with new data"""
+        """Append the samples logged since the last call and scroll the strip chart"""
         try:
-            timestamps, values, judges = self.graph_data_manager.get_channel_data(self.channel_num)
-            
-            if not timestamps:
-                return
+            t_ns, values, self._cursor, reset = self.graph_data_manager.get_samples_since(
+                self.channel_num, self._cursor)
+            if reset:
+                self._count = 0
                 
             if current_value is not None and current_value != -9999.98:
                 self.current_value_label.configure(text=f"Current: {current_value:7.2f} μm ({current_judge})")
             
-            valid_data = [(t, v) for t, v in zip(timestamps, values) if v != -9999.98]
-            if not valid_data:
+            mask = valid_mask(values)
+            if mask.any():
+                self._append(t_ns[mask], values[mask])
+            n = self._count
+            if not n:
                 return
-                
-            plot_times, plot_values = zip(*valid_data)
-            
-            if self.first_data_time is None:
-                self.first_data_time = plot_times[0]
-                
-            relative_times = [(t - self.first_data_time).total_seconds() for t in plot_times]
-            
-            self.line.set_data(relative_times, plot_values)
             
-            # Auto-scale
-            if relative_times and plot_values:
-                self.ax.set_xlim(0, max(relative_times) * 1.1)
-                self.ax.set_ylim(min(plot_values) * 0.9, max(plot_values) * 1.1)
+            # Relative times into the preallocated x buffer, newest sample at 0
+            x = self._x[:n]
+            np.subtract(self._t[:n], self._t[n - 1], out=x)
+            x /= 1e9
+            self.line.set_data(x, self._y[:n])
             
-            self.canvas.draw()
+            first_visible = max(0, int(np.searchsorted(x, -self.window_seconds)) - 1)
+            self._update_ylim(self._y[first_visible:n])
+            self.render()
             
         except Exception as e:
-            print(f"Error in update_graph: {e}")
\ No newline at end of file
+            print(f"Error updating live graph: {e}")
@@ -1,42 +1,115 @@
 import customtkinter as ctk
-from datetime import datetime
-from config import COLORS
-from ui_components import ChannelDisplay, ModernStatusCard
-from graph_widget import MultiChannelGraphWidget
+import time
+import traceback
+import startup
+from config import (COLORS, GRAPH_BUFFER_POINTS, FRAME_CPU_BUDGET, FRAME_MIN_INTERVAL,
+                    FRAME_MAX_INTERVAL, FRAME_STATS_LOG_INTERVAL, STARTUP_REPORT,
+                    WATCHDOG_HEARTBEAT_INTERVAL, WATCHDOG_SLOW_THRESHOLD, WATCHDOG_CAPACITY,
+                    STREAM_SERVER_ENABLED, STREAM_HOST, STREAM_PORT, STREAM_UNIX_PATH,
+                    STREAM_HISTORY_SECONDS, STREAM_CLIENT_BUFFER, ACQUISITION_PROCESS,
+                    DEVICE_CONNECT_DEADLINE)
+from ui_components import ModernStatusCard, ChannelGrid, GRID_LAYOUTS, GRID_SORTS, GRID_FILTERS
 from data_manager import GraphDataManager, LiveDataManager
+from acquisition import AcquisitionPipeline
+from channel_statistics import StatisticsEngine
+from frame_governor import FrameGovernor
+from ui_watchdog import UIWatchdog
 from logger import CL3000Logger
 from tkinter import BooleanVar
-import CL3wrap
-from zeroing_page import ZeroingPage
+
+# The graph, history and zeroing views (matplotlib, scipy, the device driver) are
+# imported when first opened, so the window and channel grid appear without them
 
 class CL3000App(ctk.CTk):
     def __init__(self, logger):
         super().__init__()
         self.logger = logger
-        self.logger.set_callbacks(self.update_display, self._on_logging_stop)
+        self.logger.set_callbacks(self.update_display, self._on_logging_stop, self._on_logging_resumed)
+        
+        # One acquisition stage feeds the live view, the logger and the graph buffer;
+        # with ACQUISITION_PROCESS it runs in a separate service process instead
+        if ACQUISITION_PROCESS:
+            from acquisition_service import RemoteAcquisition
+            self.acquisition = RemoteAcquisition()
+        else:
+            self.acquisition = AcquisitionPipeline()
+        self.logger.attach_pipeline(self.acquisition)
         self.title("Schaeffler CL-3000 Data Logger")
         self.geometry("1600x1000")
         self.configure(padx=20, pady=20)
         
         self.current_filename = None
-        self.channel_displays = []
+        self.channel_grid = None
         self.out_channels = 6
-        self.graph_data_manager = GraphDataManager()
-        self.live_data_manager = LiveDataManager(num_channels=self.out_channels)
+        self.graph_data_manager = GraphDataManager(max_points=GRAPH_BUFFER_POINTS)
+        self.logger.add_sink(self.graph_data_manager.add_samples)
+        self.live_data_manager = LiveDataManager(num_channels=self.out_channels,
+                                                 pipeline=self.acquisition)
+        self.statistics = StatisticsEngine()
+        self.acquisition.subscribe(self.statistics.add_samples)
+        self.stats_window = None  # None = whole session, else a StatisticsEngine window name
+        self.stats_after_id = None
         self.current_graph_widget = None
-        self.viewing_graph = False
         self.logging_start_time = None
         
+        # Views are built on first use and kept; navigation only packs/unpacks them
+        self.views = {}  # {name: frame in right_frame}
+        self.current_view = None
+        self._error_label = None
+        
+        # Event-loop latency and slow-callback profiling (see the diagnostics view)
+        self.watchdog = UIWatchdog(self, heartbeat_interval=WATCHDOG_HEARTBEAT_INTERVAL,
+                                   slow_threshold=WATCHDOG_SLOW_THRESHOLD,
+                                   capacity=WATCHDOG_CAPACITY)
+        
+        # All view refreshes run on the Tk thread at a rate set by the governor;
+        # acquisition callbacks only record the latest values and mark views dirty
+        self.frame_governor = FrameGovernor(self, cpu_budget=FRAME_CPU_BUDGET,
+                                            min_interval=FRAME_MIN_INTERVAL,
+                                            max_interval=FRAME_MAX_INTERVAL,
+                                            stats_log_interval=FRAME_STATS_LOG_INTERVAL,
+                                            profiler=self.watchdog)
+        self.frame_governor.register('grid', self._refresh_channel_grid)
+        self.frame_governor.register('status', self._refresh_log_status)
+        self._grid_values = {}  # {channel_num: (value, judge)} awaiting display
+        self._log_status = None  # (samples, runtime) awaiting display
+        
         # Set up live data manager callbacks
         self.live_data_manager.set_callbacks(
             data_update_callback=self._on_live_data_update,
             connection_change_callback=self._on_connection_change
         )
         
+        self._connect_future = None  # Background connect of start_logging
+        self._connected_once = False
+        
+        # Optional live stream to other local tools (MES bridge, notebooks)
+        self.stream_server = None
+        if STREAM_SERVER_ENABLED:
+            from stream_server import StreamServer
+            self.stream_server = StreamServer(self.acquisition, host=STREAM_HOST, port=STREAM_PORT,
+                                              unix_path=STREAM_UNIX_PATH,
+                                              history_seconds=STREAM_HISTORY_SECONDS,
+                                              client_buffer=STREAM_CLIENT_BUFFER)
+            try:
+                self.stream_server.start()
+            except OSError as e:
+                print(f"Could not start live stream server: {e}")
+                self.stream_server = None
+        
         self.setup_ui()
+        self.frame_governor.start()
+        self.watchdog.start()
         
-        # Start live data reading immediately
+        # Start live data reading immediately; the acquisition thread connects to the device
         self.live_data_manager.start_live_reading()
+        self.after_idle(self._on_first_frame)
+
+    def _on_first_frame(self):
+        """Runs once the window and grid have been drawn for the first time"""
+        startup.mark("first frame")
+        if STARTUP_REPORT:
+            print(startup.report())
 
     def setup_ui(self):
         # Header Frame
@@ -151,13 +224,65 @@ class CL3000App(ctk.CTk):
         self.connection_card.pack(pady=3)
 
         # Initialize with channel grid view
-        self.setup_channel_grid()
+        self._show_view('grid', self.setup_channel_grid)
+
+    def _show_view(self, name, create):
+        """Show a cached view, building it with `create()` on first use
+
+        The outgoing view is paused and unpacked rather than destroyed, so its
+        timers stop while hidden and switching back to it is instant.
+        """
+        if name == self.current_view:
+            return self.views[name]
+        if self._error_label is not None:
+            self._error_label.destroy()
+            self._error_label = None
+        previous = self.current_view
+        if previous is not None:
+            self._pause_view(previous)
+            self.views[previous].pack_forget()
+            self.current_view = None
+
+        view = self.views.get(name)
+        if view is None:
+            try:
+                view = self.watchdog.call(f"build {name} view", create)
+            except Exception as e:
+                print(f"Error creating {name} view: {e}")
+                traceback.print_exc()
+                self._error_label = ctk.CTkLabel(self.right_frame, text=f"Error loading {name} view: {str(e)}", 
+                                                 text_color=COLORS['danger'])
+                self._error_label.pack(expand=True)
+                return None
+            self.views[name] = view
+        view.pack(fill="both", expand=True)
+        self.current_view = name
+        self.watchdog.call(f"resume {name} view", self._resume_view, name)
+        return view
+
+    def _pause_view(self, name):
+        """Stop a view's refreshes while it is hidden"""
+        if name == 'grid':
+            self.frame_governor.pause('grid')
+            if self.stats_after_id:
+                self.after_cancel(self.stats_after_id)
+                self.stats_after_id = None
+            return
+        pause = getattr(self.views[name], 'pause', None)
+        if pause:
+            pause()
+
+    def _resume_view(self, name):
+        """Restart a view's refreshes and bring it up to date"""
+        if name == 'grid':
+            self.frame_governor.resume('grid')
+            self.refresh_statistics()
+            return
+        resume = getattr(self.views[name], 'resume', None)
+        if resume:
+            resume()
 
     def setup_channel_grid(self):
-        # Clear existing content
-        for widget in self.right_frame.winfo_children():
-            widget.destroy()
-            
         # Create a container with card background for the grid view only
         grid_container = ctk.CTkFrame(self.right_frame, corner_radius=15, fg_color=COLORS['card'])
         grid_container.pack(fill="both", expand=True)
@@ -191,106 +316,163 @@ class CL3000App(ctk.CTk):
                                     text_color="black")
         zeroing_btn.pack(side="left", padx=10)
 
-        # Channels container
-        self.channels_container = ctk.CTkFrame(grid_container, fg_color="transparent")
-        self.channels_container.pack(fill="both", expand=True, padx=25, pady=(0, 20))
+        # Session history (finished logs) button
+        history_btn = ctk.CTkButton(button_row, text="📂 Session History", 
+                                    command=self.show_history_view,
+                                    height=45,
+                                    font=ctk.CTkFont(size=16, weight="bold"),
+                                    fg_color=COLORS['info'],
+                                    hover_color=COLORS['primary'],
+                                    text_color="white")
+        history_btn.pack(side="left", padx=10)
 
-        self.update_channel_displays()
+        # Event-loop latency / slow callback diagnostics
+        diagnostics_btn = ctk.CTkButton(button_row, text="🩺 Diagnostics", 
+                                        command=self.show_diagnostics_view,
+                                        height=45,
+                                        font=ctk.CTkFont(size=16, weight="bold"),
+                                        fg_color=COLORS['secondary'],
+                                        hover_color=COLORS['primary'],
+                                        text_color="white")
+        diagnostics_btn.pack(side="left", padx=10)
+
+        # Statistics window selector
+        self.stats_window_menu = ctk.CTkOptionMenu(button_row,
+                                                   values=["Session"] + list(self.statistics.windows),
+                                                   command=self.set_stats_window,
+                                                   height=45, width=120,
+                                                   font=ctk.CTkFont(size=14),
+                                                   fg_color=COLORS['accent'],
+                                                   button_color=COLORS['primary'],
+                                                   button_hover_color=COLORS['success'])
+        self.stats_window_menu.set(self.stats_window or "Session")
+        self.stats_window_menu.pack(side="left", padx=10)
+
+        # Grid layout, sorting and filtering (applied without rebuilding the channel widgets)
+        view_row = ctk.CTkFrame(grid_container, fg_color="transparent")
+        view_row.pack(pady=(0, 10))
+        for label, values, command in (("View:", list(GRID_LAYOUTS), self.set_grid_layout),
+                                       ("Sort:", list(GRID_SORTS), self.set_grid_sort),
+                                       ("Show:", list(GRID_FILTERS), self.set_grid_filter)):
+            ctk.CTkLabel(view_row, text=label, font=ctk.CTkFont(size=13, weight="bold"),
+                         text_color=COLORS['text']).pack(side="left", padx=(10, 5))
+            menu = ctk.CTkOptionMenu(view_row, values=values, command=command,
+                                     height=32, width=130,
+                                     font=ctk.CTkFont(size=13),
+                                     fg_color=COLORS['accent'],
+                                     button_color=COLORS['primary'],
+                                     button_hover_color=COLORS['success'])
+            menu.set(values[0])
+            menu.pack(side="left")
+
+        # Channels container: only the cards that fit on screen are created
+        self.channel_grid = ChannelGrid(grid_container, self.out_channels)
+        self.channel_grid.pack(fill="both", expand=True, padx=25, pady=(0, 20))
+        return grid_container
 
     def update_channel_displays(self):
-        for display in self.channel_displays:
-            display.destroy()
-        self.channel_displays.clear()
-        
-        rows = (self.out_channels + 3) // 4
-        for i in range(self.out_channels):
-            # Pass None instead of click handler to disable clicking
-            display = ChannelDisplay(self.channels_container, i + 1, on_click=None)
-            display.grid(row=i // 4, column=i % 4, padx=15, pady=15, sticky="nsew")
-            # Initialize with IDLE status
-            display.update_data(-9999.98, "IDLE")
-            self.channel_displays.append(display)
-        
-        for i in range(rows):
-            self.channels_container.grid_rowconfigure(i, weight=1, minsize=180)
-        for i in range(4):
-            self.channels_container.grid_columnconfigure(i, weight=1)
+        """Follow a channel-count change; the grid reuses its existing cells"""
+        if self.channel_grid:
+            self.channel_grid.set_channel_count(self.out_channels)
+        self.refresh_statistics()
+
+    def set_grid_layout(self, value):
+        self.channel_grid.set_layout(value)
+
+    def set_grid_sort(self, value):
+        self.channel_grid.set_sort(value)
+
+    def set_grid_filter(self, value):
+        self.channel_grid.set_filter(value)
+
+    def set_stats_window(self, value):
+        """Select which statistics window the channel cards show"""
+        self.stats_window = None if value == "Session" else value
+        self.refresh_statistics()
+
+    def refresh_statistics(self):
+        """Push statistics snapshots to the channel cards once per second"""
+        if self.stats_after_id:
+            self.after_cancel(self.stats_after_id)
+            self.stats_after_id = None
+        if self.current_view != 'grid':
+            return
+        # All channels, not just the visible cards: sorting by deviation needs every mean
+        stats = {}
+        for channel_num in range(1, self.out_channels + 1):
+            try:
+                stats[channel_num] = (self.statistics.snapshot(channel_num, self.stats_window),
+                                      self.statistics.judge_counters(channel_num))
+            except Exception as e:
+                print(f"Error updating statistics: {e}")
+        self.channel_grid.update_stats(stats)
+        self.stats_after_id = self.after(1000, self.watchdog.wrap('statistics', self.refresh_statistics))
 
     def show_multi_channel_graph(self):
         """Switch to multi-channel graph view"""
         print("Switching to multi-channel graph view")
-        
-        # Clear existing content
-        for widget in self.right_frame.winfo_children():
-            widget.destroy()
-            
-        try:
-            # Create multi-channel graph widget directly in right_frame (no dark background)
-            self.current_graph_widget = MultiChannelGraphWidget(
-                self.right_frame, 
-                self.out_channels, 
-                self.graph_data_manager, 
-                self,
-                live_data_manager=self.live_data_manager
-            )
-            
+        graph = self._show_view('graph', self._create_graph_view)
+        if graph is not None:
             # Set start time if logging is active
-            if hasattr(self, 'logging_start_time') and self.logging_start_time:
-                self.current_graph_widget.set_start_time(self.logging_start_time)
-            
-            self.current_graph_widget.pack(fill="both", expand=True)
-            
-            # Ensure the widget is properly initialized before updating
-            self.current_graph_widget.update_idletasks()
-            
-            # Initial graph update
-            if hasattr(self.current_graph_widget, 'update_graph'):
-                self.current_graph_widget.update_graph()
-            
-            # Set viewing_graph flag only after successful initialization
-            self.viewing_graph = True
-            
+            if self.logging_start_time:
+                graph.set_start_time(self.logging_start_time)
             print("Multi-channel graph view active")
-            
-        except Exception as e:
-            print(f"Error creating graph widget: {e}")
-            import traceback
-            traceback.print_exc()
-            # Fallback: show error message and stay in grid view
-            error_label = ctk.CTkLabel(self.right_frame, text=f"Error loading graph: {str(e)}", 
-                                     text_color=COLORS['danger'])
-            error_label.pack(expand=True)
-            self.viewing_graph = False
-            self.current_graph_widget = None
+
+    def _create_graph_view(self):
+        from graph_widget import MultiChannelGraphWidget
+        start = time.perf_counter()
+        # Create multi-channel graph widget directly in right_frame (no dark background)
+        self.current_graph_widget = MultiChannelGraphWidget(
+            self.right_frame, 
+            self.out_channels, 
+            self.graph_data_manager, 
+            self,
+            live_data_manager=self.live_data_manager,
+            governor=self.frame_governor
+        )
+        if STARTUP_REPORT:
+            print(f"Graph view built in {1000 * (time.perf_counter() - start):.0f} ms (including matplotlib import)")
+        return self.current_graph_widget
         
     def show_channel_grid(self):
         """Switch back to channel grid view"""
         print("Switching back to grid view")
-        self.viewing_graph = False
-        self.current_graph_widget = None
-        self.setup_channel_grid()
+        self._show_view('grid', self.setup_channel_grid)
 
     def show_zeroing_page(self):
         """Switch to zeroing page view"""
         print("Switching to zeroing page")
-
-        # Clear right side
-        for widget in self.right_frame.winfo_children():
-            widget.destroy()
-
-        try:
-            # Create and pack zeroing page - pass the existing logger instance and channel count
-            from config import DEVICE_ID
-            zero_page = ZeroingPage(self.right_frame, DEVICE_ID, go_back_callback=self.show_channel_grid, 
-                                   logger=self.logger, num_channels=self.out_channels)
-            zero_page.pack(fill="both", expand=True)
-            print("Zeroing page created and packed successfully")
-        except Exception as e:
-            print(f"Error creating zeroing page: {e}")
-            # Fallback: show error message
-            error_label = ctk.CTkLabel(self.right_frame, text=f"Error loading zeroing page: {str(e)}", 
-                                     text_color=COLORS['danger'])
-            error_label.pack(expand=True)
+        self._show_view('zeroing', self._create_zeroing_page)
+
+    def _create_zeroing_page(self):
+        # Pass the existing logger instance and channel count
+        from config import DEVICE_ID
+        from zeroing_page import ZeroingPage
+        worker = self.acquisition.zeroing_worker() if ACQUISITION_PROCESS else None
+        zero_page = ZeroingPage(self.right_frame, DEVICE_ID, go_back_callback=self.show_channel_grid, 
+                               logger=self.logger, num_channels=self.out_channels,
+                               pipeline=self.acquisition, worker=worker)
+        print("Zeroing page created successfully")
+        return zero_page
+
+    def show_history_view(self):
+        """Switch to the log browser for finished sessions"""
+        print("Switching to session history")
+        self._show_view('history', self._create_history_view)
+
+    def _create_history_view(self):
+        from history_view import LogBrowserView
+        return LogBrowserView(self.right_frame, go_back_callback=self.show_channel_grid)
+
+    def show_diagnostics_view(self):
+        """Switch to the event-loop latency and slow-callback panel"""
+        print("Switching to UI diagnostics")
+        self._show_view('diagnostics', self._create_diagnostics_view)
+
+    def _create_diagnostics_view(self):
+        from diagnostics_view import DiagnosticsView
+        return DiagnosticsView(self.right_frame, self.watchdog, governor=self.frame_governor,
+                               go_back_callback=self.show_channel_grid)
 
     def update_channel_count(self, value):
         self.out_channels = int(value)
@@ -298,11 +480,13 @@ class CL3000App(ctk.CTk):
         # Update live data manager
         self.live_data_manager.update_channel_count(self.out_channels)
         
-        if not self.viewing_graph:
+        # Cached views are kept in step even while hidden
+        if 'grid' in self.views:
             self.update_channel_displays()
-        elif self.current_graph_widget:
-            # Update the graph widget with new channel count
+        if self.current_graph_widget:
             self.current_graph_widget.update_channel_count(self.out_channels)
+        if 'zeroing' in self.views:
+            self.views['zeroing'].update_channel_count(self.out_channels)
         
         # Initialize graph data for all channels
         for i in range(1, self.out_channels + 1):
@@ -312,37 +496,53 @@ class CL3000App(ctk.CTk):
         self.logger.out_channels = self.out_channels
 
     def _on_live_data_update(self, data):
-        """Callback for live data updates"""
-        # Update channel displays if in grid view
-        if not self.viewing_graph and hasattr(self, 'channel_displays'):
-            for i, display in enumerate(self.channel_displays):
-                if i < len(self.channel_displays):
-                    channel_num = i + 1
-                    if channel_num in data:
-                        value = data[channel_num]['value']
-                        judge = data[channel_num]['judge']
-                        display.update_data(value, judge)
-                    else:
-                        # Show IDLE when no data available (disconnected)
-                        display.update_data(-9999.98, "IDLE")
-        
-        # Update multi-channel graph if viewing it
-        elif self.viewing_graph and self.current_graph_widget:
-            try:
-                self.current_graph_widget.update_graph()
-            except Exception as e:
-                print(f"Error updating graph: {e}")
+        """Callback for live data updates (acquisition thread): record and mark the view dirty"""
+        for channel_num in range(1, self.out_channels + 1):
+            if channel_num in data:
+                self._grid_values[channel_num] = (data[channel_num]['value'], data[channel_num]['judge'])
+            else:
+                # Show IDLE when no data available (disconnected)
+                self._grid_values[channel_num] = (-9999.98, "IDLE")
+        self._mark_view_dirty()
+
+    def _mark_view_dirty(self):
+        # Hidden views are paused in the governor, which only records the data rate
+        self.frame_governor.mark_dirty('grid')
+        self.frame_governor.mark_dirty('graph')
+
+    def _refresh_channel_grid(self):
+        """Governor view: push the newest values to the channel cards"""
+        # Cards skip unchanged text/colors, so the cost follows real changes, not the tick rate
+        self.channel_grid.update_values(dict(self._grid_values))
+
+    def _refresh_log_status(self):
+        """Governor view: sample counter and runtime cards"""
+        status = self._log_status
+        if status is not None:
+            samples, runtime = status
+            self.samples_card.update_value(f"{samples:,}")
+            self.runtime_card.update_value(self.format_runtime(runtime))
 
     def _on_connection_change(self, connected):
-        """Callback for connection status changes"""
+        """Pipeline callback (device core thread): card updates are handed to the Tk thread"""
+        self.after(0, self._show_connection, connected)
+        if connected:
+            if not self._connected_once:
+                self._connected_once = True
+                startup.mark("device connected")
+                if STARTUP_REPORT:
+                    print(f"Startup: device connected after {startup.elapsed_ms():.0f} ms")
+        else:
+            # Set all channel displays to IDLE when disconnected (drawn with the next grid refresh)
+            for channel_num in range(1, self.out_channels + 1):
+                self._grid_values[channel_num] = (-9999.98, "IDLE")
+            self._mark_view_dirty()
+
+    def _show_connection(self, connected):
         if connected:
             self.connection_card.update_value("🟢 Connected", COLORS['success'])
         else:
             self.connection_card.update_value("🔴 Disconnected", COLORS['danger'])
-            # Set all channel displays to IDLE when disconnected
-            if hasattr(self, 'channel_displays'):
-                for display in self.channel_displays:
-                    display.update_data(-9999.98, "IDLE")
 
     def set_status(self, msg, color=COLORS['text']):
         self.status_card.update_value(msg, color)
@@ -357,47 +557,18 @@ class CL3000App(ctk.CTk):
         secs = int(seconds % 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
-    def update_display(self, row, timestamp, samples, runtime):
-        print(f"Update display called - viewing_graph: {self.viewing_graph}")
-        
-        self.samples_card.update_value(f"{samples:,}")
-        self.runtime_card.update_value(self.format_runtime(runtime))
-        
-        # Always store data for graphs first
-        for i in range(self.out_channels):
-            channel_num = i + 1
-            value = row[1 + i * 2]
-            judge = row[2 + i * 2]
-            
-            # Add data to graph manager
-            self.graph_data_manager.add_data_point(channel_num, timestamp, value, judge)
-        
-        # Update channel displays if in grid view
-        if not self.viewing_graph and hasattr(self, 'channel_displays'):
-            print("Updating channel displays")
-            for i, display in enumerate(self.channel_displays):
-                if i < len(self.channel_displays):
-                    value = row[1 + i * 2]
-                    judge = row[2 + i * 2]
-                    display.update_data(value, judge)
-        
-        # Update multi-channel graph if viewing it
-        elif self.viewing_graph and self.current_graph_widget:
-            print("Updating multi-channel graph")
-            try:
-                # Check if the graph widget is properly initialized and ready
-                if hasattr(self.current_graph_widget, 'update_graph') and callable(self.current_graph_widget.update_graph):
-                    # Add a small delay to prevent overwhelming the graph with very fast updates
-                    # This is especially important for sample rates under 0.5 seconds
-                    # Use a longer delay for very fast sample rates to prevent conflicts
-                    delay = 50 if hasattr(self, 'logger') and hasattr(self.logger, 'log_interval') and self.logger.log_interval < 0.5 else 10
-                    self.after(delay, self.current_graph_widget.update_graph)
-                else:
-                    print("Warning: Graph widget not properly initialized")
-            except Exception as e:
-                print(f"Error updating graph: {e}")
-                import traceback
-                traceback.print_exc()
+    def update_display(self, row, t_ns, samples, runtime):
+        """Logger callback (acquisition thread): record the counters, and the row when one was logged"""
+        self._log_status = (samples, runtime)
+        self.frame_governor.mark_dirty('status')
+        if row is None:
+            return  # Between logged rows the live view owns the channel cards
+
+        # Graph data is stored by the logger's graph sink for every logged sample,
+        # so the graph view only needs a refresh here
+        for i in range(min(self.out_channels, (len(row) - 1) // 2)):
+            self._grid_values[i + 1] = (row[1 + i * 2], row[2 + i * 2])
+        self._mark_view_dirty()
 
     def start_logging(self):
         try:
@@ -408,21 +579,48 @@ class CL3000App(ctk.CTk):
             self.set_status("❌ Invalid Input", COLORS['danger'])
             return
 
-        if self.logger.connect() != 0:
+        # Connecting can take seconds, so it runs on a device I/O worker
+        self.set_status("🔌 Connecting…", COLORS['warning'])
+        self.start_button.configure(state="disabled")
+        self._connect_future = self.acquisition.core.submit_blocking(self.logger.connect,
+                                                                    timeout=DEVICE_CONNECT_DEADLINE)
+        self.after(50, self._finish_start_logging, interval, duration)
+
+    def _finish_start_logging(self, interval, duration):
+        """Poll for the background connect, then start the session on the Tk thread"""
+        if not self._connect_future.done():
+            self.after(50, self._finish_start_logging, interval, duration)
+            return
+        try:
+            result = self._connect_future.result()
+        except Exception as e:
+            print(f"Error connecting: {e or 'no answer from the device'}")
+            result = -1
+        if result != 0:
             self.set_status("❌ Connection Failed", COLORS['danger'])
+            self.enable_start_button()
             return
 
-        # Clear existing graph data
+        # Clear existing graph data and start a new statistics session
         self.graph_data_manager.clear_all()
+        self.statistics.reset()
         
-        # Clear graph if viewing it
-        if self.viewing_graph and self.current_graph_widget:
+        # Clear the graph, which is kept even while hidden
+        if self.current_graph_widget:
             self.current_graph_widget.clear_graph()
         
-        # Record logging start time
-        self.logging_start_time = datetime.now()
+        # Record logging start time (monotonic ns, same clock as the samples)
+        self.logging_start_time = time.monotonic_ns()
         
-        filename = self.logger.start(interval, duration)
+        try:
+            filename = self.logger.start(interval, duration)
+        except Exception as e:
+            # The device refused, the CSV could not be opened, or the service is restarting
+            print(f"Error starting logging: {e}")
+            self.logging_start_time = None
+            self.set_status("❌ Logging Failed", COLORS['danger'])
+            self.enable_start_button()
+            return
         self.current_filename = filename
         
         self.set_status("🟢 Logging Active", COLORS['success'])
@@ -431,6 +629,7 @@ class CL3000App(ctk.CTk):
 
     def stop_logging(self):
         self.logger.stop()
+        self._log_status = None
         self.samples_card.update_value("0")
         self.runtime_card.update_value("00:00:00")
         
@@ -442,13 +641,45 @@ class CL3000App(ctk.CTk):
         self.enable_start_button()
 
     def _on_logging_stop(self):
+        """Logger callback; a session that ends on its own reports from the device core thread"""
+        self.after(0, self._show_logging_stopped)
+
+    def _show_logging_stopped(self):
         self.set_status("🟡 Logging Stopped", COLORS['warning'])
         self.enable_start_button()
+
+    def _on_logging_resumed(self, filename, start_t_ns):
+        """RemoteLogger callback (reader task on the device core): the service was already logging when we attached"""
+        self.after(0, self._show_resumed_session, filename, start_t_ns)
+
+    def _show_resumed_session(self, filename, start_t_ns):
+        self.current_filename = filename
+        self.logging_start_time = start_t_ns or time.monotonic_ns()
+        self.set_status("🟢 Logging Active", COLORS['success'])
+        self.start_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
     
     def on_closing(self):
         """Handle application closing"""
         # Stop live data reading
+        if self.stats_after_id:
+            self.after_cancel(self.stats_after_id)
+            self.stats_after_id = None
+        self.frame_governor.stop()
+        self.watchdog.stop()
+        if self.stream_server:
+            self.stream_server.stop()
+        if not ACQUISITION_PROCESS and self.logger.running:
+            # Rows are flushed periodically, so close the log before the device core goes away
+            self.logger.stop()
         self.live_data_manager.stop_live_reading()
+        # The app owns the shared pipeline (for the service: only detaches from it)
+        self.acquisition.stop()
+        if ACQUISITION_PROCESS:
+            if self.logger.running:
+                print("Acquisition service keeps logging; start the GUI again to reattach")
+            else:
+                self.acquisition.shutdown_service()
         
         # Close the application
         self.quit()
\ No newline at end of file
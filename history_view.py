@@ -0,0 +1,285 @@
+import os
+import threading
+from tkinter import filedialog
+import customtkinter as ctk
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from config import COLORS, CHANNEL_COLORS
+from log_browser import LogIndex
+
+
+class LogBrowserView(ctk.CTkFrame):
+    """Browse a finished session from output_files/
+
+    The log is indexed once (row offsets + LOD sidecar) on a background
+    thread; afterwards every zoom or pan only loads the LOD buckets or raw
+    rows needed for the visible time range.
+    """
+
+    def __init__(self, parent, go_back_callback=None):
+        super().__init__(parent, corner_radius=15, fg_color=COLORS['card'])
+        self.go_back_callback = go_back_callback
+        self.index = None
+        self._loading = False
+        self._progress = 0.0
+        self._load_result = None
+        self._loading_index = None  # The index being built, for previews
+        self._preview_polls = 0
+        self._poll_id = None
+        self._query_id = None
+        self._setting_limits = False
+
+        # Pan state
+        self.is_panning = False
+        self.pan_start_x = None
+        self.pan_start_xlim = None
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(15, 10))
+
+        self.back_button = ctk.CTkButton(header_frame, text="← Back to Grid",
+                                         command=self.go_back,
+                                         height=35, width=120,
+                                         font=ctk.CTkFont(size=13, weight="bold"),
+                                         fg_color=COLORS['secondary'],
+                                         hover_color=COLORS['primary'])
+        self.back_button.pack(side="left")
+
+        self.title_label = ctk.CTkLabel(header_frame, text="Session History",
+                                        font=ctk.CTkFont(size=18, weight="bold"),
+                                        text_color=COLORS['primary'])
+        self.title_label.pack(side="left", padx=(20, 0))
+
+        self.open_button = ctk.CTkButton(header_frame, text="📂 Open Log…",
+                                         command=self.choose_file,
+                                         height=35, width=120,
+                                         font=ctk.CTkFont(size=13, weight="bold"),
+                                         fg_color=COLORS['primary'],
+                                         hover_color=COLORS['success'])
+        self.open_button.pack(side="right")
+
+        self.reset_button = ctk.CTkButton(header_frame, text="🎯 Full Session",
+                                          command=self.show_full_range,
+                                          height=35, width=120,
+                                          font=ctk.CTkFont(size=13, weight="bold"),
+                                          fg_color=COLORS['info'],
+                                          hover_color=COLORS['primary'])
+        self.reset_button.pack(side="right", padx=(0, 10))
+
+        self.status_label = ctk.CTkLabel(self, text="Open a log file from output_files/",
+                                         text_color=COLORS['text'])
+        self.status_label.pack(pady=(0, 5))
+
+        self.figure = Figure(figsize=(12, 6), dpi=100, facecolor='#2D2D2D')
+        self.ax = self.figure.add_subplot(111, facecolor='#1A1A1A')
+        self.ax.set_xlabel('Time (s)', color=COLORS['text'], fontsize=12)
+        self.ax.set_ylabel('Thickness (μm)', color=COLORS['text'], fontsize=12)
+        self.ax.tick_params(colors=COLORS['text'])
+        self.ax.grid(True, alpha=0.3, color='gray')
+        for spine in self.ax.spines.values():
+            spine.set_color(COLORS['text'])
+        self.lines = {}
+
+        self.canvas = FigureCanvasTkAgg(self.figure, self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('button_press_event', self.on_button_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_mouse_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_button_release)
+        self.canvas.draw()
+
+    def go_back(self):
+        if self.go_back_callback:
+            self.go_back_callback()
+
+    def pause(self):
+        """Drop a pending range query while the view is hidden (indexing keeps running)"""
+        if self._query_id:
+            self.after_cancel(self._query_id)
+            self._query_id = None
+
+    def resume(self):
+        if self.index:
+            self.refresh()
+
+    def destroy(self):
+        for after_id in (self._poll_id, self._query_id):
+            if after_id:
+                self.after_cancel(after_id)
+        if self.index and not self._loading:
+            self.index.close()
+        super().destroy()
+
+    def choose_file(self):
+        if self._loading:
+            return
+        path = filedialog.askopenfilename(
+            title="Open CL-3000 log",
+            initialdir=os.path.join(os.getcwd(), "output_files"),
+            filetypes=[("CSV logs", "*.csv"), ("All files", "*.*")])
+        if path:
+            self.open_file(path)
+
+    def open_file(self, path):
+        """Index (or load the cached index of) a log on a worker thread"""
+        if self.index:
+            self.index.close()
+            self.index = None
+        self._loading = True
+        self._progress = 0.0
+        self._load_result = None
+        self._loading_index = LogIndex(path)
+        self._preview_polls = 0
+        for line in self.lines.values():
+            line.set_data([], [])
+        self.open_button.configure(state="disabled")
+        self.title_label.configure(text=os.path.basename(path))
+        threading.Thread(target=self._load_worker, args=(self._loading_index,), daemon=True).start()
+        self._poll_id = self.after(100, self._poll_loading)
+
+    def _load_worker(self, index):
+        try:
+            index.open(progress=self._set_progress)
+            self._load_result = (index, None)
+        except Exception as e:
+            index.close()
+            self._load_result = (None, e)
+
+    def _set_progress(self, fraction):
+        self._progress = fraction
+
+    def _poll_loading(self):
+        self._poll_id = None
+        if self._load_result is None:
+            index = self._loading_index
+            self.status_label.configure(text=f"Indexing… {self._progress * 100:.0f}% "
+                                             f"({index.rows_indexed:,} rows so far)")
+            # A first indexing pass over a large log takes a while: show what is indexed so far
+            self._preview_polls += 1
+            if self._preview_polls % 10 == 0 and self.winfo_ismapped():
+                self._show_preview(index)
+            self._poll_id = self.after(100, self._poll_loading)
+            return
+        index, error = self._load_result
+        self._loading_index = None
+        self._loading = False
+        self.open_button.configure(state="normal")
+        if error:
+            print(f"Error opening log: {error}")
+            self.status_label.configure(text=f"❌ Could not open log: {error}", text_color=COLORS['danger'])
+            return
+        self.index = index
+        self.status_label.configure(text=f"{index.rows:,} rows, {index.num_channels} channels, "
+                                         f"{index.duration / 3600:.2f} h", text_color=COLORS['text'])
+        self._create_lines(index.num_channels)
+        self.show_full_range()
+
+    def _show_preview(self, index):
+        try:
+            data = index.preview(self.ax.bbox.width)
+        except Exception as e:
+            print(f"Error previewing log: {e}")
+            return
+        if not data:
+            return
+        if len(self.lines) != len(data):
+            self._create_lines(len(data))
+        x_max = max((x[-1] for x, y in data.values() if len(x)), default=0.0)
+        self._setting_limits = True
+        self.ax.set_xlim(0, max(x_max, 1.0))
+        self._setting_limits = False
+        self._draw(data, autoscale_y=True)
+        self.ax.set_title("indexing…", color=COLORS['text'], fontsize=9, loc='left')
+
+    def _create_lines(self, num_channels):
+        for line in self.lines.values():
+            line.remove()
+        self.lines = {}
+        for ch in range(1, num_channels + 1):
+            color = CHANNEL_COLORS[(ch - 1) % len(CHANNEL_COLORS)]
+            self.lines[ch], = self.ax.plot([], [], color=color, linewidth=1.5,
+                                           label=f'OUT{ch:02d}', alpha=0.8)
+        self.ax.legend(loc='upper right', facecolor='#2D2D2D', edgecolor=COLORS['text'], framealpha=0.9)
+
+    def show_full_range(self):
+        if not self.index:
+            return
+        self.ax.set_xlim(0, max(self.index.duration, 1.0))
+        self.refresh(autoscale_y=True)
+
+    def _on_xlim_changed(self, ax):
+        # Coalesce bursts of limit changes (wheel zoom, drag) into one query
+        if self._setting_limits or not self.index:
+            return
+        if self._query_id:
+            self.after_cancel(self._query_id)
+        self._query_id = self.after(50, self.refresh)
+
+    def refresh(self, autoscale_y=False):
+        """Load the data for the visible range at the axes' pixel width and redraw"""
+        self._query_id = None
+        if not self.index:
+            return
+        t0, t1 = self.ax.get_xlim()
+        try:
+            data, level = self.index.query(t0, t1, self.ax.bbox.width)
+        except Exception as e:
+            print(f"Error querying log: {e}")
+            return
+        self._draw(data, autoscale_y)
+        detail = "raw rows" if level is None else f"LOD level {level}"
+        self.ax.set_title(detail, color=COLORS['text'], fontsize=9, loc='left')
+
+    def _draw(self, data, autoscale_y=False):
+        y_values = []
+        for ch, line in self.lines.items():
+            x, y = data.get(ch, (np.empty(0), np.empty(0)))
+            line.set_data(x, y)
+            if len(y):
+                y_values.append((y.min(), y.max()))
+        if autoscale_y and y_values:
+            y_min = min(v[0] for v in y_values)
+            y_max = max(v[1] for v in y_values)
+            padding = max((y_max - y_min) * 0.05, 0.5)
+            self._setting_limits = True
+            self.ax.set_ylim(y_min - padding, y_max + padding)
+            self._setting_limits = False
+        self.canvas.draw_idle()
+
+    def on_scroll(self, event):
+        """Zoom the time axis around the cursor"""
+        if event.inaxes != self.ax or event.xdata is None or not self.index:
+            return
+        factor = 1 / 1.25 if event.step > 0 else 1.25
+        x_min, x_max = self.ax.get_xlim()
+        new_min = event.xdata - (event.xdata - x_min) * factor
+        new_max = event.xdata + (x_max - event.xdata) * factor
+        self.ax.set_xlim(max(0, new_min), new_max)
+
+    def on_button_press(self, event):
+        if event.inaxes != self.ax or event.button != 1 or event.xdata is None:
+            return
+        self.is_panning = True
+        self.pan_start_x = event.x
+        self.pan_start_xlim = self.ax.get_xlim()
+        self.canvas.get_tk_widget().configure(cursor="fleur")
+
+    def on_mouse_motion(self, event):
+        if not self.is_panning or self.pan_start_xlim is None:
+            return
+        # Pixel delta, so the pan stays smooth while the axes move under the cursor
+        x_min, x_max = self.pan_start_xlim
+        dx = (self.pan_start_x - event.x) * (x_max - x_min) / self.ax.bbox.width
+        self.ax.set_xlim(x_min + dx, x_max + dx)
+        self.canvas.draw_idle()
+
+    def on_button_release(self, event):
+        self.is_panning = False
+        self.pan_start_x = None
+        self.pan_start_xlim = None
+        self.canvas.get_tk_widget().configure(cursor="")
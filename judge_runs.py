@@ -0,0 +1,115 @@
+from array import array
+from acquisition import JUDGE_NAMES, JUDGE_CODES
+
+# Judges that count as an out-of-tolerance excursion
+EXCURSION_CODES = (JUDGE_CODES['HI'], JUDGE_CODES['LO'])
+
+
+class JudgeRuns:
+    """Run-length encoded judge history with live HI/GO/LO counters
+
+    Runs are stored as uint8 codes plus the absolute sample index where each
+    run starts. With `maxlen` set the history follows a ring buffer of that many
+    samples (like the SampleRings in GraphDataManager); the counters always cover
+    everything appended since the last clear().
+    """
+
+    def __init__(self, maxlen=None):
+        self.maxlen = maxlen
+        self.codes = array('B')
+        self.starts = array('q')
+        self._head = 0  # First run still inside the ring window
+        self.total = 0  # Samples appended since clear()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.time_in_state = [0.0] * len(JUDGE_NAMES)
+        self.excursions = 0
+        self.longest_excursion = 0.0
+        self._last_t = None
+        self._run_start_t = None
+
+    def clear(self):
+        self.codes = array('B')
+        self.starts = array('q')
+        self._head = 0
+        self.total = 0
+        self._reset_counters()
+
+    def __len__(self):
+        """Number of samples currently covered (bounded by maxlen)"""
+        if self.maxlen:
+            return min(self.total, self.maxlen)
+        return self.total
+
+    @property
+    def first_index(self):
+        """Absolute index of the oldest sample still in the window"""
+        return self.total - len(self)
+
+    def append(self, judge, t=None):
+        """Add one judge (string or code); `t` in seconds drives the time counters"""
+        code = judge if isinstance(judge, int) else JUDGE_CODES.get(judge, 0)
+        prev_code = self.codes[-1] if len(self.codes) > self._head else None
+
+        # The previous state lasted until this sample
+        if t is not None and self._last_t is not None and prev_code is not None:
+            self.time_in_state[prev_code] += t - self._last_t
+        self._last_t = t
+
+        if code != prev_code:
+            if prev_code in EXCURSION_CODES and t is not None and self._run_start_t is not None:
+                self.longest_excursion = max(self.longest_excursion, t - self._run_start_t)
+            self.codes.append(code)
+            self.starts.append(self.total)
+            self._run_start_t = t
+            if code in EXCURSION_CODES:
+                self.excursions += 1
+
+        self.total += 1
+        if self.maxlen:
+            self._evict(self.total - self.maxlen)
+
+    def _evict(self, oldest):
+        """Drop runs that ended before the oldest retained sample"""
+        while self._head + 1 < len(self.codes) and self.starts[self._head + 1] <= oldest:
+            self._head += 1
+        # Compact occasionally so eviction stays amortized O(1)
+        if self._head > 64 and self._head * 2 > len(self.codes):
+            del self.codes[:self._head]
+            del self.starts[:self._head]
+            self._head = 0
+
+    def runs(self):
+        """List of (start, end, code) with indexes relative to the oldest retained sample"""
+        first = self.first_index
+        result = []
+        count = len(self.codes)
+        for i in range(self._head, count):
+            start = max(self.starts[i], first) - first
+            end = (self.starts[i + 1] if i + 1 < count else self.total) - first
+            result.append((start, end, self.codes[i]))
+        return result
+
+    def to_list(self):
+        """Expand back to one judge string per sample (compatibility path)"""
+        judges = []
+        for start, end, code in self.runs():
+            judges.extend([JUDGE_NAMES[code]] * (end - start))
+        return judges
+
+    def counters(self, now=None):
+        """Time per state, excursion count and longest excursion (including one in progress)"""
+        longest = self.longest_excursion
+        current = self.codes[-1] if len(self.codes) > self._head else None
+        time_in_state = list(self.time_in_state)
+        if now is not None and self._last_t is not None and current is not None:
+            time_in_state[current] += max(0.0, now - self._last_t)
+            if current in EXCURSION_CODES and self._run_start_t is not None:
+                longest = max(longest, now - self._run_start_t)
+        return {
+            'time_in_state': {JUDGE_NAMES[code]: seconds for code, seconds in enumerate(time_in_state)},
+            'excursions': self.excursions,
+            'longest_excursion': longest,
+            'current': JUDGE_NAMES[current] if current is not None else None
+        }
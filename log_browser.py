@@ -0,0 +1,338 @@
+import io
+import json
+import mmap
+import os
+import numpy as np
+from acquisition import INVALID_VALUE
+from decimation import m4_decimate
+
+# Rows summarized by one bucket of the finest LOD level, and buckets merged per coarser level
+LOD_BASE_ROWS = 256
+LOD_FACTOR = 8
+
+# Coarsest level is kept at no fewer buckets than this
+LOD_MIN_BUCKETS = 1024
+
+# Views spanning at most this many rows are read from the CSV itself
+RAW_ROW_LIMIT = 50000
+
+# Bytes scanned per step while indexing
+CHUNK_BYTES = 32 * 1024 * 1024
+
+# Rows around a damaged line that are parsed field by field instead of in bulk
+DAMAGED_BLOCK_ROWS = 64
+
+SIDECAR_VERSION = 1
+
+
+def _parse_lines(lines, num_channels):
+    """Parse CSV data lines (bytes) into (t_ms int64, values float64 [rows, channels])
+
+    Rows as the logger writes them are parsed in bulk by np.loadtxt. A block
+    with a damaged row is split in halves until the damage is confined to a
+    few rows, which are parsed field by field. Invalid readings
+    (INVALID_VALUE, NaN, unparsable fields) become NaN.
+    """
+    if not lines:
+        return np.empty(0, dtype=np.int64), np.empty((0, num_channels))
+    row_dtype = np.dtype([('t', 'datetime64[ms]'), ('v', np.float64, (num_channels,))])
+    text = b'\n'.join(lines).decode('utf-8', 'replace')
+    try:
+        rows = np.loadtxt(io.StringIO(text), delimiter=',', dtype=row_dtype, ndmin=1,
+                          usecols=[0] + list(range(1, 2 * num_channels, 2)))
+    except ValueError:
+        if len(lines) <= DAMAGED_BLOCK_ROWS:
+            return _parse_fields(lines, num_channels)
+        half = len(lines) // 2
+        head, tail = _parse_lines(lines[:half], num_channels), _parse_lines(lines[half:], num_channels)
+        return np.concatenate((head[0], tail[0])), np.concatenate((head[1], tail[1]))
+    values = rows['v'].reshape(len(rows), num_channels)
+    values[values == INVALID_VALUE] = np.nan
+    return rows['t'].astype(np.int64), values
+
+
+def _parse_fields(lines, num_channels):
+    """_parse_lines one field at a time, tolerating damaged rows"""
+    stamps = []
+    values = np.full((len(lines), num_channels), np.nan)
+    for row, line in enumerate(lines):
+        fields = line.rstrip(b'\r').split(b',')
+        stamps.append(fields[0].decode('ascii', 'replace'))
+        for ch, field in enumerate(fields[1:2 * num_channels + 1:2]):
+            try:
+                values[row, ch] = float(field)
+            except ValueError:
+                pass
+    values[values == INVALID_VALUE] = np.nan
+    try:
+        t_ms = np.array(stamps, dtype='datetime64[ms]').astype(np.int64)
+    except ValueError:
+        # A damaged timestamp: parse one by one and carry the previous time forward
+        t_ms = np.empty(len(stamps), dtype=np.int64)
+        last = 0
+        for i, stamp in enumerate(stamps):
+            try:
+                last = np.datetime64(stamp, 'ms').astype(np.int64)
+            except ValueError:
+                pass
+            t_ms[i] = last
+    return t_ms, values
+
+
+class LogIndex:
+    """Row offsets and a min/max level-of-detail pyramid for one log CSV
+
+    Built once by scanning the file in chunks, then stored next to it in a
+    `<file>.lod` sidecar directory and memory-mapped on later opens. Queries
+    only touch the rows or LOD buckets needed for the requested time range.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sidecar = path + '.lod'
+        self.header = []
+        self.num_channels = 0
+        self.rows = 0
+        self.start_ms = 0
+        self.end_ms = 0
+        self.offsets = None  # Byte offset of every data row, plus end of data
+        self.levels = []  # [(t_ms, vmin, vmax)] from finest to coarsest
+        self.rows_indexed = 0  # Progress of a running build()
+        self._partial = None  # Finest-level bucket lists while build() runs, for preview()
+        self._file = None
+        self._mm = None
+
+    def open(self, progress=None):
+        """Load the sidecar or build it; `progress(fraction)` is called while scanning"""
+        self._file = open(self.path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            raise ValueError("Log file is empty")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if not self._load_sidecar():
+            self.build(progress)
+        if self.rows:
+            self.start_ms = int(self.levels[0][0][0])
+        return self
+
+    def close(self):
+        self.offsets = None
+        self.levels = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _source_signature(self):
+        stat = os.stat(self.path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _load_sidecar(self):
+        meta_path = os.path.join(self.sidecar, 'meta.json')
+        if not os.path.exists(meta_path):
+            return False
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != SIDECAR_VERSION or meta.get('source') != self._source_signature():
+                print(f"LogIndex: Sidecar for {os.path.basename(self.path)} is stale, rebuilding")
+                return False
+            self.header = meta['header']
+            self.num_channels = meta['channels']
+            self.rows = meta['rows']
+            self.end_ms = meta['end_ms']
+            self.offsets = np.memmap(os.path.join(self.sidecar, 'offsets.i64'), dtype=np.int64, mode='r')
+            self.levels = []
+            for k in range(meta['levels']):
+                self.levels.append(tuple(np.load(os.path.join(self.sidecar, f'level{k}_{name}.npy'), mmap_mode='r')
+                                         for name in ('t', 'min', 'max')))
+            return True
+        except Exception as e:
+            print(f"LogIndex: Could not load sidecar ({e}), rebuilding")
+            return False
+
+    def build(self, progress=None):
+        """Scan the CSV once: row offsets, finest LOD level, then the coarser levels"""
+        mm = self._mm
+        size = len(mm)
+        header_end = mm.find(b'\n')
+        if header_end < 0:
+            raise ValueError("Log file has no data rows")
+        self.header = mm[:header_end].decode('utf-8', 'replace').rstrip('\r').split(',')
+        self.num_channels = sum(1 for name in self.header if name.startswith('Judge'))
+        if self.num_channels == 0:
+            raise ValueError("Not a CL-3000 log (no Judge columns)")
+
+        os.makedirs(self.sidecar, exist_ok=True)
+        offsets_path = os.path.join(self.sidecar, 'offsets.i64')
+        bucket_t, bucket_min, bucket_max = [], [], []
+        self._partial = (bucket_t, bucket_min, bucket_max)
+        pending_t = np.empty(0, dtype=np.int64)
+        pending_v = np.empty((0, self.num_channels))
+        rows = 0
+        pos = header_end + 1
+
+        with open(offsets_path, 'wb') as offsets_file:
+            while pos < size:
+                end = min(size, pos + CHUNK_BYTES)
+                if end < size:
+                    end = mm.rfind(b'\n', pos, end) + 1
+                    if end <= pos:  # A single line longer than a chunk
+                        end = mm.find(b'\n', pos) + 1 or size
+                chunk = mm[pos:end]
+
+                # Row starts: the chunk start and every byte after a newline
+                newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+                starts = np.concatenate(([0], newlines + 1))
+                starts = starts[starts < len(chunk)]
+                lines = chunk.split(b'\n')
+                keep = [i for i, line in enumerate(lines[:len(starts)]) if line.strip()]
+                (starts[keep] + pos).astype(np.int64).tofile(offsets_file)
+
+                t_ms, values = _parse_lines([lines[i] for i in keep], self.num_channels)
+                rows += len(keep)
+                self.rows_indexed = rows
+
+                # Reduce whole buckets; the remainder waits for the next chunk
+                pending_t = np.concatenate((pending_t, t_ms))
+                pending_v = np.concatenate((pending_v, values))
+                full = len(pending_t) // LOD_BASE_ROWS * LOD_BASE_ROWS
+                if full:
+                    self._reduce_base(pending_t[:full], pending_v[:full], bucket_t, bucket_min, bucket_max)
+                    pending_t, pending_v = pending_t[full:], pending_v[full:]
+
+                pos = end
+                if progress:
+                    progress(pos / size)
+
+            if len(pending_t):
+                self._reduce_base(pending_t, pending_v, bucket_t, bucket_min, bucket_max)
+            np.array([size], dtype=np.int64).tofile(offsets_file)
+
+        if rows == 0:
+            raise ValueError("Log file has no data rows")
+        self.rows = rows
+        self._partial = None
+        self.levels = [(np.concatenate(bucket_t), np.concatenate(bucket_min), np.concatenate(bucket_max))]
+        self._build_levels()
+        self.offsets = np.memmap(offsets_path, dtype=np.int64, mode='r')
+        self._save_sidecar()
+        print(f"LogIndex: Indexed {rows:,} rows of {os.path.basename(self.path)} "
+              f"({len(self.levels)} LOD levels)")
+
+    def preview(self, width_px):
+        """While build() runs on another thread: the rows indexed so far, one envelope point per pixel
+
+        Returns {channel_num: (x_seconds, y)} like query(), empty until the first bucket is done.
+        """
+        partial = self._partial
+        if partial is None:
+            return {}
+        bucket_t, bucket_min, bucket_max = partial
+        n = len(bucket_max)  # Appended last, so the other lists hold at least as many parts
+        if n == 0:
+            return {}
+        t = np.concatenate(bucket_t[:n])
+        starts = np.arange(0, len(t), max(1, -(-len(t) // max(1, int(width_px)))))
+        vmin = np.fmin.reduceat(np.concatenate(bucket_min[:n]), starts, axis=0)
+        vmax = np.fmax.reduceat(np.concatenate(bucket_max[:n]), starts, axis=0)
+        x = np.repeat((t[starts] - t[0]) / 1000.0, 2)
+        result = {}
+        for ch in range(vmin.shape[1]):
+            y = np.column_stack((vmin[:, ch], vmax[:, ch])).ravel().astype(np.float64)
+            mask = ~np.isnan(y)
+            result[ch + 1] = (x[mask], y[mask])
+        return result
+
+    def _reduce_base(self, t_ms, values, bucket_t, bucket_min, bucket_max):
+        starts = np.arange(0, len(t_ms), LOD_BASE_ROWS)
+        bucket_t.append(t_ms[starts])
+        # fmin/fmax skip NaN, so a bucket is NaN only if it has no valid reading
+        bucket_min.append(np.fmin.reduceat(values, starts, axis=0).astype(np.float32))
+        bucket_max.append(np.fmax.reduceat(values, starts, axis=0).astype(np.float32))
+        self.end_ms = int(t_ms[-1])
+
+    def _build_levels(self):
+        while len(self.levels[-1][0]) > LOD_MIN_BUCKETS * LOD_FACTOR:
+            t, vmin, vmax = self.levels[-1]
+            starts = np.arange(0, len(t), LOD_FACTOR)
+            self.levels.append((t[starts],
+                                np.fmin.reduceat(vmin, starts, axis=0),
+                                np.fmax.reduceat(vmax, starts, axis=0)))
+
+    def _save_sidecar(self):
+        try:
+            for k, arrays in enumerate(self.levels):
+                for name, array in zip(('t', 'min', 'max'), arrays):
+                    np.save(os.path.join(self.sidecar, f'level{k}_{name}.npy'), array)
+            meta = {
+                'version': SIDECAR_VERSION,
+                'source': self._source_signature(),
+                'header': self.header,
+                'channels': self.num_channels,
+                'rows': self.rows,
+                'end_ms': self.end_ms,
+                'levels': len(self.levels)
+            }
+            # meta.json is written last, so an interrupted build is never loaded
+            with open(os.path.join(self.sidecar, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            print(f"LogIndex: Could not write sidecar ({e}); index kept in memory only")
+
+    @property
+    def duration(self):
+        """Session length in seconds"""
+        return (self.end_ms - self.start_ms) / 1000.0
+
+    def row_range(self, t0, t1):
+        """Rows [i0, i1) covering relative times t0..t1 (seconds), at LOD bucket granularity"""
+        t = self.levels[0][0]
+        b0 = max(0, int(np.searchsorted(t, self.start_ms + t0 * 1000, side='right')) - 1)
+        b1 = int(np.searchsorted(t, self.start_ms + t1 * 1000, side='right'))
+        return b0 * LOD_BASE_ROWS, min(self.rows, b1 * LOD_BASE_ROWS)
+
+    def read_rows(self, i0, i1):
+        """Parse rows [i0, i1) straight from the mapped file"""
+        if i1 <= i0:
+            return np.empty(0, dtype=np.int64), np.empty((0, self.num_channels))
+        data = self._mm[int(self.offsets[i0]):int(self.offsets[i1])]
+        lines = [line for line in data.split(b'\n') if line.strip()]
+        return _parse_lines(lines, self.num_channels)
+
+    def query(self, t0, t1, width_px):
+        """Plot data for relative times t0..t1 (seconds) at a given pixel width
+
+        Returns ({channel_num: (x_seconds, y)}, level) where level is None for
+        raw rows (M4-decimated to the width) or the LOD level used. LOD data is
+        an envelope: each bucket contributes its min and max at its start time.
+        """
+        width_px = max(1, int(width_px))
+        i0, i1 = self.row_range(t0, t1)
+        if i1 - i0 <= RAW_ROW_LIMIT:
+            t_ms, values = self.read_rows(i0, i1)
+            x = (t_ms - self.start_ms) / 1000.0
+            result = {}
+            for ch in range(self.num_channels):
+                mask = ~np.isnan(values[:, ch])
+                result[ch + 1] = m4_decimate(x[mask], values[mask, ch], t0, t1, width_px)
+            return result, None
+
+        # Coarsest level that still has at least one bucket per pixel in the range
+        level = 0
+        for k in range(1, len(self.levels)):
+            if (i1 - i0) / (LOD_BASE_ROWS * LOD_FACTOR ** k) >= width_px:
+                level = k
+        t, vmin, vmax = self.levels[level]
+        rows_per_bucket = LOD_BASE_ROWS * LOD_FACTOR ** level
+        b0 = i0 // rows_per_bucket
+        b1 = min(len(t), -(-i1 // rows_per_bucket))
+        x = np.repeat((np.asarray(t[b0:b1]) - self.start_ms) / 1000.0, 2)
+        result = {}
+        for ch in range(self.num_channels):
+            y = np.column_stack((vmin[b0:b1, ch], vmax[b0:b1, ch])).ravel().astype(np.float64)
+            mask = ~np.isnan(y)
+            result[ch + 1] = (x[mask], y[mask])
+        return result, level
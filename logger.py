@@ -1,43 +1,64 @@
 from datetime import datetime
-import csv, os, time, threading
-import CL3wrap
-from config import DEVICE_ID, IP, PORT, COLORS
+import csv, os, threading, time
+from config import DEVICE_ID, LOG_FLUSH_INTERVAL
+from acquisition import AcquisitionPipeline, Sample
 
 class CL3000Logger:
-    def __init__(self, out_channels):
+    def __init__(self, out_channels, pipeline=None):
         self.running = False
-        self.thread = None
+        self.pipeline = pipeline
         self.csv_writer = None
         self.csv_file = None
+        self.csv_path = None  # Path of the current (or last) session log
         self.log_interval = 5
         self.max_duration = None
         self.total_samples = 0
         self.start_time = None
+        self._started_at = None
         self.out_channels = out_channels
+        self._lock = threading.Lock()
+        self._flush_task = None  # Periodic CSV flush on the device core
+
+        # Additional consumers of logged samples (e.g. the graph buffer)
+        self.sinks = []
 
         # Callbacks
         self.callback_update_display = None
         self.callback_on_stop = None
+        self.callback_on_resume = None
 
-    def set_callbacks(self, update_display_fn=None, on_stop_fn=None):
+    def set_callbacks(self, update_display_fn=None, on_stop_fn=None, on_resume_fn=None):
+        # on_resume_fn(filename, start_t_ns) is only called by RemoteLogger, on reattaching to a running session
         self.callback_update_display = update_display_fn
         self.callback_on_stop = on_stop_fn
+        self.callback_on_resume = on_resume_fn
+
+    def attach_pipeline(self, pipeline):
+        """Take samples from a shared AcquisitionPipeline instead of polling the device"""
+        self.pipeline = pipeline
+
+    def add_sink(self, sink):
+        """Register a callback(batch) that receives every sample written to the log"""
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def _ensure_pipeline(self):
+        if self.pipeline is None:
+            self.pipeline = AcquisitionPipeline(num_channels=self.out_channels)
+        return self.pipeline
 
     def connect(self):
-        ethernetConfig = CL3wrap.CL3IF_ETHERNET_SETTING()
-        for i in range(4):
-            ethernetConfig.abyIpAddress[i] = IP[i]
-        ethernetConfig.wPortNo = PORT
-        return CL3wrap.CL3IF_OpenEthernetCommunication(DEVICE_ID, ethernetConfig, 10000)
+        return self._ensure_pipeline().connect(timeout=10000)
 
     def disconnect(self):
-        CL3wrap.CL3IF_CloseCommunication(DEVICE_ID)
+        self._ensure_pipeline().disconnect()
 
     def setup_csv(self):
         output_dir = os.path.join(os.getcwd(), "output_files")
         os.makedirs(output_dir, exist_ok=True)
         filename = f"cl3000_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        self.csv_file = open(os.path.join(output_dir, filename), "w", newline='', encoding='utf-8')
+        self.csv_path = os.path.join(output_dir, filename)
+        self.csv_file = open(self.csv_path, "w", newline='', encoding='utf-8')
         self.csv_writer = csv.writer(self.csv_file)
         headers = ["Timestamp"]
         for i in range(1, self.out_channels + 1):
@@ -46,136 +67,119 @@ class CL3000Logger:
         self.csv_writer.writerow(headers)
         return filename
 
-    def get_data_row(self):
-        data = CL3wrap.CL3IF_MEASUREMENT_DATA()
-        CL3wrap.CL3IF_GetMeasurementData(DEVICE_ID, data)
-        timestamp = datetime.now()
-        timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        row = [timestamp_str]
+    def format_row(self, sample):
+        """Build a CSV row from a decoded Sample"""
+        # Wall-clock text is only rendered here, at export time
+        row = [self.pipeline.clock.format(sample.t_ns)]
         for i in range(self.out_channels):
-            val = data.outMeasurementData[i].measurementValue / 100.0
-            info = data.outMeasurementData[i].valueInfo
-            if info == 1:
-                val = -9999.98
-                judge = "STANDBY"
-            else:
-                judge_code = data.outMeasurementData[i].judgeResult
-                if judge_code & 0x01:
-                    judge = "HI"
-                elif judge_code & 0x04:
-                    judge = "LO"
-                elif judge_code & 0x02:
-                    judge = "GO"
-                else:
-                    judge = "??"
-            row.extend([val, judge])
-        return row, timestamp
-
-    def log_loop(self):
-        self.start_time = time.time()
-        self.total_samples = 0
-        last_display_update = 0
-        last_row = None
-        last_timestamp = None
-        last_sample_display_update = 0  # Track when we last updated display for a new sample
-        
-        # Take the first sample immediately at t=0
-        row, timestamp = self.get_data_row()
-        self.csv_writer.writerow(row)
-        self.csv_file.flush()
-        self.total_samples += 1
-        last_row = row
-        last_timestamp = timestamp
-        
-        # Update display for first sample (elapsed time = 0)
+            row.extend([sample.values[i], sample.judges[i]])
+        return row
+
+    def _on_samples(self, batch):
+        """Pipeline subscriber: write samples that fall on the logging schedule"""
+        with self._lock:
+            if not self.running:
+                return
+            for sample in batch:
+                self._handle_sample(sample)
+                if not self.running:
+                    break
+        if not self.running:
+            self._finish()
+
+    def _handle_sample(self, sample):
+        current_time = sample.t_ns / 1e9
+        if self.start_time is None:
+            # The first sample delivered after start() is logged at t=0
+            self.start_time = current_time
+        elapsed_time = current_time - self.start_time
+
+        # Calculate when the next sample should be taken; tolerate half a poll of jitter
+        next_sample_time = self.start_time + (self.total_samples * self.log_interval)
+        tolerance = self.pipeline.poll_interval / 2
+
+        row = None
+        if current_time >= next_sample_time - tolerance:
+            logged = Sample(sample.t_ns, sample.values[:self.out_channels],
+                            sample.judges[:self.out_channels])
+            row = self.format_row(logged)
+            self.csv_writer.writerow(row)
+            self.total_samples += 1
+
+            for sink in self.sinks:
+                try:
+                    sink([logged])
+                except Exception as e:
+                    print(f"CL3000Logger: Sink error: {e}")
+
+        # Every sample refreshes the counters and elapsed time; the row (None unless one was
+        # just logged) only goes out with logged samples, so it never overwrites live values.
+        # The callback only records state; the GUI's frame governor decides when to draw.
         if self.callback_update_display:
             self.callback_update_display(
                 row,
-                timestamp,
+                sample.t_ns if row else None,
                 self.total_samples,
-                0.0
+                elapsed_time
             )
-        
-        while self.running:
-            current_time = time.time()
-            elapsed_time = current_time - self.start_time
-
-            # Calculate when the next sample should be taken
-            next_sample_time = self.start_time + (self.total_samples * self.log_interval)
-            
-            # Check if it's time to take a sample
-            if current_time >= next_sample_time:
-                # Take the sample
-                row, timestamp = self.get_data_row()
-                self.csv_writer.writerow(row)
+
+        # Check duration limit AFTER processing samples and display updates
+        if self.max_duration and elapsed_time >= self.max_duration:
+            self.running = False
+
+    def _flush(self):
+        expired = False
+        with self._lock:
+            if self.csv_file is not None:
                 self.csv_file.flush()
-                self.total_samples += 1
-                last_row = row
-                last_timestamp = timestamp
-                
-                # Update display with new sample data, but throttle for very fast sample rates
-                if self.callback_update_display:
-                    # For very fast sample rates (< 0.5s), limit display updates to prevent overwhelming the UI
-                    if self.log_interval < 0.5:
-                        # Only update display every 0.5 seconds for fast sample rates
-                        if elapsed_time - last_sample_display_update >= 0.5:
-                            self.callback_update_display(
-                                row,
-                                timestamp,
-                                self.total_samples,
-                                elapsed_time
-                            )
-                            last_sample_display_update = elapsed_time
-                    else:
-                        # Normal update for slower sample rates
-                        self.callback_update_display(
-                            row,
-                            timestamp,
-                            self.total_samples,
-                            elapsed_time
-                        )
-                last_display_update = elapsed_time
-            else:
-                # Not time for a sample yet, but update display every second to show elapsed time
-                # For very fast sample rates, we need to ensure elapsed time still updates
-                update_interval = 0.5 if self.log_interval < 0.5 else 1.0
-                if elapsed_time - last_display_update >= update_interval and self.callback_update_display and last_row:
-                    self.callback_update_display(
-                        last_row,  # Use last sample data
-                        last_timestamp,
-                        self.total_samples,
-                        elapsed_time  # Updated elapsed time
-                    )
-                    last_display_update = elapsed_time
-                
-                # Sleep for a short time to avoid busy waiting
-                time.sleep(0.1)
-            
-            # Check duration limit AFTER processing samples and display updates
-            if self.max_duration and elapsed_time >= self.max_duration:
-                break
-
-        # Clean shutdown
-        if self.csv_file:
+            # Samples stop arriving while the device is disconnected, so the duration
+            # limit is checked here too; before the first sample it counts from start()
+            start_time = self.start_time if self.start_time is not None else self._started_at
+            if (self.running and self.max_duration
+                    and time.monotonic_ns() / 1e9 - start_time >= self.max_duration):
+                print("CL3000Logger: Duration reached, stopping")
+                self.running = False
+                expired = True
+        if expired:
+            self._finish()
+
+    def _finish(self):
+        """Detach from the pipeline and close the CSV once logging has ended"""
+        self.pipeline.unsubscribe(self._on_samples)
+        self.pipeline.release_interval(self)
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        with self._lock:
+            if self.csv_file is None:
+                return
             self.csv_file.close()
             self.csv_file = None
-        self.disconnect()
+            self.csv_writer = None
         if self.callback_on_stop:
             self.callback_on_stop()
 
     def start(self, interval, duration):
+        import CL3wrap
+        pipeline = self._ensure_pipeline()
         self.log_interval = interval
         self.max_duration = duration
-        CL3wrap.CL3IF_ClearStorageData(DEVICE_ID)
+        with pipeline.device_lock:
+            CL3wrap.CL3IF_ClearStorageData(DEVICE_ID)
         # CL3wrap.CL3IF_ResetGroup(DEVICE_ID, 1)  # Zero Reset - Commented out to preserve manual zeroing
         filename = self.setup_csv()
+        self.start_time = None
+        self._started_at = time.monotonic_ns() / 1e9
+        self.total_samples = 0
         self.running = True
-        self.thread = threading.Thread(target=self.log_loop)
-        self.thread.start()
+        pipeline.subscribe(self._on_samples)
+        pipeline.request_interval(self, interval)
+        # Rows are flushed in batches rather than one write syscall per row
+        self._flush_task = pipeline.core.every('log flush', LOG_FLUSH_INTERVAL, self._flush)
+        pipeline.start()
         return filename
 
     def stop(self):
         self.running = False
-        # Don't disconnect or close files here - let log_loop handle cleanup
-        if self.callback_on_stop:
-            self.callback_on_stop()
\ No newline at end of file
+        # The device connection is shared with the live view, so only the log is closed here
+        self._finish()
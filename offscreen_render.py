@@ -0,0 +1,253 @@
+import multiprocessing
+import queue
+import threading
+import numpy as np
+from config import COLORS
+
+
+class OffscreenRenderer:
+    """Rasterizes plot snapshots with a private Agg figure (no Tk involved)
+
+    A snapshot is a plain dict, so it can be handed to a thread or pickled
+    to a process:
+        {'frame': int, 'size': (w_px, h_px), 'dpi': float,
+         'xlim': (lo, hi), 'ylim': (lo, hi), 'xlabel': str, 'ylabel': str,
+         'lines': [line_spec(...)], 'scatters': [scatter_spec(...)],
+         'legend': [(label, line_index)]}
+    """
+
+    def __init__(self):
+        self.figure = None
+        self.canvas = None
+        self.ax = None
+        self.lines = []
+        self.scatters = []
+        self._layout = None
+
+    def _build(self, snapshot):
+        from matplotlib import style
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        w, h = snapshot['size']
+        dpi = snapshot['dpi']
+        with style.context('dark_background'):
+            self.figure = Figure(figsize=(w / dpi, h / dpi), dpi=dpi, facecolor='#2D2D2D')
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.ax = self.figure.add_subplot(111, facecolor='#1A1A1A')
+            self.ax.set_xlabel(snapshot.get('xlabel', ''), color=COLORS['text'], fontsize=12)
+            self.ax.set_ylabel(snapshot.get('ylabel', ''), color=COLORS['text'], fontsize=12)
+            self.ax.tick_params(colors=COLORS['text'])
+            self.ax.grid(True, alpha=0.3, color='gray')
+            for spine in self.ax.spines.values():
+                spine.set_color(COLORS['text'])
+
+            self.lines = []
+            for spec in snapshot['lines']:
+                line, = self.ax.plot([], [], color=spec['color'], linewidth=spec['linewidth'],
+                                     alpha=spec['alpha'])
+                self.lines.append(line)
+            self.scatters = []
+            for spec in snapshot['scatters']:
+                self.scatters.append(self.ax.scatter([], [], s=spec['s'], marker=spec['marker'],
+                                                     facecolors=[spec['facecolor']],
+                                                     edgecolors=[spec['edgecolor']],
+                                                     linewidths=spec['linewidth']))
+        self._layout = self._layout_key(snapshot)
+
+    @staticmethod
+    def _layout_key(snapshot):
+        return (tuple(snapshot['size']), snapshot['dpi'], len(snapshot['lines']), len(snapshot['scatters']))
+
+    def render(self, snapshot):
+        """Draw a snapshot and return an (h, w, 4) uint8 RGBA array"""
+        if self.figure is None or self._layout != self._layout_key(snapshot):
+            self._build(snapshot)
+
+        for line, spec in zip(self.lines, snapshot['lines']):
+            line.set_data(spec['x'], spec['y'])
+            line.set_visible(spec['visible'])
+        for scatter, spec in zip(self.scatters, snapshot['scatters']):
+            offsets = spec['offsets']
+            scatter.set_offsets(offsets if len(offsets) else np.empty((0, 2)))
+            scatter.set_visible(spec['visible'])
+
+        self.ax.set_xlim(*snapshot['xlim'])
+        self.ax.set_ylim(*snapshot['ylim'])
+
+        legend = snapshot.get('legend')
+        if legend:
+            handles = [self.lines[index] for label, index in legend]
+            labels = [label for label, index in legend]
+            self.ax.legend(handles, labels, loc='upper right',
+                           facecolor='#2D2D2D', edgecolor=COLORS['text'], framealpha=0.9)
+        elif self.ax.get_legend():
+            self.ax.get_legend().remove()
+
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba()).copy()
+
+
+def line_spec(line, visible=True):
+    """Snapshot entry for a Line2D (copies the data, so the artist may change afterwards)"""
+    return {
+        'x': np.array(line.get_xdata(), dtype=np.float64),
+        'y': np.array(line.get_ydata(), dtype=np.float64),
+        'color': line.get_color(),
+        'linewidth': line.get_linewidth(),
+        'alpha': line.get_alpha(),
+        'visible': visible and line.get_visible()
+    }
+
+
+def scatter_spec(collection, marker, visible=True):
+    """Snapshot entry for a scatter PathCollection; the marker is not recoverable, so it is passed in"""
+    facecolors = collection.get_facecolor()
+    edgecolors = collection.get_edgecolor()
+    return {
+        'offsets': np.array(collection.get_offsets(), dtype=np.float64).reshape(-1, 2),
+        'facecolor': tuple(facecolors[0]) if len(facecolors) else (0, 0, 0, 0),
+        'edgecolor': tuple(edgecolors[0]) if len(edgecolors) else (0, 0, 0, 0),
+        's': float(collection.get_sizes()[0]) if len(collection.get_sizes()) else 20.0,
+        'linewidth': float(collection.get_linewidths()[0]) if len(collection.get_linewidths()) else 1.0,
+        'marker': marker,
+        'visible': visible and collection.get_visible()
+    }
+
+
+def axes_snapshot(figure_canvas, ax, lines, scatters=(), legend=None):
+    """Build a render snapshot matching the on-screen canvas size and axes limits"""
+    width, height = figure_canvas.get_width_height(physical=True)
+    return {
+        'size': (width, height),
+        'dpi': figure_canvas.figure.dpi,
+        'xlim': tuple(ax.get_xlim()),
+        'ylim': tuple(ax.get_ylim()),
+        'xlabel': ax.get_xlabel(),
+        'ylabel': ax.get_ylabel(),
+        'lines': list(lines),
+        'scatters': list(scatters),
+        'legend': legend
+    }
+
+
+def make_render_worker(mode):
+    """RenderWorker for a GRAPH_RENDER_WORKER setting ('thread', 'process'), or None to draw on the Tk thread"""
+    if mode not in ('thread', 'process'):
+        return None
+    worker = RenderWorker(use_process=(mode == 'process'))
+    worker.start()
+    return worker
+
+
+def _render_loop(requests, results):
+    """Worker body (thread or process): render the requests until None arrives"""
+    renderer = OffscreenRenderer()
+    while True:
+        snapshot = requests.get()
+        if snapshot is None:
+            break
+        try:
+            results.put((snapshot['frame'], renderer.render(snapshot), None))
+        except Exception as e:
+            results.put((snapshot['frame'], None, str(e)))
+
+
+class RenderWorker:
+    """Rasterizes figure snapshots in a background thread or process
+
+    At most one frame is in flight; while it renders, newer snapshots replace
+    the pending one, so a slow frame never builds a backlog.
+    """
+
+    def __init__(self, use_process=False):
+        self.use_process = use_process
+        self._worker = None
+        self._requests = None
+        self._results = None
+        self._in_flight = False
+        self._pending = None
+        self._frame = 0
+
+    def start(self):
+        if self._worker is not None:
+            return
+        if self.use_process:
+            self._requests = multiprocessing.Queue()
+            self._results = multiprocessing.Queue()
+            self._worker = multiprocessing.Process(target=_render_loop,
+                                                   args=(self._requests, self._results), daemon=True)
+        else:
+            self._requests = queue.Queue()
+            self._results = queue.Queue()
+            self._worker = threading.Thread(target=_render_loop,
+                                            args=(self._requests, self._results), daemon=True)
+        self._worker.start()
+        print(f"RenderWorker: Started ({'process' if self.use_process else 'thread'})")
+
+    def stop(self):
+        if self._worker is None:
+            return
+        self._requests.put(None)
+        self._worker.join(timeout=2.0)
+        self._worker = None
+        self._in_flight = False
+        self._pending = None
+
+    def submit(self, snapshot):
+        """Queue a snapshot for rendering; replaces a pending one that has not started"""
+        self._frame += 1
+        snapshot['frame'] = self._frame
+        if self._in_flight:
+            self._pending = snapshot
+            return
+        self._in_flight = True
+        self._requests.put(snapshot)
+
+    def poll(self):
+        """Return the newest finished RGBA image, or None (call from the Tk thread)"""
+        if self._worker is None:
+            return None
+        image = None
+        while True:
+            try:
+                frame, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight = False
+            if error:
+                print(f"RenderWorker: Frame {frame} failed: {error}")
+            else:
+                image = result
+        if not self._in_flight and self._pending is not None:
+            self._in_flight = True
+            self._requests.put(self._pending)
+            self._pending = None
+        return image
+
+
+def tk_blit_available(figure_canvas):
+    """Whether this matplotlib has the private Tk internals blit_image() relies on"""
+    try:
+        from matplotlib.backends import _backend_tk
+    except ImportError:
+        return False
+    return hasattr(_backend_tk, 'blit') and hasattr(figure_canvas, '_tkphoto')
+
+
+def blit_image(figure_canvas, image):
+    """Copy a finished RGBA frame into a FigureCanvasTkAgg's photo image
+
+    Returns False if the frame no longer matches the canvas size (e.g. after
+    a resize); the caller should then request a fresh frame. Without the Tk
+    internals (see tk_blit_available) the canvas is redrawn with draw_idle().
+    """
+    width, height = figure_canvas.get_width_height(physical=True)
+    if image.shape[0] != height or image.shape[1] != width:
+        return False
+    try:
+        from matplotlib.backends import _backend_tk
+        _backend_tk.blit(figure_canvas._tkphoto, image, (0, 1, 2, 3))
+    except (ImportError, AttributeError):
+        figure_canvas.draw_idle()
+    return True
@@ -0,0 +1,176 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from acquisition import MAX_CHANNELS, JUDGE_NAMES, JUDGE_CODES, Sample
+
+RING_MAGIC = 0x434C3352  # 'CL3R'
+RING_VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'), ('version', '<u4'),
+    ('capacity', '<u8'), ('num_channels', '<u4'), ('record_size', '<u4'),
+    ('write_seq', '<u8'),  # Records fully written so far
+    ('anchor_ns', '<i8'), ('anchor_wall_ns', '<i8')  # SessionClock of the writer
+])
+HEADER_SIZE = 64
+
+# One sample of all OUT channels; seq_begin/seq_end hold (absolute index + 1)
+RECORD_DTYPE = np.dtype([
+    ('seq_begin', '<u8'),
+    ('t_ns', '<i8'),
+    ('values', '<f8', (MAX_CHANNELS,)),
+    ('judges', 'u1', (MAX_CHANNELS,)),
+    ('seq_end', '<u8')
+])
+
+
+def _attach_untracked(name):
+    """Map a segment without this process's resource tracker unlinking it at exit
+
+    Before Python 3.13 attaching registers the segment with the resource
+    tracker. A multiprocessing child shares its parent's tracker, so it is
+    left alone there; an independent process unregisters it again.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None:
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+    return shm
+
+
+class ShmSampleRing:
+    """Fixed-layout ring of sample records in shared memory, one writer, many readers
+
+    The writer (the acquisition process) appends with append(), which can be
+    subscribed to an AcquisitionPipeline directly. Readers in other
+    processes attach by name and pull everything newer than their cursor
+    with read_since(); there is no pickling, only one vectorized copy of the
+    new records out of the segment.
+
+    Consistency uses per-record sequence counters: the writer stores
+    seq_begin, then the data, then seq_end, and finally bumps write_seq in
+    the header. A reader copies seq_end, then the data, then seq_begin
+    (each as a whole column) and keeps only records whose two counters both
+    equal the expected index; a record the writer was overwriting meanwhile
+    is discarded and counted as lost, like one that had already been
+    overwritten before the read.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        if self.header['magic'] != RING_MAGIC or self.header['version'] != RING_VERSION:
+            raise ValueError(f"Shared memory '{shm.name}' is not a sample ring")
+        if self.header['record_size'] != RECORD_DTYPE.itemsize:
+            raise ValueError("Sample ring record layout differs from this build")
+        self.capacity = int(self.header['capacity'])
+        self.num_channels = int(self.header['num_channels'])
+        self.records = np.ndarray((self.capacity,), dtype=RECORD_DTYPE,
+                                  buffer=shm.buf, offset=HEADER_SIZE)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def create(cls, capacity, num_channels=MAX_CHANNELS, clock=None, name=None):
+        """Allocate a new ring; the creating process is the writer and unlinks it on close()"""
+        size = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        header[()] = (RING_MAGIC, RING_VERSION, capacity, min(num_channels, MAX_CHANNELS),
+                      RECORD_DTYPE.itemsize, 0,
+                      clock.anchor_ns if clock else 0, clock.anchor_wall_ns if clock else 0)
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Map an existing ring read-only by convention (readers never write to it)"""
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def write_seq(self):
+        return int(self.header['write_seq'])
+
+    def set_channel_count(self, num_channels):
+        self.num_channels = min(num_channels, MAX_CHANNELS)
+        self.header['num_channels'] = self.num_channels
+
+    def append(self, batch):
+        """Write a batch of Samples (AcquisitionPipeline subscriber; writer only)"""
+        if not batch:
+            return
+        start = self.write_seq
+        seqs = np.arange(start + 1, start + len(batch) + 1, dtype=np.uint64)
+        slots = (seqs - 1) % self.capacity
+        if len(batch) > self.capacity:
+            batch, seqs, slots = batch[-self.capacity:], seqs[-self.capacity:], slots[-self.capacity:]
+        n = self.num_channels
+        values = np.full((len(batch), MAX_CHANNELS), np.nan)
+        judges = np.zeros((len(batch), MAX_CHANNELS), dtype=np.uint8)
+        for row, sample in enumerate(batch):
+            k = min(n, len(sample.values))
+            values[row, :k] = sample.values[:k]
+            judges[row, :k] = [JUDGE_CODES.get(judge, 0) for judge in sample.judges[:k]]
+
+        records = self.records
+        records['seq_begin'][slots] = seqs
+        records['t_ns'][slots] = [sample.t_ns for sample in batch]
+        records['values'][slots] = values
+        records['judges'][slots] = judges
+        records['seq_end'][slots] = seqs
+        self.header['write_seq'] = int(seqs[-1])
+
+    def read_since(self, cursor):
+        """Records written after `cursor` (a write_seq value, 0 = from the start)
+
+        Returns (records, new_cursor, lost): `records` is a chronological
+        structured array copy (fields t_ns, values, judges), and `lost`
+        counts records that were overwritten before they could be read.
+        """
+        end = self.write_seq
+        if end < cursor:
+            cursor = 0  # The writer restarted with a new ring under the same name
+        start = max(cursor, end - self.capacity)
+        lost = start - cursor
+        if end == start:
+            return self.records[:0].copy(), end, lost
+        seqs = np.arange(start + 1, end + 1, dtype=np.uint64)
+        slots = (seqs - 1) % self.capacity
+        seq_end = self.records['seq_end'][slots]
+        copy = self.records[slots]  # Fancy indexing: one copy, detached from the segment
+        seq_begin = self.records['seq_begin'][slots]
+        valid = (seq_end == seqs) & (seq_begin == seqs)
+        if not valid.all():
+            lost += int(np.count_nonzero(~valid))
+            copy = copy[valid]
+        return copy, end, lost
+
+    def samples_since(self, cursor):
+        """read_since() as a list of Samples, e.g. for GraphDataManager.add_samples"""
+        records, cursor, lost = self.read_since(cursor)
+        n = int(self.header['num_channels'])  # The writer may change it at any time
+        batch = [Sample(int(record['t_ns']), record['values'][:n].tolist(),
+                        [JUDGE_NAMES[code] for code in record['judges'][:n]])
+                 for record in records]
+        return batch, cursor, lost
+
+    def close(self):
+        """Unmap the segment; the writer also removes it"""
+        self.header = None
+        self.records = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
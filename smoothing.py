@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Display name -> filter key, in the order shown in the graph controls
+SMOOTHING_METHODS = {
+    'None': 'none',
+    'Moving Avg': 'moving_average',
+    'Savitzky-Golay': 'savgol',
+    'Spline': 'spline'
+}
+
+
+def _moving_average(y, window):
+    """Centered moving average; the edges average over the samples that exist"""
+    kernel = np.ones(window)
+    sums = np.convolve(y, kernel, mode='same')
+    counts = np.convolve(np.ones(len(y)), kernel, mode='same')
+    return sums / counts
+
+
+class ChannelSmoother:
+    """Incremental smoother for one channel
+
+    Keeps the smoothed curve of the data seen so far and, when new samples
+    arrive, recomputes only the tail whose output depends on them (plus the
+    filter's context on the left). Timestamps are monotonic ns as stored by
+    GraphDataManager, so cached output stays valid when the plot's time
+    reference moves.
+    """
+
+    def __init__(self, window=7, spline_subdivisions=8):
+        self.window = window | 1  # Odd window keeps the filters centered
+        self.spline_subdivisions = spline_subdivisions
+        self.method = None
+        self.reset()
+
+    def reset(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.last_t = None
+
+    def _context(self):
+        """Samples before the first new one whose smoothed value can still change"""
+        if self.method == 'spline':
+            return 3
+        return self.window // 2
+
+    def update(self, t_ns, values, method):
+        """Bring the cache up to date with (t_ns, values); returns (x_ns, y, method)"""
+        if method != self.method:
+            self.method = method
+            self.reset()
+        n = len(t_ns)
+        if n == 0:
+            self.reset()
+            return self.x, self.y, method
+
+        t = np.asarray(t_ns, dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64)
+
+        # Index of the first sample not yet processed
+        k = 0 if self.last_t is None else int(np.searchsorted(t, self.last_t, side='right'))
+        if k >= n:
+            return self.x, self.y, method
+        if k == 0:
+            self.reset()
+
+        # Drop cached output that has left the ring buffer or that the new samples affect
+        first_changed = max(0, k - self._context())
+        keep = (self.x >= t[0]) & (self.x < t[first_changed])
+        cached_x, cached_y = self.x[keep], self.y[keep]
+
+        new_x, new_y = self._smooth_segment(t, y, first_changed)
+        self.x = np.concatenate((cached_x, new_x))
+        self.y = np.concatenate((cached_y, new_y))
+        self.last_t = t[-1]
+        return self.x, self.y, method
+
+    def _smooth_segment(self, t, y, start):
+        """Smoothed output for samples start..end, using left context where needed"""
+        half = self.window // 2
+        if self.method == 'moving_average':
+            a = max(0, start - half)
+            out = _moving_average(y[a:], self.window)
+            return t[start:], out[start - a:]
+
+        if self.method == 'savgol':
+            a = max(0, start - 2 * half)
+            seg = y[a:]
+            if len(seg) < self.window:
+                return t[start:], y[start:]
+            from scipy.signal import savgol_filter
+            out = savgol_filter(seg, self.window, polyorder=2, mode='interp')
+            return t[start:], out[start - a:]
+
+        if self.method == 'spline':
+            a = max(0, start - 3)
+            if len(t) - a < 4:
+                return t[start:], y[start:]
+            from scipy.interpolate import make_interp_spline
+            origin = t[a]
+            spl = make_interp_spline((t[a:] - origin) / 1e9, y[a:], k=3)
+            # Evaluate a few points inside each interval from `start` on, plus the last sample
+            left = t[start:-1]
+            widths = t[start + 1:] - left
+            frac = np.arange(self.spline_subdivisions) / self.spline_subdivisions
+            xs = (left[:, None] + widths[:, None] * frac[None, :]).ravel()
+            xs = np.append(xs, t[-1])
+            return xs, spl((xs - origin) / 1e9)
+
+        return t[start:], y[start:]
+
+
+class SmoothingEngine:
+    """Runs per-channel smoothing on a worker thread and hands finished curves to the graph"""
+
+    def __init__(self, method='spline', max_points=5000, window=7):
+        self.method = method
+        self.max_points = max_points  # Above this many points the raw line is drawn
+        self.window = window
+        self._smoothers = {}
+        self._pending = {}
+        self._results = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smoothing")
+        self._scipy_warned = False
+
+    def set_method(self, method):
+        if method != self.method:
+            self.method = method
+            self._results.clear()
+
+    def reset(self):
+        """Forget finished curves (e.g. after the graph was cleared)"""
+        self._results.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _collect(self, channel_num):
+        future = self._pending.get(channel_num)
+        if future is None or not future.done():
+            return
+        del self._pending[channel_num]
+        try:
+            x, y, method, source_last = future.result()
+            if method == self.method:
+                self._results[channel_num] = (x, y, source_last)
+        except ImportError as e:
+            if not self._scipy_warned:
+                print(f"Smoothing unavailable ({e}); drawing raw data")
+                self._scipy_warned = True
+            self.method = 'none'
+        except Exception as e:
+            print(f"Error smoothing channel {channel_num}: {e}")
+
+    def _job(self, channel_num, t_ns, values, method):
+        smoother = self._smoothers.setdefault(channel_num, ChannelSmoother(self.window))
+        x, y, method = smoother.update(t_ns, values, method)
+        return x, y, method, t_ns[-1]
+
+    def get_line(self, channel_num, t_ns, values):
+        """Return (x_ns, y) for the line: the latest smoothed curve, or the raw data
+
+        Never blocks the caller; a stale curve is returned while the worker
+        catches up with the newest samples.
+        """
+        n = len(t_ns)
+        if self.method == 'none' or n <= 3 or n > self.max_points:
+            return t_ns, values
+
+        self._collect(channel_num)
+        result = self._results.get(channel_num)
+        up_to_date = result is not None and result[2] == t_ns[-1]
+        if not up_to_date and channel_num not in self._pending:
+            self._pending[channel_num] = self._executor.submit(
+                self._job, channel_num, np.array(t_ns), np.array(values), self.method)
+
+        if result is None:
+            return t_ns, values
+        return result[0], result[1]
@@ -0,0 +1,25 @@
+import time
+
+# Reference point of the startup report: the first import of this module,
+# which cl3000_gui.py does before anything else
+_START = time.perf_counter()
+_marks = []
+
+
+def mark(label):
+    """Record that a startup phase has finished"""
+    _marks.append((label, time.perf_counter()))
+
+
+def elapsed_ms():
+    return 1000 * (time.perf_counter() - _START)
+
+
+def report():
+    """Startup phases with the time since start and since the previous phase"""
+    lines = ["Startup timing:"]
+    previous = _START
+    for label, t in _marks:
+        lines.append(f"  {1000 * (t - _START):8.1f} ms  (+{1000 * (t - previous):7.1f} ms)  {label}")
+        previous = t
+    return "\n".join(lines)
@@ -0,0 +1,270 @@
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from acquisition import INVALID_VALUE
+
+
+class _Client:
+    """One connected subscriber: its request and the bytes still waiting to be sent"""
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.inbuf = b''
+        self.outbuf = bytearray()
+        self.subscribed = False
+        self.channels = None  # 1-based OUT numbers, None = all
+        self.interval_ns = 0
+        self.last_sent_ns = None
+
+
+class StreamServer:
+    """Streams live samples to other local processes as JSON lines
+
+    Listens on localhost TCP (or a Unix socket when `unix_path` is given).
+    A client sends one request line, e.g.
+
+        {"channels": [1, 3], "interval": 0.1, "history": 30}
+
+    ("since": <t_ns of the last sample seen> instead of "history" resumes
+    after a reconnect; an empty line takes every channel at full rate, live
+    only). The server answers with a "hello" line naming the channels, then
+    one line per sample: {"t_ns": ..., "time": "...", "v": [...], "j": [...]}
+    with invalid readings as null.
+
+    The acquisition thread only appends each batch to a queue; encoding and
+    sending happen on the server's own selector thread. A client whose
+    unsent data grows beyond `client_buffer` bytes is disconnected, so a
+    stalled reader never holds up acquisition or the other clients.
+    """
+
+    def __init__(self, pipeline, host='127.0.0.1', port=24700, unix_path=None,
+                 history_seconds=60, client_buffer=1 << 20):
+        self.pipeline = pipeline
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.history_ns = int(history_seconds * 1e9)
+        self.client_buffer = client_buffer
+        self.history = deque()  # Recent samples, for clients asking for a starting point
+        self._pending = deque()  # Batches published since the server thread last ran
+        self._clients = {}
+        self._selector = None
+        self._listener = None
+        self._wake_r = self._wake_w = None
+        self._thread = None
+        self._running = False
+
+    @property
+    def address(self):
+        return self.unix_path if self.unix_path else (self.host, self.port)
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def start(self):
+        if self._running:
+            return
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(self.unix_path)
+        else:
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._listener.bind((self.host, self.port))
+            self.port = self._listener.getsockname()[1]  # Resolves port 0
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ, 'accept')
+        self._selector.register(self._wake_r, selectors.EVENT_READ, 'wake')
+        self._running = True
+        self.pipeline.subscribe(self._on_samples)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        print(f"StreamServer: Listening on {self.address}")
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self.pipeline.unsubscribe(self._on_samples)
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for client in list(self._clients.values()):
+            self._drop(client)
+        self._selector.close()
+        for sock in (self._listener, self._wake_r, self._wake_w):
+            sock.close()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+        print("StreamServer: Stopped")
+
+    def _on_samples(self, batch):
+        """Pipeline subscriber (acquisition thread): hand the batch over and return"""
+        self._pending.append(batch)
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # A wake-up is already pending
+
+    def _serve(self):
+        while self._running:
+            for key, events in self._selector.select(timeout=1.0):
+                if key.data == 'accept':
+                    self._accept()
+                elif key.data == 'wake':
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    client = key.data
+                    try:
+                        if events & selectors.EVENT_READ:
+                            self._read(client)
+                        if events & selectors.EVENT_WRITE and client.sock in self._clients:
+                            self._flush(client)
+                    except Exception as e:
+                        # One misbehaving client must never stop the stream for the others
+                        print(f"StreamServer: Error serving {client.address}: {e}")
+                        self._drop(client)
+            self._distribute()
+
+    def _accept(self):
+        try:
+            sock, address = self._listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        client = _Client(sock, address or self.unix_path)
+        self._clients[sock] = client
+        self._selector.register(sock, selectors.EVENT_READ, client)
+        print(f"StreamServer: Client connected from {client.address}")
+
+    def _read(self, client):
+        try:
+            data = client.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(client)
+            return
+        client.inbuf += data
+        while b'\n' in client.inbuf:
+            line, client.inbuf = client.inbuf.split(b'\n', 1)
+            self._subscribe(client, line)
+
+    def _subscribe(self, client, line):
+        """Apply a request line (a later line replaces the earlier request)"""
+        num_channels = self.pipeline.num_channels
+        try:
+            request = json.loads(line) if line.strip() else {}
+            channels = request.get('channels')
+            channels = sorted({int(ch) for ch in channels}) if channels else None
+            if channels and not 1 <= channels[0] <= channels[-1] <= num_channels:
+                raise ValueError(f"channels must be between 1 and {num_channels}")
+            interval_ns = int(float(request.get('interval', 0)) * 1e9)
+            if 'since' in request:
+                start_ns = int(request['since']) + 1
+            elif 'history' in request:
+                start_ns = time.monotonic_ns() - int(float(request['history']) * 1e9)
+            else:
+                start_ns = None
+        except (ValueError, TypeError, AttributeError, OverflowError) as e:
+            self._send(client, {'type': 'error', 'message': f"Bad request: {e}"})
+            return
+        client.channels = channels
+        client.interval_ns = interval_ns
+        client.subscribed = True
+        client.last_sent_ns = None
+        self._send(client, {'type': 'hello', 'channels': channels or list(range(1, num_channels + 1)),
+                            'interval': interval_ns / 1e9})
+        if start_ns is None:
+            return
+        for sample in list(self.history):
+            if sample.t_ns >= start_ns:
+                self._send_sample(client, sample)
+
+    def _distribute(self):
+        """Encode pending batches for every subscriber and keep the history window"""
+        while self._pending:
+            batch = self._pending.popleft()
+            for sample in batch:
+                self.history.append(sample)
+                for client in list(self._clients.values()):
+                    if client.subscribed:
+                        try:
+                            self._send_sample(client, sample)
+                        except Exception as e:
+                            print(f"StreamServer: Error sending to {client.address}: {e}")
+                            self._drop(client)
+        if self.history:
+            cutoff = self.history[-1].t_ns - self.history_ns
+            while self.history and self.history[0].t_ns < cutoff:
+                self.history.popleft()
+
+    def _send_sample(self, client, sample):
+        if client.last_sent_ns is not None and sample.t_ns - client.last_sent_ns < client.interval_ns:
+            return  # Decimated to the client's rate
+        client.last_sent_ns = sample.t_ns
+        indices = [ch - 1 for ch in client.channels] if client.channels else range(len(sample.values))
+        values = [sample.values[i] if i < len(sample.values) else None for i in indices]
+        self._send(client, {
+            't_ns': sample.t_ns,
+            'time': self.pipeline.clock.format(sample.t_ns),
+            'v': [None if value is None or value == INVALID_VALUE else value for value in values],
+            'j': [sample.judges[i] if i < len(sample.judges) else None for i in indices]
+        })
+
+    def _send(self, client, message):
+        if client.sock not in self._clients:
+            return
+        client.outbuf += json.dumps(message, separators=(',', ':')).encode() + b'\n'
+        if len(client.outbuf) > self.client_buffer:
+            print(f"StreamServer: Dropping slow client {client.address} "
+                  f"({len(client.outbuf)} bytes unsent)")
+            self._drop(client)
+            return
+        self._flush(client)
+
+    def _flush(self, client):
+        try:
+            sent = client.sock.send(client.outbuf)
+            del client.outbuf[:sent]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._drop(client)
+            return
+        # Only watch for writability while data is waiting
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbuf else 0)
+        self._selector.modify(client.sock, events, client)
+
+    def _drop(self, client):
+        if self._clients.pop(client.sock, None) is None:
+            return
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+        print(f"StreamServer: Client {client.address} disconnected")
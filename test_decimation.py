@@ -0,0 +1,34 @@
+import numpy as np
+from decimation import m4_indices, m4_decimate
+
+
+def test_small_series_is_not_decimated():
+    x = np.arange(10.0)
+    assert m4_indices(x, x, 0, 10, 100) is None
+
+
+def test_keeps_first_last_min_max_per_pixel():
+    x = np.arange(1000.0)
+    y = np.sin(x) * x
+    idx = m4_indices(x, y, 0, 1000, 10)
+    assert len(idx) <= 4 * 10 + 2
+    assert np.all(np.diff(idx) > 0)
+    for column in range(10):
+        block = np.arange(column * 100, column * 100 + 100)
+        kept = set(idx) & set(block)
+        assert {block[0], block[-1], block[np.argmin(y[block])], block[np.argmax(y[block])]} <= kept
+
+
+def test_view_keeps_one_point_beyond_each_edge():
+    x = np.arange(10000.0)
+    y = np.zeros_like(x)
+    idx = m4_indices(x, y, 2000.5, 3000.5, 20)
+    assert idx[0] == 2000 and idx[-1] == 3001
+
+
+def test_decimated_line_keeps_the_envelope():
+    x = np.linspace(0, 1, 5000)
+    y = np.random.default_rng(1).normal(size=5000)
+    dx, dy = m4_decimate(x, y, 0, 1, 50)
+    assert len(dx) < len(x)
+    assert (dy.min(), dy.max()) == (y.min(), y.max())
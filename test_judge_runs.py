@@ -0,0 +1,60 @@
+import pytest
+from judge_runs import JudgeRuns
+
+
+def append_all(runs, judges):
+    for t, judge in enumerate(judges):
+        runs.append(judge, t=float(t))
+
+
+def test_excursion_counters():
+    runs = JudgeRuns()
+    append_all(runs, ['GO', 'GO', 'HI', 'HI', 'GO', 'LO', 'GO'])
+    counters = runs.counters()
+    assert counters['excursions'] == 2
+    assert counters['longest_excursion'] == pytest.approx(2.0)
+    assert counters['current'] == 'GO'
+    time_in_state = counters['time_in_state']
+    assert time_in_state['GO'] == pytest.approx(3.0)
+    assert time_in_state['HI'] == pytest.approx(2.0)
+    assert time_in_state['LO'] == pytest.approx(1.0)
+
+    # The current state lasts until `now`
+    assert runs.counters(now=6.5)['time_in_state']['GO'] == pytest.approx(3.5)
+
+
+def test_excursion_in_progress_counts_towards_longest():
+    runs = JudgeRuns()
+    append_all(runs, ['GO', 'HI', 'HI'])
+    counters = runs.counters(now=5.0)
+    assert counters['excursions'] == 1
+    assert counters['longest_excursion'] == pytest.approx(4.0)
+    assert counters['current'] == 'HI'
+    assert runs.counters()['longest_excursion'] == 0.0
+
+
+def test_repeated_excursion_judges_are_one_excursion():
+    runs = JudgeRuns()
+    append_all(runs, ['LO'] * 5 + ['GO'])
+    assert runs.counters()['excursions'] == 1
+    assert runs.counters()['longest_excursion'] == pytest.approx(5.0)
+
+
+def test_ring_window_keeps_counters_for_everything():
+    runs = JudgeRuns(maxlen=4)
+    judges = ['GO', 'HI', 'HI', 'GO', 'LO', 'LO', 'GO', 'GO']
+    append_all(runs, judges)
+    assert len(runs) == 4
+    assert runs.first_index == 4
+    assert runs.to_list() == judges[-4:]
+    assert runs.runs() == [(0, 2, runs.codes[-2]), (2, 4, runs.codes[-1])]
+    assert runs.counters()['excursions'] == 2
+
+
+def test_clear_resets_counters():
+    runs = JudgeRuns()
+    append_all(runs, ['HI', 'GO'])
+    runs.clear()
+    counters = runs.counters()
+    assert (len(runs), counters['excursions'], counters['current']) == (0, 0, None)
+    assert counters['longest_excursion'] == 0.0
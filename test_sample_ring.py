@@ -0,0 +1,44 @@
+from acquisition import INVALID_VALUE
+from data_manager import SampleRing
+
+
+def filled(capacity, values):
+    ring = SampleRing(capacity)
+    for i, value in enumerate(values):
+        ring.append(100 + i, value)
+    return ring
+
+
+def test_extents_track_valid_values():
+    ring = filled(8, [3.0, INVALID_VALUE, -1.0, float('nan'), 5.0])
+    assert ring.extents() == (100, 104, -1.0, 5.0)
+
+
+def test_eviction_drops_overwritten_extremes():
+    ring = filled(4, [9.0, -9.0, 1.0, 2.0, 3.0, 4.0])
+    t, values = ring.arrays()
+    assert list(t) == [102, 103, 104, 105]
+    assert list(values) == [1.0, 2.0, 3.0, 4.0]
+    assert ring.extents() == (102, 105, 1.0, 4.0)
+
+
+def test_first_valid_walks_past_invalid_samples():
+    ring = filled(3, [1.0, INVALID_VALUE, INVALID_VALUE, 2.0])
+    assert ring.extents() == (103, 103, 2.0, 2.0)
+    ring = filled(2, [1.0, INVALID_VALUE, INVALID_VALUE])
+    assert ring.extents() is None
+
+
+def test_since_resumes_from_cursor_or_oldest():
+    ring = filled(4, [float(i) for i in range(6)])
+    t, values, start = ring.since(4)
+    assert (list(values), start) == ([4.0, 5.0], 4)
+    t, values, start = ring.since(0)  # Overwritten: starts at the oldest sample
+    assert (list(values), start) == ([2.0, 3.0, 4.0, 5.0], 2)
+
+
+def test_clear_bumps_generation():
+    ring = filled(4, [1.0, 2.0])
+    ring.clear()
+    assert (len(ring), ring.generation, ring.extents()) == (0, 1, None)
+    assert len(ring.arrays()[0]) == 0
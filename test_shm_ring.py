@@ -0,0 +1,103 @@
+import os
+import uuid
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from acquisition import Sample
+from shm_ring import ShmSampleRing
+
+
+def make_samples(first, count, num_channels=2):
+    return [Sample(1000 + i, [float(i + ch) for ch in range(num_channels)],
+                   ['HI' if i % 2 else 'GO'] * num_channels)
+            for i in range(first, first + count)]
+
+
+@pytest.fixture
+def rings():
+    opened = []
+
+    def open_pair(capacity, num_channels=2):
+        name = f"cl3t_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        writer = ShmSampleRing.create(capacity, num_channels=num_channels, name=name)
+        opened.append(writer)
+        # A second mapping of the segment, as a reader process would have. attach() is not
+        # used: it unregisters the segment from this process's tracker, which owns the writer
+        reader = ShmSampleRing(shared_memory.SharedMemory(name=name), owner=False)
+        opened.insert(0, reader)
+        return writer, reader
+
+    yield open_pair
+    for ring in opened:
+        ring.close()
+
+
+def test_reader_sees_appended_samples(rings):
+    writer, reader = rings(8)
+    writer.append(make_samples(0, 5))
+    records, cursor, lost = reader.read_since(0)
+    assert (cursor, lost) == (5, 0)
+    assert list(records['t_ns']) == [1000, 1001, 1002, 1003, 1004]
+    assert list(records['values'][:, 1]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    batch, cursor, lost = reader.samples_since(3)
+    assert (cursor, lost) == (5, 0)
+    assert batch == make_samples(3, 2)
+
+
+def test_nothing_new_returns_empty(rings):
+    writer, reader = rings(8)
+    writer.append(make_samples(0, 3))
+    records, cursor, lost = reader.read_since(3)
+    assert (len(records), cursor, lost) == (0, 3, 0)
+
+
+def test_wraparound_keeps_newest_and_counts_lost(rings):
+    writer, reader = rings(8)
+    for first in range(0, 20, 3):
+        writer.append(make_samples(first, min(3, 20 - first)))
+    records, cursor, lost = reader.read_since(0)
+    assert cursor == 20
+    assert lost == 12
+    assert list(records['t_ns']) == list(range(1012, 1020))
+
+    # A reader that fell behind by less than the capacity loses nothing
+    writer.append(make_samples(20, 4))
+    records, cursor, lost = reader.read_since(cursor)
+    assert (cursor, lost) == (24, 0)
+    assert list(records['t_ns']) == [1020, 1021, 1022, 1023]
+
+
+def test_batch_larger_than_capacity(rings):
+    writer, reader = rings(4)
+    writer.append(make_samples(0, 10))
+    records, cursor, lost = reader.read_since(0)
+    assert (cursor, lost) == (10, 6)
+    assert list(records['t_ns']) == [1006, 1007, 1008, 1009]
+
+
+def test_torn_record_is_dropped_and_counted(rings):
+    writer, reader = rings(8)
+    writer.append(make_samples(0, 6))
+    # The writer has stored seq_begin for a new record but not yet seq_end
+    writer.records['seq_begin'][2] = 11
+    records, cursor, lost = reader.read_since(0)
+    assert (cursor, lost) == (6, 1)
+    assert list(records['t_ns']) == [1000, 1001, 1003, 1004, 1005]
+
+
+def test_writer_restart_resets_cursor(rings):
+    writer, reader = rings(8)
+    writer.append(make_samples(0, 2))
+    records, cursor, lost = reader.read_since(5)
+    assert (cursor, lost) == (2, 0)
+    assert len(records) == 2
+
+
+def test_channel_count_limits_samples(rings):
+    writer, reader = rings(8, num_channels=4)
+    writer.append(make_samples(0, 2, num_channels=4))
+    writer.set_channel_count(2)
+    batch, cursor, lost = reader.samples_since(0)
+    assert [len(sample.values) for sample in batch] == [2, 2]
+    assert np.isnan(reader.read_since(0)[0]['values'][0, 4])
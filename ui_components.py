@@ -1,13 +1,56 @@
+import math
+import tkinter
 import customtkinter as ctk
 from config import COLORS
 
-class ChannelDisplay(ctk.CTkFrame):
+# Judge -> (judge frame color, judge text color)
+JUDGE_COLORS = {
+    "GO": (COLORS['success'], "gray10"),
+    "HI": (COLORS['danger'], "white"), 
+    "LO": (COLORS['danger'], "white"),
+    "STANDBY": (COLORS['warning'], "white"),
+    "IDLE": ("gray50", "white"),
+    "??": ("gray50", "white")
+}
+
+
+def update_displays(displays, values):
+    """Batch update: push {channel_num: (value, judge)} to ChannelDisplays in one pass
+
+    Returns the number of displays whose contents actually changed.
+    """
+    changed = 0
+    for display in displays:
+        if display.channel_num in values and display.update_data(*values[display.channel_num]):
+            changed += 1
+    return changed
+
+
+class _CachedFrame(ctk.CTkFrame):
+    """Frame that remembers the options it last pushed to its child widgets"""
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        # Unchanged values cost no Tk configure
+        self._shown = {}
+
+    def _configure(self, widget, **options):
+        """configure() only the options that differ from what the widget already shows"""
+        changed = {key: value for key, value in options.items() if self._shown.get((widget, key)) != value}
+        if changed:
+            widget.configure(**changed)
+            for key, value in changed.items():
+                self._shown[(widget, key)] = value
+        return bool(changed)
+
+
+class ChannelDisplay(_CachedFrame):
     def __init__(self, parent, channel_num, on_click=None):
         super().__init__(parent, corner_radius=10, fg_color=COLORS['card'], 
                          border_width=2, border_color=COLORS['primary'])
         self.channel_num = channel_num
         self.on_click = on_click
-        self.configure(height=180)
+        self.configure(height=225)
         
         # Only make clickable if on_click is provided
         if self.on_click:
@@ -15,12 +58,12 @@ class ChannelDisplay(ctk.CTkFrame):
             self.bind("<Button-1>", self.handle_click)
 
         # Title
-        header = ctk.CTkLabel(self, text=f"OUT{channel_num:02d}", 
-                              font=ctk.CTkFont(size=16, weight="bold"),
-                              text_color=COLORS['primary'])
-        header.pack(pady=(15, 10))
+        self.header = ctk.CTkLabel(self, text=f"OUT{channel_num:02d}", 
+                                   font=ctk.CTkFont(size=16, weight="bold"),
+                                   text_color=COLORS['primary'])
+        self.header.pack(pady=(15, 10))
         if self.on_click:
-            header.bind("<Button-1>", self.handle_click)
+            self.header.bind("<Button-1>", self.handle_click)
 
         # Value Label
         self.value_label = ctk.CTkLabel(self, text="---.--", 
@@ -50,28 +93,47 @@ class ChannelDisplay(ctk.CTkFrame):
         if self.on_click:
             self.judge_label.bind("<Button-1>", self.handle_click)
 
+        # Rolling statistics (filled by update_stats)
+        self.stats_label = ctk.CTkLabel(self, text="", 
+                                        font=ctk.CTkFont(size=10),
+                                        text_color="gray70", justify="center")
+        self.stats_label.pack(pady=(0, 10))
+        if self.on_click:
+            self.stats_label.bind("<Button-1>", self.handle_click)
+
     def handle_click(self, event):
         if self.on_click:
             self.on_click(self.channel_num)
 
+    def set_channel(self, channel_num):
+        """Reuse this card for another channel (ChannelGrid recycles cards while scrolling)"""
+        self.channel_num = channel_num
+        self._configure(self.header, text=f"OUT{channel_num:02d}")
+
     def update_data(self, value, judge):
+        """Show a reading; returns False when the card already showed exactly this"""
         if value == -9999.98:
-            self.value_label.configure(text="----.--")
+            text = "----.--"
         else:
-            self.value_label.configure(text=f"{value:7.2f}")
+            text = f"{value:7.2f}"
+        frame_color, text_color = JUDGE_COLORS.get(judge, ("gray50", "white"))
 
-        judge_colors = {
-            "GO": (COLORS['success'], "gray10"),
-            "HI": (COLORS['danger'], "white"), 
-            "LO": (COLORS['danger'], "white"),
-            "STANDBY": (COLORS['warning'], "white"),
-            "IDLE": ("gray50", "white"),
-            "??": ("gray50", "white")
-        }
+        changed = self._configure(self.value_label, text=text)
+        changed |= self._configure(self.judge_frame, fg_color=frame_color)
+        changed |= self._configure(self.judge_label, text=judge, text_color=text_color)
+        return changed
 
-        text_color, bg_color = judge_colors.get(judge, ("gray50", "white"))
-        self.judge_frame.configure(fg_color=text_color)
-        self.judge_label.configure(text=judge, text_color=bg_color)
+    def update_stats(self, stats, judge_counters=None):
+        """Show a StatisticsEngine snapshot (mean, std, min, max, range, count)"""
+        if not stats or not stats['count']:
+            text = "μ --  σ --\nmin --  max --  n 0"
+        else:
+            text = (f"μ {stats['mean']:.2f}  σ {stats['std']:.3f}  R {stats['range']:.2f}\n"
+                    f"min {stats['min']:.2f}  max {stats['max']:.2f}  n {stats['count']:,}")
+        if judge_counters:
+            text += (f"\nHI/LO ×{judge_counters['excursions']}  "
+                     f"longest {judge_counters['longest_excursion']:.1f}s")
+        self._configure(self.stats_label, text=text)
 
 class ModernStatusCard(ctk.CTkFrame):
     def __init__(self, parent, title, value="--", icon="📊"):
@@ -106,8 +168,311 @@ class ModernStatusCard(ctk.CTkFrame):
                                         font=ctk.CTkFont(size=12, weight="bold"),  # Smaller
                                         text_color=COLORS['text'])
         self.value_label.pack(side="left")
+        self._shown_value = value
+        self._shown_color = None
 
     def update_value(self, value, color=None):
-        self.value_label.configure(text=value)
-        if color:
-            self.value_label.configure(text_color=color)
\ No newline at end of file
+        # Skip the Tk round trip when the card already shows this
+        if value != self._shown_value:
+            self.value_label.configure(text=value)
+            self._shown_value = value
+        if color and color != self._shown_color:
+            self.value_label.configure(text_color=color)
+            self._shown_color = color
+
+# Compact table columns: (title, width px, anchor); width 0 takes the remaining space
+ROW_COLUMNS = (("Channel", 80, "w"), ("Value", 90, "e"), ("Judge", 80, "center"),
+               ("Δ Mean", 90, "e"), ("Statistics", 0, "w"))
+
+
+class ChannelRow(_CachedFrame):
+    """One-line channel view for the compact (table) layout of ChannelGrid"""
+
+    def __init__(self, parent, channel_num, on_click=None):
+        super().__init__(parent, corner_radius=6, fg_color=COLORS['card'], height=28)
+        self.channel_num = channel_num
+        self.pack_propagate(False)
+        self._value = None
+        self._mean = None
+
+        self.labels = []
+        for title, width, anchor in ROW_COLUMNS:
+            label = ctk.CTkLabel(self, text="", width=width, anchor=anchor,
+                                 font=ctk.CTkFont(size=12, weight="bold"),
+                                 text_color=COLORS['text'])
+            label.pack(side="left", padx=6, fill="x", expand=(width == 0))
+            self.labels.append(label)
+        self.name_label, self.value_label, self.judge_label, self.deviation_label, self.stats_label = self.labels
+        self.name_label.configure(text_color=COLORS['primary'])
+        self.judge_label.configure(corner_radius=6)
+        self.stats_label.configure(font=ctk.CTkFont(size=11), text_color="gray70")
+        self.set_channel(channel_num)
+
+    def set_channel(self, channel_num):
+        self.channel_num = channel_num
+        self._configure(self.name_label, text=f"OUT{channel_num:02d}")
+
+    def update_data(self, value, judge):
+        """Show a reading; returns False when the row already showed exactly this"""
+        if value == -9999.98:
+            self._value = None
+            text = "----.--"
+        else:
+            self._value = value
+            text = f"{value:7.2f}"
+        frame_color, text_color = JUDGE_COLORS.get(judge, ("gray50", "white"))
+
+        changed = self._configure(self.value_label, text=text)
+        changed |= self._configure(self.judge_label, text=judge, fg_color=frame_color, text_color=text_color)
+        changed |= self._update_deviation()
+        return changed
+
+    def update_stats(self, stats, judge_counters=None):
+        if not stats or not stats['count']:
+            self._mean = None
+            text = "μ --  σ --  n 0"
+        else:
+            self._mean = stats['mean']
+            text = f"μ {stats['mean']:.2f}  σ {stats['std']:.3f}  R {stats['range']:.2f}  n {stats['count']:,}"
+        if judge_counters:
+            text += f"  HI/LO ×{judge_counters['excursions']}"
+        self._configure(self.stats_label, text=text)
+        self._update_deviation()
+
+    def _update_deviation(self):
+        if self._value is None or self._mean is None:
+            return self._configure(self.deviation_label, text="--")
+        return self._configure(self.deviation_label, text=f"{self._value - self._mean:+.2f}")
+
+
+# Layout name -> cell class, columns, row pitch (px) and cell padding
+GRID_LAYOUTS = {
+    'Cards': {'cell': ChannelDisplay, 'columns': 4, 'row_height': 255, 'padx': 15, 'pady': 15},
+    'Compact': {'cell': ChannelRow, 'columns': 1, 'row_height': 32, 'padx': 0, 'pady': 2}
+}
+
+GRID_SORTS = ('Channel', 'Judge', 'Deviation')
+
+# Filter name -> judges shown (None = all channels)
+GRID_FILTERS = {
+    'All Channels': None,
+    'HI / LO': ('HI', 'LO'),
+    'GO': ('GO',),
+    'No Data': ('IDLE', 'STANDBY', '??')
+}
+
+# Judge sort order: out-of-tolerance channels first
+JUDGE_RANK = {'HI': 0, 'LO': 0, '??': 1, 'STANDBY': 1, 'GO': 2, 'IDLE': 3}
+
+
+class ChannelGrid(ctk.CTkFrame):
+    """Virtualized channel grid: only the rows that fit on screen exist as widgets
+
+    Cells are pooled per layout and re-pointed at other channels when the
+    view scrolls, sorts, filters or the channel count changes, so none of
+    those create or destroy widgets. Sorting and filtering only reorder the
+    channel list; they are re-applied with each statistics update, so rows
+    do not jump around on every reading.
+    """
+
+    def __init__(self, parent, num_channels, layout='Cards'):
+        super().__init__(parent, fg_color="transparent")
+        self.num_channels = 0
+        self.layout = layout
+        self.sort_key = 'Channel'
+        self.filter_name = 'All Channels'
+        self.values = {}  # {channel_num: (value, judge)}
+        self.stats = {}  # {channel_num: (stats, judge_counters)}
+        self.order = []  # Channel numbers after filtering and sorting
+        self.first_row = 0
+        self.visible_rows = 0
+        self._pools = {name: [] for name in GRID_LAYOUTS}
+        self._placed = set()  # Pool indexes currently gridded
+
+        # Column titles, shown for the compact layout only
+        self.table_header = ctk.CTkFrame(self, fg_color="transparent", height=24)
+        for title, width, anchor in ROW_COLUMNS:
+            ctk.CTkLabel(self.table_header, text=title, width=width, anchor=anchor,
+                         font=ctk.CTkFont(size=11, weight="bold"),
+                         text_color="gray60").pack(side="left", padx=6, fill="x", expand=(width == 0))
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        # The body's size decides how many rows exist, never the other way round
+        self.body.grid_propagate(False)
+        tkinter.Misc.bind(self.body, "<Configure>", self._on_resize, add="+")
+        self._bind_wheel(self.body)
+
+        self._apply_layout()
+        self.set_channel_count(num_channels)
+
+    @property
+    def _spec(self):
+        return GRID_LAYOUTS[self.layout]
+
+    def set_channel_count(self, num_channels):
+        """Show channels 1..num_channels; reuses the existing cells"""
+        self.num_channels = num_channels
+        for ch in range(1, num_channels + 1):
+            self.values.setdefault(ch, (-9999.98, "IDLE"))
+        self._resort()
+        self._render()
+
+    def set_layout(self, layout):
+        if layout == self.layout or layout not in GRID_LAYOUTS:
+            return
+        self._hide_cells()
+        self.layout = layout
+        self._apply_layout()
+        self._render()
+
+    def set_sort(self, sort_key):
+        self.sort_key = sort_key
+        self.first_row = 0
+        self._resort()
+        self._render()
+
+    def set_filter(self, filter_name):
+        self.filter_name = filter_name
+        self.first_row = 0
+        self._resort()
+        self._render()
+
+    def update_values(self, values):
+        """Batch update {channel_num: (value, judge)}; only visible cells are touched"""
+        self.values.update(values)
+        update_displays(self._visible_cells(), self.values)
+
+    def update_stats(self, stats):
+        """{channel_num: (stats, judge_counters)}; also re-applies sorting and filtering"""
+        self.stats = stats
+        order = self.order
+        self._resort()
+        if self.order != order:
+            self._render()
+            return
+        for cell in self._visible_cells():
+            cell.update_stats(*self.stats.get(cell.channel_num, (None, None)))
+
+    def _deviation(self, ch):
+        value = self.values.get(ch, (-9999.98, "IDLE"))[0]
+        stats = self.stats.get(ch, (None, None))[0]
+        if value == -9999.98 or not stats or not stats['count']:
+            return None
+        return value - stats['mean']
+
+    def _resort(self):
+        judges = GRID_FILTERS.get(self.filter_name)
+        channels = [ch for ch in range(1, self.num_channels + 1)
+                    if judges is None or self.values.get(ch, (None, "IDLE"))[1] in judges]
+        if self.sort_key == 'Judge':
+            channels.sort(key=lambda ch: (JUDGE_RANK.get(self.values[ch][1], 1), ch))
+        elif self.sort_key == 'Deviation':
+            def by_deviation(ch):
+                deviation = self._deviation(ch)
+                return (deviation is None, -abs(deviation or 0.0), ch)
+            channels.sort(key=by_deviation)
+        self.order = channels
+        self._clamp_first_row()
+
+    def _total_rows(self):
+        return math.ceil(len(self.order) / self._spec['columns'])
+
+    def _clamp_first_row(self):
+        self.first_row = max(0, min(self.first_row, self._total_rows() - self.visible_rows))
+
+    def _visible_cells(self):
+        return self._pools[self.layout][:len(self._visible_channels())]
+
+    def _visible_channels(self):
+        columns = self._spec['columns']
+        start = self.first_row * columns
+        return self.order[start:start + self.visible_rows * columns]
+
+    def _render(self):
+        """Point the pooled cells at the visible channels, creating cells only if the view grew"""
+        spec = self._spec
+        columns = spec['columns']
+        pool = self._pools[self.layout]
+        channels = self._visible_channels()
+        while len(pool) < len(channels):
+            cell = spec['cell'](self.body, channels[len(pool)], on_click=None)
+            self._bind_wheel(cell)
+            pool.append(cell)
+        for k, cell in enumerate(pool):
+            if k < len(channels):
+                cell.set_channel(channels[k])
+                if k not in self._placed:
+                    cell.grid(row=k // columns, column=k % columns,
+                              padx=spec['padx'], pady=spec['pady'], sticky="nsew")
+                    self._placed.add(k)
+            elif k in self._placed:
+                cell.grid_remove()
+                self._placed.discard(k)
+        visible = pool[:len(channels)]
+        update_displays(visible, self.values)
+        for cell in visible:
+            cell.update_stats(*self.stats.get(cell.channel_num, (None, None)))
+        self._update_scrollbar()
+
+    def _hide_cells(self):
+        pool = self._pools[self.layout]
+        for k in self._placed:
+            pool[k].grid_remove()
+        self._placed = set()
+
+    def _apply_layout(self):
+        spec = self._spec
+        for column in range(max(layout['columns'] for layout in GRID_LAYOUTS.values())):
+            self.body.grid_columnconfigure(column, weight=1 if column < spec['columns'] else 0,
+                                           uniform="cells" if column < spec['columns'] else "")
+        if self.layout == 'Compact':
+            self.table_header.pack(side="top", fill="x", before=self.scrollbar)
+        else:
+            self.table_header.pack_forget()
+        self.first_row = 0
+        height = self.body.winfo_height()
+        self.visible_rows = max(1, (height if height > 1 else 700) // spec['row_height'])
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self._spec['row_height'])
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._clamp_first_row()
+            self._render()
+
+    def _set_first_row(self, row):
+        previous = self.first_row
+        self.first_row = row
+        self._clamp_first_row()
+        if self.first_row != previous:
+            self._render()
+
+    def _update_scrollbar(self):
+        total = self._total_rows()
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.first_row / total, (self.first_row + self.visible_rows) / total)
+
+    def _on_scrollbar(self, *args):
+        """Scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')"""
+        if args[0] == 'moveto':
+            self._set_first_row(round(float(args[1]) * self._total_rows()))
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self._set_first_row(self.first_row + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self._set_first_row(self.first_row + (-1 if up else 1))
+        return "break"
+
+    def _bind_wheel(self, widget):
+        # Plain Tk bind on every descendant, so the wheel scrolls wherever the pointer is
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tkinter.Misc.bind(widget, sequence, self._on_wheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
@@ -0,0 +1,186 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+# Stack samples kept per slow event, and frames per sample
+MAX_STACK_SAMPLES = 3
+STACK_DEPTH = 12
+
+
+class UIWatchdog:
+    """Measures Tk event-loop responsiveness and profiles slow UI callbacks
+
+    A heartbeat is scheduled with `after` every `heartbeat_interval`; how late
+    it fires is the main-loop latency. Callbacks run through call()/wrap()
+    are timed. While a callback (or the loop as a whole) is slower than
+    `slow_threshold`, a monitor thread samples the Tk thread's stack, so
+    each slow record shows where the time went. Records go to a ring
+    buffer of `capacity` entries.
+    """
+
+    def __init__(self, root, heartbeat_interval=0.05, slow_threshold=0.05, capacity=200):
+        self.root = root
+        self.heartbeat_interval = heartbeat_interval
+        self.slow_threshold = slow_threshold
+        self.records = deque(maxlen=capacity)
+        self.lags = deque(maxlen=1200)  # Heartbeat lateness, seconds
+        self.stalls = 0
+        self.callback_stats = {}  # {name: [count, total_s, max_s]}
+        self.version = 0  # Bumped whenever a record is added
+        self._tk_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._expected = None
+        self._current = None  # (name, start) of the timed callback running on the Tk thread
+        self._stacks = []  # Samples taken by the monitor thread for the current slow event
+        self._slow_since_beat = False
+        self._after_id = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._schedule()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.heartbeat_interval
+        self._after_id = self.root.after(int(self.heartbeat_interval * 1000), self._beat)
+
+    def _beat(self):
+        lag = max(0.0, time.perf_counter() - self._expected)
+        self.lags.append(lag)
+        if lag >= self.slow_threshold:
+            self.stalls += 1
+            stacks = self._take_stacks()
+            # A slow timed callback already has its own record; anything else
+            # (untimed handlers, blocking driver calls, Tk redraws) is logged here
+            if not self._slow_since_beat:
+                self._add_record('event loop stall', lag, stacks)
+        self._slow_since_beat = False
+        if self._running:
+            self._schedule()
+
+    def wrap(self, name, callback):
+        """Return `callback` timed under `name` (for after(), bind() and command= hooks)"""
+        def timed(*args, **kwargs):
+            return self.call(name, callback, *args, **kwargs)
+        return timed
+
+    def call(self, name, callback, *args, **kwargs):
+        """Run a UI callback on the Tk thread, timing it and sampling its stack if slow"""
+        outer = self._current
+        start = time.perf_counter()
+        self._current = (name, start)
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            self._current = outer
+            stats = self.callback_stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            if duration >= self.slow_threshold:
+                self._add_record(name, duration, self._take_stacks())
+                self._slow_since_beat = True
+
+    def _take_stacks(self):
+        with self._lock:
+            stacks, self._stacks = self._stacks, []
+        return stacks
+
+    def _add_record(self, name, duration, stacks):
+        self.records.append({
+            'time': datetime.now().strftime('%H:%M:%S.%f')[:-3],
+            'name': name,
+            'duration': duration,
+            'stacks': stacks
+        })
+        self.version += 1
+
+    def _monitor(self):
+        """Sample the Tk thread's stack while it is stuck in something slow"""
+        while self._running:
+            time.sleep(self.heartbeat_interval / 2)
+            now = time.perf_counter()
+            current = self._current
+            if current is not None:
+                busy = now - current[1]
+            else:
+                busy = now - self._expected
+            if busy < self.slow_threshold:
+                continue
+            frame = sys._current_frames().get(self._tk_thread)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame, limit=STACK_DEPTH)
+            with self._lock:
+                if len(self._stacks) < MAX_STACK_SAMPLES:
+                    self._stacks.append((round(busy * 1000), stack))
+
+    def lag_stats(self):
+        """Heartbeat lateness over the recent window: mean, p99 and max in ms"""
+        lags = sorted(self.lags)
+        if not lags:
+            return {'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0, 'stalls': self.stalls}
+        return {
+            'mean_ms': 1000 * sum(lags) / len(lags),
+            'p99_ms': 1000 * lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+            'max_ms': 1000 * lags[-1],
+            'stalls': self.stalls
+        }
+
+    def slowest(self, count=20):
+        return sorted(self.records, key=lambda record: record['duration'], reverse=True)[:count]
+
+    def clear(self):
+        self.records.clear()
+        self.lags.clear()
+        self.callback_stats.clear()
+        self.stalls = 0
+        self.version += 1
+
+    def format_summary(self):
+        lag = self.lag_stats()
+        lines = [f"Event loop: lag mean {lag['mean_ms']:.1f} ms, p99 {lag['p99_ms']:.1f} ms, "
+                 f"max {lag['max_ms']:.1f} ms, {lag['stalls']} stalls ≥ {self.slow_threshold * 1000:.0f} ms"]
+        for name, (count, total, longest) in sorted(self.callback_stats.items(),
+                                                     key=lambda item: item[1][2], reverse=True):
+            lines.append(f"  {name}: {count} calls, mean {1000 * total / count:.1f} ms, max {1000 * longest:.1f} ms")
+        return "\n".join(lines)
+
+    def format_records(self, records=None):
+        lines = []
+        for record in (self.slowest() if records is None else records):
+            lines.append(f"[{record['time']}] {record['name']}: {record['duration'] * 1000:.1f} ms")
+            for busy_ms, stack in record['stacks']:
+                lines.append(f"  stack after {busy_ms} ms:")
+                lines.extend("    " + line.rstrip().replace("\n", "\n    ") for line in stack)
+        return "\n".join(lines)
+
+    def dump(self, directory, extra=None):
+        """Write the summary and every record to a timestamped text file; returns its path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"ui_diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.format_summary() + "\n")
+            if extra:
+                f.write(extra + "\n")
+            f.write("\n" + self.format_records(list(self.records)) + "\n")
+        return path
@@ -0,0 +1,158 @@
+import asyncio
+import ctypes
+from collections import deque
+from acquisition import INVALID_VALUE
+from config import (ZEROING_SETTLE_TIME, ZEROING_TOLERANCE, ZEROING_VERIFY_READS,
+                    DEVICE_CALL_DEADLINE, DEVICE_CONNECT_DEADLINE)
+
+
+def channels_in(bitmask):
+    """OUT numbers (1-based) set in an AutoZeroMulti bitmask"""
+    return [bit + 1 for bit in range(16) if bitmask & (1 << bit)]
+
+
+class ZeroingJob:
+    """A batch of channel groups to auto-zero one after another
+
+    Each group is an OUT bitmask zeroed with a single AutoZeroMulti call.
+    on_progress(fraction, message) and on_done(results) are called on the
+    device core's loop thread; results holds one dict per group:
+    {'bitmask', 'code', 'error', 'before': {ch: μm}, 'after': {ch: μm}, 'settled': {ch: bool}}
+    """
+
+    def __init__(self, device_id, groups, on_progress=None, on_done=None):
+        self.device_id = device_id
+        self.groups = [mask for mask in groups if mask]
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.results = []
+        self.cancelled = False
+
+    @property
+    def all_settled(self):
+        return bool(self.results) and all(
+            result['code'] == 0 and all(result['settled'].values()) for result in self.results)
+
+
+class ZeroingWorker:
+    """Runs zeroing jobs as tasks on the device core so the Tk thread never waits on the driver
+
+    Jobs are queued and run in order. Every DLL call runs on a device I/O
+    worker with a deadline and holds the pipeline's device lock, so zeroing
+    interleaves safely with a running acquisition.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.core = pipeline.core
+        self._jobs = deque()
+        self._task = None  # Touched only on the core's loop thread
+        self._current = None
+
+    @property
+    def busy(self):
+        return self._current is not None or bool(self._jobs)
+
+    def submit(self, job):
+        self._jobs.append(job)
+        self.core.call_soon(self._ensure_running)
+        return job
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def cancel_all(self):
+        """Drop queued jobs; the group being zeroed right now still finishes"""
+        while self._jobs:
+            try:
+                self._jobs.popleft().cancelled = True
+            except IndexError:
+                break
+        if self._current is not None:
+            self._current.cancelled = True
+
+    async def _run(self):
+        while self._jobs:
+            job = self._current = self._jobs[0]
+            self._jobs.popleft()
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = "the device did not answer in time"
+                print(f"ZeroingWorker: Job failed: {e}")
+                job.results.append({'bitmask': 0, 'code': -1, 'error': str(e),
+                                    'before': {}, 'after': {}, 'settled': {}})
+            finally:
+                self._current = None
+            if job.on_done:
+                job.on_done(job.results)
+
+    def _report(self, job, fraction, message):
+        print(f"ZeroingWorker: {message}")
+        if job.on_progress:
+            job.on_progress(fraction, message)
+
+    async def _run_job(self, job):
+        steps = max(1, len(job.groups))
+        self._report(job, 0.0, "Connecting…")
+        result = await self.core.run_blocking(self.pipeline.connect, 10000, timeout=DEVICE_CONNECT_DEADLINE)
+        if result != 0:
+            raise RuntimeError(f"Connection failed with error {result}")
+
+        for index, bitmask in enumerate(job.groups):
+            if job.cancelled:
+                break
+            names = ", ".join(f"OUT{ch:02d}" for ch in channels_in(bitmask))
+            self._report(job, index / steps, f"Reading {names} before zeroing…")
+            before = await self._average_reading(bitmask)
+
+            self._report(job, (index + 0.3) / steps, f"Zeroing {names}…")
+            code = await self.core.run_blocking(self._auto_zero, job.device_id, bitmask,
+                                                timeout=DEVICE_CALL_DEADLINE)
+            entry = {'bitmask': bitmask, 'code': code, 'error': None,
+                     'before': before, 'after': {}, 'settled': {}}
+            job.results.append(entry)
+            if code != 0:
+                import CL3wrap
+                entry['error'] = f"error code {code} (hex: {CL3wrap.CL3IF_hex(code)})"
+                continue
+
+            self._report(job, (index + 0.6) / steps, f"Verifying {names}…")
+            await asyncio.sleep(ZEROING_SETTLE_TIME)
+            entry['after'] = await self._average_reading(bitmask)
+            entry['settled'] = {ch: value is not None and abs(value) <= ZEROING_TOLERANCE
+                                for ch, value in entry['after'].items()}
+        self._report(job, 1.0, "Done")
+
+    def _auto_zero(self, device_id, bitmask):
+        """Stop measuring, enable auto-zero for `bitmask`, then measure again"""
+        import CL3wrap
+        with self.pipeline.device_lock:
+            try:
+                CL3wrap.CL3IF_MeasurementControl(device_id, ctypes.c_ubyte(0))  # 0 = stop
+            except Exception as e:
+                print(f"ZeroingWorker: Could not stop measurement before zeroing: {e}")
+            try:
+                result = CL3wrap.CL3IF_AutoZeroMulti(ctypes.c_int(device_id), ctypes.c_ushort(bitmask),
+                                                     ctypes.c_ubyte(True))
+                print(f"ZeroingWorker: CL3IF_AutoZeroMulti({bitmask:#04x}) returned {result}")
+            finally:
+                # Measurement must run again for the verification read (and the live view)
+                CL3wrap.CL3IF_MeasurementControl(device_id, ctypes.c_ubyte(1))
+        return result
+
+    async def _average_reading(self, bitmask):
+        """Mean of ZEROING_VERIFY_READS samples per channel in `bitmask`; None if never valid"""
+        channels = channels_in(bitmask)
+        totals = {ch: [0.0, 0] for ch in channels}
+        for _ in range(ZEROING_VERIFY_READS):
+            sample = await self.core.run_blocking(self.pipeline.read_sample, timeout=DEVICE_CALL_DEADLINE)
+            if sample is not None:
+                for ch in channels:
+                    if ch <= len(sample.values) and sample.values[ch - 1] != INVALID_VALUE:
+                        totals[ch][0] += sample.values[ch - 1]
+                        totals[ch][1] += 1
+            await asyncio.sleep(0.02)
+        return {ch: (total / count if count else None) for ch, (total, count) in totals.items()}
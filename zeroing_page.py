@@ -1,18 +1,35 @@
 import customtkinter as ctk
 from config import COLORS
-import CL3wrap
-import ctypes
+from zeroing import ZeroingJob, ZeroingWorker, channels_in
 
 OUT_NAMES = [f"OUT{str(i+1).zfill(2)}" for i in range(8)]
 OUT_BITMASKS = [0x0001 << i for i in range(8)]  # Bitmasks from OUT01 to OUT08
 
 class ZeroingPage(ctk.CTkFrame):
-    def __init__(self, parent, device_id, go_back_callback, logger=None, num_channels=6):
+    def __init__(self, parent, device_id, go_back_callback, logger=None, num_channels=6, pipeline=None,
+                 worker=None):
         super().__init__(parent, fg_color=COLORS["card"], corner_radius=15)
         self.device_id = device_id
         self.go_back_callback = go_back_callback
         self.logger = logger
         self.num_channels = num_channels
+
+        # Zeroing runs on a device I/O thread (or in the acquisition service, via
+        # `worker`); the page only polls its progress
+        if worker is not None:
+            self.worker = worker
+        elif pipeline is None:
+            if logger is None:
+                import logger as logger_module
+                logger = logger_module.CL3000Logger(num_channels)
+            self.worker = ZeroingWorker(logger._ensure_pipeline())
+        else:
+            self.worker = ZeroingWorker(pipeline)
+        self.job = None
+        self.batch = []  # Bitmasks queued with "Add to Batch"
+        self._progress = (0.0, "")
+        self._results = None
+        self._poll_id = None
         
         print(f"Initializing ZeroingPage with {num_channels} channels...")
         
@@ -29,19 +46,13 @@ class ZeroingPage(ctk.CTkFrame):
         self.header.pack(pady=10)
 
         # Create regular frame for checkboxes (no scrolling)
-        checkbox_frame = ctk.CTkFrame(main_container, fg_color="transparent")
-        checkbox_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.checkbox_frame = ctk.CTkFrame(main_container, fg_color="transparent")
+        self.checkbox_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         # Checkbox list - only show the selected number of channels
         self.check_vars = []
-        for i in range(num_channels):
-            var = ctk.BooleanVar()
-            chk = ctk.CTkCheckBox(checkbox_frame, text=OUT_NAMES[i], variable=var,
-                                 text_color=COLORS["text"],
-                                 fg_color=COLORS["primary"],
-                                 hover_color=COLORS["accent"])
-            chk.pack(anchor="w", padx=20, pady=5)
-            self.check_vars.append(var)
+        self.checkboxes = []
+        self._build_checkboxes()
 
         # Buttons
         self.button_frame = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -59,86 +70,149 @@ class ZeroingPage(ctk.CTkFrame):
                                             hover_color=COLORS["accent"])
         self.zero_all_button.pack(side="left", padx=10)
 
+        self.batch_button = ctk.CTkButton(self.button_frame, text="+ Add to Batch",
+                                         command=self.add_to_batch,
+                                         fg_color=COLORS["secondary"],
+                                         hover_color=COLORS["accent"])
+        self.batch_button.pack(side="left", padx=10)
+
+        self.batch_label = ctk.CTkLabel(main_container, text="",
+                                       text_color=COLORS["text"])
+        self.batch_label.pack()
+
         self.back_button = ctk.CTkButton(main_container, text="← Back", 
                                         command=self.go_back_callback,
                                         fg_color=COLORS["secondary"],
                                         hover_color=COLORS["accent"])
         self.back_button.pack(pady=5)
 
-        self.status_label = ctk.CTkLabel(main_container, text="", 
+        self.status_label = ctk.CTkLabel(main_container, text="", justify="left",
                                         text_color=COLORS["text"])
         self.status_label.pack(pady=(5, 0))
         
         print("ZeroingPage initialization complete")
 
-    def _connect_and_prepare(self):
-        # Try to connect before zeroing using the existing logger if available
-        if self.logger:
-            try:
-                print("[DEBUG] Using existing logger to connect...")
-                result = self.logger.connect()
-                print(f"[DEBUG] Logger connect returned: {result}")
-                if result != 0:
-                    print(f"[DEBUG] Connection failed with result: {result}")
-            except Exception as e:
-                print(f"[DEBUG] Could not connect using logger: {e}")
-        else:
-            try:
-                print("[DEBUG] No logger provided, attempting direct connection...")
-                import logger
-                temp_logger = logger.CL3000Logger(8)
-                result = temp_logger.connect()
-                print(f"[DEBUG] Direct connect returned: {result}")
-            except Exception as e:
-                print(f"[DEBUG] Could not connect directly: {e}")
-        
-        # Try to stop measurement before zeroing
-        try:
-            print("[DEBUG] Attempting to stop measurement before zeroing...")
-            CL3wrap.CL3IF_MeasurementControl(self.device_id, ctypes.c_ubyte(0))  # 0 = stop
-            print("[DEBUG] Measurement stop call issued.")
-        except Exception as e:
-            print(f"[DEBUG] Could not stop measurement before zeroing: {e}")
+    def _build_checkboxes(self):
+        for chk in self.checkboxes:
+            chk.destroy()
+        self.checkboxes = []
+        self.check_vars = []
+        for i in range(self.num_channels):
+            var = ctk.BooleanVar()
+            chk = ctk.CTkCheckBox(self.checkbox_frame, text=OUT_NAMES[i], variable=var,
+                                 text_color=COLORS["text"],
+                                 fg_color=COLORS["primary"],
+                                 hover_color=COLORS["accent"])
+            chk.pack(anchor="w", padx=20, pady=5)
+            self.checkboxes.append(chk)
+            self.check_vars.append(var)
 
-    def zero_selected(self):
-        self._connect_and_prepare()
+    def update_channel_count(self, num_channels):
+        """Show checkboxes for a new channel count (the page is kept between visits)"""
+        self.num_channels = num_channels
+        self.header.configure(text=f"Zero OUT Channels (1-{num_channels})")
+        self._build_checkboxes()
+        self.batch = []
+        self._show_batch()
+        if not self.worker.busy:
+            self.status_label.configure(text="")
+
+    def _selected_bitmask(self):
         bitmask = 0
         for i, var in enumerate(self.check_vars):
             if var.get():
                 bitmask |= OUT_BITMASKS[i]
+        return bitmask
 
+    def add_to_batch(self):
+        """Queue the selected channels as one group; groups are zeroed one after another"""
+        bitmask = self._selected_bitmask()
         if bitmask == 0:
             self.status_label.configure(text="⚠️ No channels selected.")
             return
+        self.batch.append(bitmask)
+        for var in self.check_vars:
+            var.set(False)
+        self._show_batch()
 
-        try:
-            device_id = ctypes.c_int(self.device_id)
-            bitmask_c = ctypes.c_ushort(bitmask)
-            on_off = ctypes.c_ubyte(True)  # True = enable auto-zero
-            print(f"[DEBUG] Calling CL3IF_AutoZeroMulti with device_id={device_id.value}, bitmask={bitmask_c.value:#04x}, onOff={on_off.value}")
-            result = CL3wrap.CL3IF_AutoZeroMulti(device_id, bitmask_c, on_off)
-            print(f"[DEBUG] CL3IF_AutoZeroMulti returned {result} (hex: {CL3wrap.CL3IF_hex(result)})")
-            if result == 0:
-                self.status_label.configure(text=f"✓ Auto-zero enabled for selected channels.")
-            else:
-                self.status_label.configure(text=f"❌ Auto-zero failed. Error code: {result} (hex: {CL3wrap.CL3IF_hex(result)})")
-        except Exception as e:
-            self.status_label.configure(text=f"❌ Error: {str(e)}")
+    def _show_batch(self):
+        groups = ["+".join(f"{ch:02d}" for ch in channels_in(mask)) for mask in self.batch]
+        self.batch_label.configure(text=f"Batch: {' | '.join(groups)}" if groups else "")
+
+    def zero_selected(self):
+        groups = list(self.batch)
+        bitmask = self._selected_bitmask()
+        if bitmask:
+            groups.append(bitmask)
+        if not groups:
+            self.status_label.configure(text="⚠️ No channels selected.")
+            return
+        self._start_job(groups)
 
     def zero_all(self):
-        self._connect_and_prepare()
-        try:
-            device_id = ctypes.c_int(self.device_id)
-            # Create bitmask for only the selected number of channels
-            all_channels_bitmask = (1 << self.num_channels) - 1  # e.g., for 6 channels: 0b111111 = 0x3F
-            bitmask_c = ctypes.c_ushort(all_channels_bitmask)
-            on_off = ctypes.c_ubyte(True)  # True = enable auto-zero
-            print(f"[DEBUG] Calling CL3IF_AutoZeroMulti with device_id={device_id.value}, bitmask={bitmask_c.value:#04x}, onOff={on_off.value}")
-            result = CL3wrap.CL3IF_AutoZeroMulti(device_id, bitmask_c, on_off)
-            print(f"[DEBUG] CL3IF_AutoZeroMulti returned {result} (hex: {CL3wrap.CL3IF_hex(result)})")
-            if result == 0:
-                self.status_label.configure(text=f"✓ Auto-zero enabled for ALL {self.num_channels} channels.")
-            else:
-                self.status_label.configure(text=f"❌ Auto-zero failed. Error code: {result} (hex: {CL3wrap.CL3IF_hex(result)})")
-        except Exception as e:
-            self.status_label.configure(text=f"❌ Error: {str(e)}")
+        # Bitmask for only the selected number of channels, e.g. 6 channels: 0b111111 = 0x3F
+        self._start_job([(1 << self.num_channels) - 1])
+
+    def _start_job(self, groups):
+        """Hand the groups to the zeroing worker and poll its progress from the Tk thread"""
+        if self.worker.busy:
+            return
+        self._progress = (0.0, "Starting…")
+        self._results = None
+        self.job = ZeroingJob(self.device_id, groups,
+                              on_progress=self._set_progress, on_done=self._set_results)
+        self.batch = []
+        self._show_batch()
+        for button in (self.zero_button, self.zero_all_button, self.batch_button):
+            button.configure(state="disabled")
+        self.worker.submit(self.job)
+        self._poll_id = self.after(100, self._poll_job)
+
+    def _set_progress(self, fraction, message):
+        self._progress = (fraction, message)
+
+    def _set_results(self, results):
+        self._results = results
+
+    def _poll_job(self):
+        self._poll_id = None
+        if self._results is None:
+            fraction, message = self._progress
+            self.status_label.configure(text=f"{message} ({fraction * 100:.0f}%)")
+            self._poll_id = self.after(100, self._poll_job)
+            return
+        self.job = None
+        for button in (self.zero_button, self.zero_all_button, self.batch_button):
+            button.configure(state="normal")
+        self.status_label.configure(text=self._format_results(self._results))
+
+    def _format_results(self, results):
+        lines = []
+        for result in results:
+            names = ", ".join(f"OUT{ch:02d}" for ch in channels_in(result['bitmask']))
+            if result['error']:
+                lines.append(f"❌ {names or 'Zeroing'}: {result['error']}")
+                continue
+            for ch, settled in result['settled'].items():
+                before = result['before'].get(ch)
+                after = result['after'].get(ch)
+                reading = (f"{before:.2f} → {after:.2f} μm" if before is not None and after is not None
+                           else "no valid reading")
+                lines.append(f"{'✓' if settled else '⚠️'} OUT{ch:02d}: {reading}")
+        return "\n".join(lines) or "⚠️ Nothing was zeroed."
+
+    def pause(self):
+        """Stop polling while hidden; the job itself keeps running on the device core"""
+        if self._poll_id:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def resume(self):
+        # A job still counts as running until its results were shown, even if it finished while hidden
+        if self.job is not None and self._poll_id is None:
+            self._poll_job()
+
+    def destroy(self):
+        self.pause()
+        self.worker.cancel_all()
+        super().destroy()